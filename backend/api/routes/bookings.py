@@ -1,15 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
-import sys
-import os
-from datetime import datetime
+from typing import Optional, Tuple
+import base64
+import logging
+from datetime import date
 
-# Supabase 클라이언트 import
-from backend.config.supabase_client import get_supabase_client
+# 데이터 접근 계층 import
+from backend.repositories import user_repository, reservation_repository
+from backend.services.seat_inventory import seat_inventory
+from backend.services.waiting_room import waiting_room, WaitingRoomFull
+from backend.services.idempotency import idempotency_store, request_fingerprint
 
 router = APIRouter()
-supabase = get_supabase_client()
+logger = logging.getLogger(__name__)
 
 
 class BookingRequest(BaseModel):
@@ -19,69 +23,46 @@ class BookingRequest(BaseModel):
     departure_date: Optional[str] = None  # 출발 날짜
 
 
-@router.post("/bookings")
-async def create_booking(booking: BookingRequest):
+def _raise_for_booking_status(status: Optional[str], available_seats: Optional[int] = None):
+    """book_seats / 좌석 재고의 거절 사유를 HTTP 오류로 변환"""
+    if status == "not_found":
+        raise HTTPException(status_code=404, detail="해당 노선을 찾을 수 없습니다.")
+    if status == "closed":
+        raise HTTPException(status_code=400, detail="해당 노선의 예매가 열려있지 않습니다.")
+    if status == "sold_out":
+        if available_seats is None:
+            raise HTTPException(status_code=400, detail="남은 좌석이 부족합니다.")
+        raise HTTPException(status_code=400, detail=f"남은 좌석이 부족합니다. (잔여: {available_seats}석)")
+    if status == "invalid_seat_count":
+        raise HTTPException(status_code=400, detail="예약 인원은 1명 이상이어야 합니다.")
+
+
+async def _book(booking: BookingRequest) -> dict:
     """
-    사용자 예매 생성
-    - 학생 학번으로 사용자를 찾고(있으면 이름/연락처 사용)
-    - 노선을 route_id로 찾음
-    - 좌석 중복 / 잔여석 확인
-    - 예약 레코드 생성 및 bus_routes.available_seats 감소
+    예매 처리 (바로 처리하거나 대기열에서 차례가 되었을 때 호출)
+    - 좌석 재고(메모리)로 먼저 입장 제어: 매진/미오픈이면 DB 호출 없이 거절,
+      남은 좌석 수만큼만 동시에 DB로 보냄
+    - book_seats RPC 한 번으로 처리 (migration_add_book_seats_function.sql, SQLite 구현은 같은 규칙의 트랜잭션)
+    - 예매 오픈 여부 확인, 잔여석 조건부 차감, 예약 레코드 생성을 DB에서 원자적으로 수행
+    - 학생 정보가 있으면 이름/연락처를 예약에 사용
     """
     try:
-        # 버스 노선 조회 (route_id 필드 기준)
-        route_resp = supabase.table("bus_routes").select("*").eq("route_id", booking.route_id).limit(1).execute()
-        if not route_resp.data or len(route_resp.data) == 0:
-            raise HTTPException(status_code=404, detail="해당 노선을 찾을 수 없습니다.")
-
-        route = route_resp.data[0]
-
-        # 예매가 열려 있는지 확인
-        if not route.get("is_open", False):
-            raise HTTPException(status_code=400, detail="해당 노선의 예매가 열려있지 않습니다.")
-
-        # 남은 좌석 확인
-        available = route.get("available_seats", 0)
-        if available < booking.seat_count:
-            raise HTTPException(status_code=400, detail=f"남은 좌석이 부족합니다. (잔여: {available}석)")
-
-        # 학생 정보 조회 (있다면 이름/연락처 사용)
-        user_resp = supabase.table("users").select("name, email, phone").eq("student_id", booking.student_id).limit(1).execute()
-        user_name = booking.student_id
-        user_email = None
-        user_phone = None
-        if user_resp.data and len(user_resp.data) > 0:
-            u = user_resp.data[0]
-            user_name = u.get("name") or user_name
-            user_email = u.get("email")
-            user_phone = u.get("phone")
-
-        # 예약 생성
-        new_res = supabase.table("reservations").insert({
-            "route_id": route["id"],
-            "user_name": user_name,
-            "user_email": user_email,
-            "user_phone": user_phone,
-            "seat_count": booking.seat_count,
-            "status": "confirmed",
-            "created_at": datetime.now().isoformat()
-        }).execute()
-
-        if not new_res.data or len(new_res.data) == 0:
-            raise HTTPException(status_code=500, detail="예약 생성에 실패했습니다.")
+        admission = await seat_inventory.admit(booking.route_id, booking.seat_count)
+        _raise_for_booking_status(admission.rejected)
 
-        # available_seats 감소
+        result = None
         try:
-            supabase.table("bus_routes").update({
-                "available_seats": max(0, available - booking.seat_count)
-            }).eq("id", route["id"]).execute()
-        except Exception:
-            # 예약은 생성되었지만 좌석 감소가 실패한 경우 경고 수준의 처리
-            pass
+            result = await reservation_repository.book(booking.route_id, booking.student_id, booking.seat_count)
+        finally:
+            seat_inventory.release(admission, result)
+
+        _raise_for_booking_status(result.get("status"), result.get("available_seats"))
+        if result.get("status") != "ok" or not result.get("reservation"):
+            raise HTTPException(status_code=500, detail="예약 생성에 실패했습니다.")
 
         return {
             "message": "예약이 완료되었습니다.",
-            "reservation": new_res.data[0]
+            "reservation": result["reservation"]
         }
 
     except HTTPException:
@@ -90,69 +71,163 @@ async def create_booking(booking: BookingRequest):
         raise HTTPException(status_code=500, detail=f"예약 실패: {str(e)}")
 
 
-@router.get("/bookings/user/{student_id}")
-async def get_user_bookings(student_id: str):
+waiting_room.process = _book
+
+
+async def _submit_booking(booking: BookingRequest) -> Tuple[int, dict]:
+    """예매 요청 처리 후 (상태 코드, 응답 본문) 반환 - 대기열 모드면 번호표 발급"""
+    if booking.seat_count < 1:
+        _raise_for_booking_status("invalid_seat_count")
+
+    if not waiting_room.enabled:
+        return 200, await _book(booking)
+
+    try:
+        ticket = waiting_room.enqueue(f"{booking.student_id}:{booking.route_id}", booking)
+    except WaitingRoomFull:
+        raise HTTPException(status_code=503, detail="대기 인원이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+    return 202, {
+        "message": "예매 대기열에 등록되었습니다.",
+        **waiting_room.to_dict(ticket)
+    }
+
+
+@router.post("/bookings")
+async def create_booking(
+    booking: BookingRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
-    사용자의 예약 내역 조회
-    - 학번으로 사용자 조회 (없으면 404)
-    - 사용자의 `email`, `phone`, `name`으로 `reservations`를 조회
-    - 각 예약에 대해 노선 정보를 함께 붙여 반환
+    사용자 예매 생성
+    - 대기열 모드(BOOKING_WAITING_ROOM=true)면 번호표를 발급하고 202로 바로 반환
+      (결과는 GET /bookings/tickets/{ticket_id}로 조회)
+    - 아니면 바로 예매 처리
+    - Idempotency-Key 헤더가 있으면 같은 키의 재시도에 처음 응답을 그대로 반환
+      (처리 전에 키를 DB에서 선점하고, 처리 중인 키로 다시 들어온 요청은 409)
+      (성공 및 4xx 응답을 IDEMPOTENCY_TTL 동안 보관, 5xx는 선점을 풀어 다시 시도 가능)
     """
+    if not idempotency_key:
+        status_code, body = await _submit_booking(booking)
+        return JSONResponse(status_code=status_code, content=body)
+
+    if len(idempotency_key) > 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key가 너무 깁니다.")
+
+    key = f"bookings:{idempotency_key}"
+    request_hash = request_fingerprint(booking.model_dump())
+
+    # 처리 전에 DB에서 키를 선점 (다른 서버 인스턴스에서 같은 키를 동시에 처리하지 않도록)
     try:
-        # 사용자 조회
-        user_resp = supabase.table("users").select("*").eq("student_id", student_id).limit(1).execute()
-        if not user_resp.data or len(user_resp.data) == 0:
-            raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
+        stored = await idempotency_store.claim(key, request_hash)
+    except Exception as e:
+        # 선점 여부를 알 수 없으면 중복 예매를 막기 위해 처리하지 않음
+        logger.error(f"Idempotency 키 선점 실패 ({key}): {e}")
+        raise HTTPException(status_code=503, detail="요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+    if stored is not None:
+        if stored.request_hash != request_hash:
+            raise HTTPException(status_code=422, detail="같은 Idempotency-Key로 다른 예매 요청을 보낼 수 없습니다.")
+        if stored.pending:
+            raise HTTPException(
+                status_code=409,
+                detail="같은 예매 요청을 처리 중입니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"}
+            )
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    try:
+        status_code, body = await _submit_booking(booking)
+    except HTTPException as e:
+        if 400 <= e.status_code < 500:
+            await idempotency_store.complete(key, request_hash, e.status_code, {"detail": e.detail})
+        else:
+            await idempotency_store.release(key)
+        raise
+    except Exception:
+        await idempotency_store.release(key)
+        raise
 
-        user = user_resp.data[0]
-        email = user.get("email")
-        phone = user.get("phone")
-        name = user.get("name")
+    await idempotency_store.complete(key, request_hash, status_code, body)
+    return JSONResponse(status_code=status_code, content=body)
 
-        # 여러 기준으로 조회 (email, phone, name) — 각각 쿼리 후 중복 제거
-        reservations_map = {}
 
-        if email:
-            r = supabase.table("reservations").select("*").eq("user_email", email).execute()
-            if r.data:
-                for item in r.data:
-                    reservations_map[item["id"]] = item
+@router.get("/bookings/tickets/{ticket_id}")
+async def get_booking_ticket(ticket_id: str):
+    """
+    예매 대기 번호표 상태 조회
+    - status: waiting(대기 중, position = 앞에 남은 인원) / processing / done(result) / failed(error)
+    """
+    ticket = waiting_room.get(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="번호표를 찾을 수 없습니다.")
+    return waiting_room.to_dict(ticket)
 
-        if phone:
-            r = supabase.table("reservations").select("*").eq("user_phone", phone).execute()
-            if r.data:
-                for item in r.data:
-                    reservations_map[item["id"]] = item
 
-        # name은 항상 존재하므로 조회
-        if name:
-            r = supabase.table("reservations").select("*").eq("user_name", name).execute()
-            if r.data:
-                for item in r.data:
-                    reservations_map[item["id"]] = item
+def _encode_cursor(reservation: dict) -> str:
+    """다음 페이지 커서 (created_at, id)"""
+    raw = f"{reservation.get('created_at') or ''}|{reservation['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode().rstrip("=")
 
-        reservations = list(reservations_map.values())
 
-        # 각 예약에 대해 노선(route) 정보 추가
-        results = []
-        for res in reservations:
-            route_info = None
-            try:
-                route_resp = supabase.table("bus_routes").select("id, route_id, route_name, departure_time").eq("id", res.get("route_id")).limit(1).execute()
-                if route_resp.data and len(route_resp.data) > 0:
-                    route_info = route_resp.data[0]
-            except Exception:
-                route_info = None
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, reservation_id = raw.rsplit("|", 1)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return created_at, reservation_id
+
 
+@router.get("/bookings/user/{student_id}")
+async def get_user_bookings(
+    student_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    after: Optional[str] = None,
+    upcoming: bool = False
+):
+    """
+    사용자의 예약 내역 조회 (최신순)
+    - 학번으로 사용자 조회 (없으면 404)
+    - reservations.user_id 인덱스로 사용자의 예약만 조회 (migration_add_reservation_user_id.sql)
+    - 노선 정보는 bus_routes 관계를 함께 select하여 붙임 (DB 호출 총 2회)
+    - limit/after: (created_at, id) 커서 페이지네이션 - 응답의 next_cursor를 after로 전달
+      (limit이 없으면 전체 반환)
+    - upcoming=true: 출발일(bus_routes.departure_date)이 오늘 이후인 예약만
+    """
+    try:
+        # 사용자 조회
+        user = await user_repository.get_by_student_id(student_id, "id")
+        if user is None:
+            raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
+
+        # 예약 + 노선 정보를 한 번에 조회 (필터/정렬/페이지네이션은 모두 DB에서)
+        # limit이 있으면 다음 페이지 존재 여부 확인용으로 1건 더 조회
+        rows = await reservation_repository.list_for_user(
+            user["id"],
+            limit=limit + 1 if limit is not None else None,
+            after=_decode_cursor(after) if after else None,
+            departing_from=date.today().isoformat() if upcoming else None
+        )
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1])
+
+        results = []
+        for res in rows:
+            route_info = res.pop("bus_routes", None)
             results.append({
                 "reservation": res,
                 "route": route_info
             })
 
-        # 최신순 정렬
-        results.sort(key=lambda x: x["reservation"].get("created_at") or "", reverse=True)
-
-        return {"bookings": results, "count": len(results)}
+        return {"bookings": results, "count": len(results), "next_cursor": next_cursor}
 
     except HTTPException:
         raise
@@ -1,5 +1,5 @@
 # api/routes/bus_routes.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import time
@@ -7,12 +7,14 @@ import sys
 import os
 import logging
 
-# Supabase 클라이언트 import
-from backend.config.supabase_client import get_supabase_client
+# 데이터 접근 계층 import
+from backend.repositories import bus_route_repository
 from backend.services.web_push_service import web_push_service
+from backend.services.broadcast_jobs import broadcast_jobs
+from backend.services.seat_inventory import seat_inventory
+from backend.services.single_flight import single_flight
 
 router = APIRouter()
-supabase = get_supabase_client()
 logger = logging.getLogger(__name__)
 
 class BusRouteCreate(BaseModel):
@@ -36,12 +38,13 @@ class BusRouteUpdate(BaseModel):
 async def get_all_routes():
     """
     모든 버스 노선 조회
+    - 동시에 들어온 조회는 진행 중인 DB 호출 하나를 함께 기다림 (single-flight)
     """
     try:
-        response = supabase.table("bus_routes").select("*").order("id").execute()
+        routes = await single_flight.do("routes", bus_route_repository.list_all)
         return {
-            "routes": response.data,
-            "count": len(response.data)
+            "routes": routes,
+            "count": len(routes)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터베이스 오류: {str(e)}")
@@ -52,12 +55,12 @@ async def get_route(route_id: str):
     특정 노선 조회
     """
     try:
-        response = supabase.table("bus_routes").select("*").eq("route_id", route_id).execute()
+        route = await bus_route_repository.get(route_id)
         
-        if not response.data or len(response.data) == 0:
+        if route is None:
             raise HTTPException(status_code=404, detail="노선을 찾을 수 없습니다.")
         
-        return response.data[0]
+        return route
     except HTTPException:
         raise
     except Exception as e:
@@ -69,7 +72,7 @@ async def create_route(route: BusRouteCreate):
     새 버스 노선 생성
     """
     try:
-        new_route = supabase.table("bus_routes").insert({
+        new_route = await bus_route_repository.create({
             "route_name": route.route_name,
             "route_id": route.route_id,
             "bus_type": route.bus_type,
@@ -78,11 +81,12 @@ async def create_route(route: BusRouteCreate):
             "total_seats": route.total_seats,
             "available_seats": route.total_seats,
             "is_open": False
-        }).execute()
+        })
+        single_flight.forget("routes")
         
         return {
             "message": "노선이 생성되었습니다.",
-            "route": new_route.data[0]
+            "route": new_route
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터베이스 오류: {str(e)}")
@@ -113,14 +117,16 @@ async def update_route(route_id: str, route: BusRouteUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="업데이트할 데이터가 없습니다.")
         
-        updated = supabase.table("bus_routes").update(update_data).eq("route_id", route_id).execute()
+        updated = await bus_route_repository.update(route_id, update_data)
+        seat_inventory.invalidate(route_id)
+        single_flight.forget("routes")
         
-        if not updated.data or len(updated.data) == 0:
+        if updated is None:
             raise HTTPException(status_code=404, detail="노선을 찾을 수 없습니다.")
         
         return {
             "message": "노선이 업데이트되었습니다.",
-            "route": updated.data[0]
+            "route": updated
         }
     except HTTPException:
         raise
@@ -133,9 +139,11 @@ async def delete_route(route_id: str):
     버스 노선 삭제
     """
     try:
-        deleted = supabase.table("bus_routes").delete().eq("route_id", route_id).execute()
+        deleted = await bus_route_repository.delete(route_id)
+        seat_inventory.invalidate(route_id)
+        single_flight.forget("routes")
         
-        if not deleted.data or len(deleted.data) == 0:
+        if deleted is None:
             raise HTTPException(status_code=404, detail="노선을 찾을 수 없습니다.")
         
         return {
@@ -148,55 +156,73 @@ async def delete_route(route_id: str):
         raise HTTPException(status_code=500, detail=f"데이터베이스 오류: {str(e)}")
 
 @router.post("/routes/{route_id}/toggle")
-async def toggle_route_status(route_id: str):
+async def toggle_route_status(route_id: str, background_tasks: BackgroundTasks):
     """
     특정 노선의 예매 오픈/닫기 토글
+    
+    노선이 열리면 푸시 알림은 백그라운드 작업으로 전송하고 작업 ID만 반환
+    (진행 상황: GET /push/jobs/{job_id})
     """
     try:
         # 현재 상태 조회 (전체 정보 가져오기)
-        response = supabase.table("bus_routes").select("*").eq("route_id", route_id).execute()
+        route_data = await bus_route_repository.get(route_id)
         
-        if not response.data or len(response.data) == 0:
+        if route_data is None:
             raise HTTPException(status_code=404, detail="노선을 찾을 수 없습니다.")
         
-        route_data = response.data[0]
         current_status = route_data["is_open"]
         new_status = not current_status
         
         # 상태 토글
-        updated = supabase.table("bus_routes").update({
-            "is_open": new_status
-        }).eq("route_id", route_id).execute()
+        updated = await bus_route_repository.update(route_id, {"is_open": new_status})
+        # 예매 좌석 재고와 노선 목록 조회도 새 상태로 다시 읽도록 표시
+        seat_inventory.invalidate(route_id)
+        single_flight.forget("routes")
         
         # 🔥 닫혀있었는데 열린 경우 푸시 알림 전송
         push_result = None
         if not current_status and new_status:
-            logger.info(f"노선 오픈 감지 - 푸시 알림 전송 시작: {route_id}")
-            try:
-                notification_data = {
-                    "route_id": route_data["route_id"],
-                    "route_name": route_data["route_name"],
-                    "bus_type": route_data.get("bus_type", "등교"),
-                    "departure_date": route_data.get("departure_date", ""),
-                    "departure_time": route_data.get("departure_time", ""),
-                    "action": "open_route"
-                }
-                notification_body = f"{notification_data['bus_type']} - {notification_data['route_name']} ({notification_data['departure_date']} {notification_data['departure_time']})"
-                
-                push_result = await web_push_service.send_to_all_users(
-                    supabase,
-                    "🎉 통학버스 예매 오픈!",
-                    notification_body,
-                    notification_data
-                )
-                logger.info(f"푸시 알림 전송 결과: {push_result}")
-            except Exception as e:
-                logger.error(f"푸시 알림 전송 실패: {e}")
-                push_result = {"error": str(e)}
+            if not web_push_service.should_broadcast(f"route-open:{route_id}"):
+                # 짧은 시간 안에 닫았다가 다시 연 경우 중복 알림 생략
+                logger.info(f"노선 오픈 알림 디바운스 - 전송 생략: {route_id}")
+                push_result = {"skipped": "debounced"}
+            else:
+                logger.info(f"노선 오픈 감지 - 푸시 알림 작업 등록: {route_id}")
+                try:
+                    notification_data = {
+                        "route_id": route_data["route_id"],
+                        "route_name": route_data["route_name"],
+                        "bus_type": route_data.get("bus_type", "등교"),
+                        "departure_date": route_data.get("departure_date", ""),
+                        "departure_time": route_data.get("departure_time", ""),
+                        "action": "open_route"
+                    }
+                    notification_body = f"{notification_data['bus_type']} - {notification_data['route_name']} ({notification_data['departure_date']} {notification_data['departure_time']})"
+                    
+                    # 해당 노선 또는 같은 버스 종류(등교/하교)에 관심 등록한 학생에게만 전송
+                    # 같은 노선의 이전 알림은 Topic으로 교체되어 쌓이지 않음
+                    # 작업은 DB에 저장되어, 이 인스턴스가 끝까지 실행하지 못해도 POST /push/jobs/run이 이어서 실행
+                    job = await broadcast_jobs.create(f"route-open:{route_id}", {
+                        "kind": "interested",
+                        "title": "🎉 통학버스 예매 오픈!",
+                        "body": notification_body,
+                        "data": notification_data,
+                        "route_id": route_data["route_id"],
+                        "bus_type": notification_data["bus_type"],
+                        "topic": f"route-open:{route_id}",
+                        "urgency": "high"
+                    })
+                    background_tasks.add_task(broadcast_jobs.run, job.id)
+                    push_result = {"job_id": job.id, "status": job.status}
+                except Exception as e:
+                    # 알림이 나가지 않았으므로 디바운스 기록을 지워 다시 열면 바로 재시도되도록
+                    web_push_service.forget_broadcast(f"route-open:{route_id}")
+                    logger.error(f"푸시 알림 작업 등록 실패: {e}")
+                    push_result = {"error": str(e)}
         
         response_data = {
             "message": f"노선이 {'오픈' if new_status else '닫힘'}되었습니다.",
-            "route": updated.data[0]
+            "route": updated
         }
         
         # 푸시 알림 결과 포함
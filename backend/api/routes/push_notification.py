@@ -2,24 +2,28 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import logging
 import json
 
-from backend.config.supabase_client import supabase
+from backend.repositories import user_repository, bus_route_repository, push_interest_repository
 from backend.services.web_push_service import web_push_service
+from backend.services.push_outbox import push_outbox
+from backend.services.push_subscription import normalize_subscription, subscription_cache
+from backend.services.broadcast_jobs import broadcast_jobs
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+BUS_TYPES = ["등교", "하교"]
+
 @router.get("/push/debug/{student_id}")
 async def debug_push_subscription(student_id: str):
     """특정 학생의 푸시 구독 정보 확인 (디버그용)"""
     try:
-        response = supabase.table("users").select("student_id, push_subscription, notification_enabled").eq("student_id", student_id).execute()
+        user = await user_repository.get_by_student_id(student_id, "student_id, push_subscription, notification_enabled")
         
-        if response.data and len(response.data) > 0:
-            user = response.data[0]
+        if user is not None:
             subscription = user.get("push_subscription")
             
             debug_info = {
@@ -48,6 +52,12 @@ class PushSubscription(BaseModel):
     subscription: Dict[str, Any]  # PushSubscription 객체
 
 
+class PushInterests(BaseModel):
+    """노선 오픈 알림 관심 등록 (노선 ID 또는 버스 종류)"""
+    route_ids: List[str] = []
+    bus_types: List[str] = []  # "등교" / "하교"
+
+
 class TestNotification(BaseModel):
     """테스트 알림"""
     student_id: str
@@ -57,17 +67,30 @@ class TestNotification(BaseModel):
 
 @router.post("/push/subscribe")
 async def subscribe_push_notification(data: PushSubscription):
-    """푸시 알림 구독 등록"""
+    """
+    푸시 알림 구독 등록
+    - 노선 오픈 알림은 관심 등록한 노선/버스 종류만 받으므로 PUT /push/interests/{student_id}로 따로 설정
+      (새 구독은 관심 등록 없음 - 마이그레이션 전부터 구독 중이던 사용자는 등교/하교 전체로 등록됨,
+      예매 오픈 알림은 구독자 전체에게 전송)
+    """
+    # 전송 시 다시 파싱하지 않도록 저장 전에 정규화 (잘못된 키는 여기서 거부)
+    try:
+        record = normalize_subscription(data.subscription)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         # 사용자 정보 업데이트
-        response = supabase.table("users").update({
-            "push_subscription": json.dumps(data.subscription),
+        subscription_json = record.to_json()
+        updated = await user_repository.update(data.student_id, {
+            "push_subscription": subscription_json,
             "notification_enabled": True
-        }).eq("student_id", data.student_id).execute()
+        })
         
-        if not response.data:
+        if updated is None:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
+        subscription_cache.put(subscription_json, record)
         logger.info(f"푸시 구독 등록 완료: {data.student_id}")
         
         return {
@@ -75,21 +98,82 @@ async def subscribe_push_notification(data: PushSubscription):
             "student_id": data.student_id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"푸시 구독 등록 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/push/interests/{student_id}")
+async def get_push_interests(student_id: str):
+    """노선 오픈 알림 관심 등록 조회"""
+    try:
+        interests = await push_interest_repository.list_for_student(student_id)
+        
+        return {
+            "student_id": student_id,
+            "route_ids": [row["route_id"] for row in interests if row.get("route_id")],
+            "bus_types": [row["bus_type"] for row in interests if row.get("bus_type")]
+        }
+        
+    except Exception as e:
+        logger.error(f"관심 노선 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/push/interests/{student_id}")
+async def update_push_interests(student_id: str, data: PushInterests):
+    """
+    노선 오픈 알림 관심 등록 변경 (기존 등록을 전달한 목록으로 교체)
+    - 버스 종류와 노선 ID를 먼저 검증하고, 교체는 한 트랜잭션으로 수행
+    """
+    invalid = [bus_type for bus_type in data.bus_types if bus_type not in BUS_TYPES]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 버스 종류입니다: {', '.join(invalid)}")
+    
+    route_ids = list(dict.fromkeys(data.route_ids))
+    bus_types = list(dict.fromkeys(data.bus_types))
+    
+    try:
+        user = await user_repository.get_by_student_id(student_id, "id")
+        if user is None:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+        
+        if route_ids:
+            existing = {route["route_id"] for route in await bus_route_repository.list_by_route_ids(route_ids)}
+            unknown = [route_id for route_id in route_ids if route_id not in existing]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"알 수 없는 노선입니다: {', '.join(unknown)}")
+        
+        await push_interest_repository.replace(student_id, route_ids, bus_types)
+        
+        logger.info(f"관심 노선 변경 완료: {student_id} (노선 {len(route_ids)}건, 종류 {len(bus_types)}건)")
+        
+        return {
+            "message": "알림 받을 노선이 변경되었습니다",
+            "student_id": student_id,
+            "route_ids": route_ids,
+            "bus_types": bus_types
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"관심 노선 변경 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/push/unsubscribe")
 async def unsubscribe_push_notification(student_id: str):
     """푸시 알림 구독 해제"""
     try:
-        response = supabase.table("users").update({
+        updated = await user_repository.update(student_id, {
             "push_subscription": None,
             "notification_enabled": False
-        }).eq("student_id", student_id).execute()
+        })
         
-        if not response.data:
+        if updated is None:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
         logger.info(f"푸시 구독 해제 완료: {student_id}")
@@ -109,19 +193,16 @@ async def send_test_notification(data: TestNotification):
     """테스트 푸시 알림 전송"""
     try:
         # 사용자의 구독 정보 조회
-        response = supabase.table("users")\
-            .select("push_subscription")\
-            .eq("student_id", data.student_id)\
-            .execute()
+        user = await user_repository.get_by_student_id(data.student_id, "push_subscription")
         
-        if not response.data or not response.data[0].get("push_subscription"):
+        if user is None or not user.get("push_subscription"):
             raise HTTPException(
                 status_code=404,
                 detail="푸시 구독 정보를 찾을 수 없습니다"
             )
         
         # 구독 정보 파싱
-        subscription_str = response.data[0]["push_subscription"]
+        subscription_str = user["push_subscription"]
         if isinstance(subscription_str, str):
             subscription = json.loads(subscription_str)
         else:
@@ -152,6 +233,46 @@ async def send_test_notification(data: TestNotification):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/push/outbox")
+async def get_push_outbox_stats():
+    """푸시 Outbox 상태별 작업 수 조회 (pending/sending/sent/expired/dead)"""
+    if not push_outbox.enabled:
+        return {"enabled": False}
+    
+    try:
+        return {"enabled": True, "jobs": await push_outbox.stats()}
+    except Exception as e:
+        logger.error(f"Outbox 상태 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/push/jobs/run")
+async def run_push_jobs(limit: int = 10):
+    """
+    실행할 브로드캐스트 작업(대기 중이거나 실행하던 인스턴스가 멈춘 작업)을 이 요청 안에서 실행
+    서버리스에서는 응답 후 BackgroundTasks가 끝까지 실행된다는 보장이 없으므로 관리자 페이지/Cron이 호출
+    """
+    try:
+        finished = await broadcast_jobs.run_due(limit)
+    except Exception as e:
+        logger.error(f"브로드캐스트 작업 실행 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"count": len(finished), "jobs": finished}
+
+
+@router.get("/push/jobs/{job_id}")
+async def get_push_job(job_id: str):
+    """브로드캐스트 작업 진행 상황 조회 (queued/sent/failed/expired, 초당 처리량)"""
+    try:
+        job = await broadcast_jobs.get(job_id)
+    except Exception as e:
+        logger.error(f"브로드캐스트 작업 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job.to_dict()
+
+
 @router.get("/push/vapid-public-key")
 async def get_vapid_public_key():
     """VAPID 공개키 조회"""
@@ -1,10 +1,10 @@
 # api/routes/reservation.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
-from datetime import datetime
 import logging
-from backend.config.supabase_client import supabase
-from backend.services.web_push_service import web_push_service
+from backend.repositories import reservation_status_repository
+from backend.services.broadcast_jobs import broadcast_jobs
+from backend.services.single_flight import single_flight
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -20,58 +20,59 @@ class ReservationUpdate(BaseModel):
     is_open: bool
     route_info: RouteInfo = None
 
+async def _read_reservation_status() -> dict:
+    # reservation_status 테이블에서 첫 번째 레코드 조회
+    status = await reservation_status_repository.get()
+    
+    if status is not None:
+        return {
+            "is_open": status["is_open"],
+            "updated_at": status["updated_at"]
+        }
+    else:
+        # 레코드가 없으면 생성
+        new_status = await reservation_status_repository.create(False)
+        
+        return {
+            "is_open": False,
+            "updated_at": new_status["updated_at"]
+        }
+
 @router.get("/reservation/status")
 async def get_reservation_status():
     """
     현재 예매 상태 조회 (Supabase)
+    - 동시에 들어온 조회는 진행 중인 DB 호출 하나를 함께 기다림 (single-flight)
     """
     try:
-        # reservation_status 테이블에서 첫 번째 레코드 조회
-        response = supabase.table("reservation_status").select("*").limit(1).execute()
-        
-        if response.data and len(response.data) > 0:
-            status = response.data[0]
-            return {
-                "is_open": status["is_open"],
-                "updated_at": status["updated_at"]
-            }
-        else:
-            # 레코드가 없으면 생성
-            new_status = supabase.table("reservation_status").insert({
-                "is_open": False
-            }).execute()
-            
-            return {
-                "is_open": False,
-                "updated_at": new_status.data[0]["updated_at"]
-            }
+        return await single_flight.do("reservation_status", _read_reservation_status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터베이스 오류: {str(e)}")
 
 @router.post("/reservation/update")
-async def update_reservation_status(body: ReservationUpdate):
+async def update_reservation_status(body: ReservationUpdate, background_tasks: BackgroundTasks):
     """
     예매 상태 변경 (열림/닫힘) - Supabase
+    
+    예매가 열리면 푸시 알림은 백그라운드 작업으로 전송하고 작업 ID만 반환
+    (진행 상황: GET /push/jobs/{job_id})
     """
     try:
         # 첫 번째 레코드 조회 (이전 상태 확인용)
-        response = supabase.table("reservation_status").select("id, is_open").limit(1).execute()
+        current = await reservation_status_repository.get()
         
-        if response.data and len(response.data) > 0:
+        if current is not None:
             # 이전 상태 저장
-            previous_status = response.data[0]["is_open"]
+            previous_status = current["is_open"]
             
             # 기존 레코드 업데이트
-            status_id = response.data[0]["id"]
-            updated = supabase.table("reservation_status").update({
-                "is_open": body.is_open,
-                "updated_at": datetime.now().isoformat()
-            }).eq("id", status_id).execute()
+            updated = await reservation_status_repository.update(current["id"], body.is_open)
+            single_flight.forget("reservation_status")
             
             # 🔥 닫혀있었는데 열린 경우 푸시 알림 전송
             push_result = None
             if not previous_status and body.is_open:
-                logger.info("예매 오픈 감지 - 푸시 알림 전송 시작")
+                logger.info("예매 오픈 감지 - 푸시 알림 작업 등록")
                 try:
                     # 노선 정보가 있으면 포함
                     notification_data = {}
@@ -88,15 +89,19 @@ async def update_reservation_status(body: ReservationUpdate):
                     else:
                         notification_body = "통학버스 예매가 오픈되었습니다. 지금 바로 예매하세요!"
                     
-                    push_result = await web_push_service.send_to_all_users(
-                        supabase,
-                        "🎉 통학버스 예매 오픈!",
-                        notification_body,
-                        notification_data
-                    )
-                    logger.info(f"푸시 알림 전송 결과: {push_result}")
+                    # 작업은 DB에 저장되어, 이 인스턴스가 끝까지 실행하지 못해도 POST /push/jobs/run이 이어서 실행
+                    job = await broadcast_jobs.create("reservation-open", {
+                        "kind": "all",
+                        "title": "🎉 통학버스 예매 오픈!",
+                        "body": notification_body,
+                        "data": notification_data,
+                        "topic": "reservation-open",
+                        "urgency": "high"
+                    })
+                    background_tasks.add_task(broadcast_jobs.run, job.id)
+                    push_result = {"job_id": job.id, "status": job.status}
                 except Exception as e:
-                    logger.error(f"푸시 알림 전송 실패: {e}")
+                    logger.error(f"푸시 알림 작업 등록 실패: {e}")
                     push_result = {"error": str(e)}
                     # 알림 실패해도 상태 업데이트는 성공으로 처리
             
@@ -104,7 +109,7 @@ async def update_reservation_status(body: ReservationUpdate):
                 "message": "예매 상태가 변경되었습니다.",
                 "state": {
                     "is_open": body.is_open,
-                    "updated_at": updated.data[0]["updated_at"]
+                    "updated_at": updated["updated_at"]
                 }
             }
             
@@ -115,15 +120,14 @@ async def update_reservation_status(body: ReservationUpdate):
             return response_data
         else:
             # 레코드가 없으면 생성
-            new_status = supabase.table("reservation_status").insert({
-                "is_open": body.is_open
-            }).execute()
+            new_status = await reservation_status_repository.create(body.is_open)
+            single_flight.forget("reservation_status")
             
             return {
                 "message": "예매 상태가 생성되었습니다.",
                 "state": {
                     "is_open": body.is_open,
-                    "updated_at": new_status.data[0]["updated_at"]
+                    "updated_at": new_status["updated_at"]
                 }
             }
     except Exception as e:
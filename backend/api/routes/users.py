@@ -6,11 +6,10 @@ import sys
 import os
 import hashlib
 
-# Supabase 클라이언트 import
-from backend.config.supabase_client import get_supabase_client
+# 데이터 접근 계층 import
+from backend.repositories import user_repository
 
 router = APIRouter()
-supabase = get_supabase_client()
 
 class UserLogin(BaseModel):
     student_id: str
@@ -44,12 +43,11 @@ async def login_user(login_data: UserLogin):
     """
     try:
         # 학번으로 사용자 조회
-        response = supabase.table("users").select("*").eq("student_id", login_data.student_id).execute()
+        user = await user_repository.get_by_student_id(login_data.student_id)
         
-        if not response.data or len(response.data) == 0:
+        if user is None:
             raise HTTPException(status_code=401, detail="학번 또는 비밀번호가 일치하지 않습니다.")
         
-        user = response.data[0]
         
         # 비밀번호 확인
         hashed_password = hash_password(login_data.password)
@@ -82,38 +80,38 @@ async def register_user(user: UserRegister):
     try:
         # 학번 중복 체크 (더 자세한 로깅)
         print(f"[DEBUG] 회원가입 시도 - 학번: {user.student_id}")
-        existing = supabase.table("users").select("*").eq("student_id", user.student_id).execute()
+        existing = await user_repository.get_by_student_id(user.student_id)
         
-        print(f"[DEBUG] 기존 사용자 조회 결과: {existing.data}")
+        print(f"[DEBUG] 기존 사용자 조회 결과: {existing}")
         
-        if existing.data and len(existing.data) > 0:
-            print(f"[DEBUG] 중복된 학번 발견: {existing.data}")
-            raise HTTPException(status_code=400, detail=f"이미 등록된 학번입니다. (ID: {existing.data[0].get('id')})")
+        if existing is not None:
+            print(f"[DEBUG] 중복된 학번 발견: {existing}")
+            raise HTTPException(status_code=400, detail=f"이미 등록된 학번입니다. (ID: {existing.get('id')})")
         
         # 비밀번호 해싱
         hashed_password = hash_password(user.password)
         
         # 회원 생성
         print(f"[DEBUG] 새 사용자 생성 시도...")
-        new_user = supabase.table("users").insert({
+        new_user = await user_repository.create({
             "student_id": user.student_id,
             "name": user.name,
             "password": hashed_password,
             "email": user.email,
             "phone": user.phone,
             "notification_enabled": True
-        }).execute()
+        })
         
-        print(f"[DEBUG] 회원가입 성공: {new_user.data}")
+        print(f"[DEBUG] 회원가입 성공: {new_user}")
         
         return {
             "message": "회원가입이 완료되었습니다.",
             "user": {
-                "id": new_user.data[0]["id"],
-                "student_id": new_user.data[0]["student_id"],
-                "name": new_user.data[0]["name"],
-                "email": new_user.data[0]["email"],
-                "phone": new_user.data[0]["phone"]
+                "id": new_user["id"],
+                "student_id": new_user["student_id"],
+                "name": new_user["name"],
+                "email": new_user["email"],
+                "phone": new_user["phone"]
             }
         }
     except HTTPException:
@@ -130,12 +128,11 @@ async def get_user(student_id: str):
     학번으로 회원 정보 조회
     """
     try:
-        response = supabase.table("users").select("*").eq("student_id", student_id).execute()
+        user = await user_repository.get_by_student_id(student_id)
         
-        if not response.data or len(response.data) == 0:
+        if user is None:
             raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
         
-        user = response.data[0]
         # 민감한 정보는 제외하고 반환
         return {
             "id": user["id"],
@@ -175,20 +172,20 @@ async def update_user(student_id: str, user_update: UserUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="업데이트할 데이터가 없습니다.")
         
-        updated = supabase.table("users").update(update_data).eq("student_id", student_id).execute()
+        updated = await user_repository.update(student_id, update_data)
         
-        if not updated.data or len(updated.data) == 0:
+        if updated is None:
             raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
         
         return {
             "message": "회원 정보가 업데이트되었습니다.",
             "user": {
-                "id": updated.data[0]["id"],
-                "student_id": updated.data[0]["student_id"],
-                "name": updated.data[0]["name"],
-                "email": updated.data[0]["email"],
-                "phone": updated.data[0]["phone"],
-                "notification_enabled": updated.data[0]["notification_enabled"]
+                "id": updated["id"],
+                "student_id": updated["student_id"],
+                "name": updated["name"],
+                "email": updated["email"],
+                "phone": updated["phone"],
+                "notification_enabled": updated["notification_enabled"]
             }
         }
     except HTTPException:
@@ -215,9 +212,9 @@ async def update_push_token(student_id: str, token_data: PushTokenUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="토큰 정보가 없습니다.")
         
-        updated = supabase.table("users").update(update_data).eq("student_id", student_id).execute()
+        updated = await user_repository.update(student_id, update_data)
         
-        if not updated.data or len(updated.data) == 0:
+        if updated is None:
             raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
         
         return {
@@ -236,11 +233,11 @@ async def get_all_users():
     모든 회원 조회 (관리자용)
     """
     try:
-        response = supabase.table("users").select("id, student_id, name, email, phone, notification_enabled, created_at").order("created_at", desc=True).execute()
+        users = await user_repository.list_all("id, student_id, name, email, phone, notification_enabled, created_at")
         
         return {
-            "users": response.data,
-            "count": len(response.data)
+            "users": users,
+            "count": len(users)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"조회 실패: {str(e)}")
@@ -251,11 +248,11 @@ async def get_notification_enabled_users():
     알림이 활성화된 회원 목록 조회 (푸시 알림 전송용)
     """
     try:
-        response = supabase.table("users").select("*").eq("notification_enabled", True).execute()
+        users = await user_repository.list_notification_enabled()
         
         # FCM 또는 APN 토큰이 있는 사용자만 필터링
         users_with_tokens = [
-            user for user in response.data 
+            user for user in users 
             if user.get("fcm_token") or user.get("apn_token")
         ]
         
@@ -0,0 +1,3 @@
+"""
+푸시 브로드캐스트 벤치마크 도구 (로컬 모의 푸시 서비스 포함)
+"""
@@ -0,0 +1,143 @@
+"""
+예매 처리량 벤치마크 (오프라인, SQLite)
+DATA_BACKEND=sqlite로 API 앱을 띄우고 합성 회원/노선을 채운 뒤, 노선 오픈 직후처럼
+동시에 몰리는 POST /api/bookings 요청을 앱에 직접(ASGI) 보내 처리량과 지연(p50/p99)을 측정
+
+실행:
+    python -m backend.benchmarks.booking_benchmark --users 20000 --routes 26 --seats 44 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta, datetime, timezone
+from typing import Dict, Any, List
+
+import httpx
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def seed(database, users: int, routes: int, seats: int):
+    """합성 회원/노선 생성 (모든 노선 예매 오픈 상태)"""
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+    departure_date = (date.today() + timedelta(days=1)).isoformat()
+    conn = database.connect()
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO users (id, student_id, name, phone, notification_enabled, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, 1, ?, ?)",
+        [(f"user-{i}", f"S{i:08d}", f"학생{i}", f"010{i:08d}", now, now) for i in range(users)]
+    )
+    conn.executemany(
+        "INSERT INTO bus_routes (id, route_name, route_id, bus_type, departure_date, departure_time, "
+        "total_seats, available_seats, is_open, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, '07:00', ?, ?, 1, ?, ?)",
+        [
+            (f"route-{i}", f"노선{i}", f"ROUTE_{i:03d}", "등교" if i % 2 == 0 else "하교",
+             departure_date, seats, seats, now, now)
+            for i in range(routes)
+        ]
+    )
+    conn.execute("COMMIT")
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    # 저장소는 import 시점에 DATA_BACKEND로 결정되므로 앱보다 먼저 설정
+    os.environ["DATA_BACKEND"] = "sqlite"
+    os.environ["SQLITE_DB_PATH"] = args.db
+    from backend.main import app
+    from backend.repositories import sqlite_database
+    from backend.services.seat_inventory import seat_inventory
+
+    print(f"합성 회원 {args.users}명, 노선 {args.routes}개 생성 중...")
+    seed(sqlite_database, args.users, args.routes, args.seats)
+
+    rng = random.Random(args.seed)
+    requests = [
+        {"student_id": f"S{rng.randrange(args.users):08d}", "route_id": f"ROUTE_{rng.randrange(args.routes):03d}"}
+        for _ in range(args.requests)
+    ]
+
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def book(client: httpx.AsyncClient, body: Dict[str, Any]):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/bookings", json=body)
+            latencies.append(time.perf_counter() - started)
+            key = str(response.status_code)
+            status_counts[key] = status_counts.get(key, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(book(client, body) for body in requests))
+        elapsed = time.perf_counter() - started
+
+    booked_seats = sqlite_database.fetch_one("SELECT COALESCE(SUM(seat_count), 0) AS seats FROM reservations")["seats"]
+    remaining = sqlite_database.fetch_one("SELECT SUM(available_seats) AS seats FROM bus_routes")["seats"]
+
+    return {
+        "requests": args.requests,
+        "elapsed": elapsed,
+        "throughput": args.requests / elapsed if elapsed else 0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "status_counts": status_counts,
+        "booked_seats": booked_seats,
+        "remaining_seats": remaining,
+        "capacity": args.routes * args.seats,
+        "inventory": {"admitted": seat_inventory.admitted, "rejected": seat_inventory.rejected},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예매 처리량 벤치마크 (SQLite)")
+    parser.add_argument("--users", type=int, default=5000, help="합성 회원 수")
+    parser.add_argument("--routes", type=int, default=26, help="노선 수")
+    parser.add_argument("--seats", type=int, default=44, help="노선별 좌석 수")
+    parser.add_argument("-n", "--requests", type=int, default=5000, help="예매 요청 수")
+    parser.add_argument("--concurrency", type=int, default=200, help="동시 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="SQLite 파일 경로 (없으면 임시 파일)")
+    args = parser.parse_args()
+
+    cleanup = args.db is None
+    if cleanup:
+        fd, args.db = tempfile.mkstemp(prefix="schoolbus_bench_", suffix=".db")
+        os.close(fd)
+
+    try:
+        report = asyncio.run(run_benchmark(args))
+    finally:
+        if cleanup:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(args.db + suffix):
+                    os.remove(args.db + suffix)
+
+    print("=" * 60)
+    print("📊 예매 벤치마크 결과")
+    print("=" * 60)
+    print(f"  요청 수: {report['requests']}, 동시성: {args.concurrency}")
+    print(f"  전체 시간: {report['elapsed']:.2f}s")
+    print(f"  처리량: {report['throughput']:.1f} req/s")
+    print(f"  지연 p50/p99: {report['p50_ms']:.1f} / {report['p99_ms']:.1f} ms")
+    print(f"  응답 코드: {report['status_counts']}")
+    print(f"  예매 좌석: {report['booked_seats']} / {report['capacity']} (잔여 {report['remaining_seats']})")
+    print(f"  입장 제어: {report['inventory']}")
+
+
+if __name__ == "__main__":
+    main()
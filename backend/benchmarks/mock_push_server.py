@@ -0,0 +1,169 @@
+"""
+로컬 모의 푸시 서비스
+Apple/FCM 대신 aes128gcm 푸시 요청을 받아 VAPID JWT를 검증하고,
+지연 / 429 / 410 응답을 주입할 수 있는 테스트용 서버
+
+실행:
+    python -m backend.benchmarks.mock_push_server --port 8099 --latency-ms 30 --rate-429 0.01 --rate-410 0.02
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from typing import Dict, Any, Optional
+
+from fastapi import FastAPI, Request, Response
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+# aes128gcm 본문 최소 길이: salt(16) + rs(4) + idlen(1) + keyid(65) + 태그(16)
+_MIN_AES128GCM_LENGTH = 16 + 4 + 1 + 65 + 16
+
+
+def _b64_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def _parse_vapid_authorization(header: str) -> Optional[Dict[str, str]]:
+    """'vapid t=<jwt>, k=<public key>' 헤더 파싱"""
+    if not header.lower().startswith("vapid "):
+        return None
+    params = {}
+    for part in header[6:].split(","):
+        key, _, value = part.strip().partition("=")
+        params[key] = value
+    if "t" not in params or "k" not in params:
+        return None
+    return params
+
+
+def verify_vapid_jwt(token: str, public_key_b64: str, audience: str) -> Optional[str]:
+    """VAPID JWT 검증 - 문제가 있으면 오류 메시지, 정상이면 None"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64_decode(header_b64))
+        claims = json.loads(_b64_decode(payload_b64))
+    except ValueError:
+        return "malformed JWT"
+
+    if header.get("alg") != "ES256":
+        return "unsupported alg"
+    if claims.get("aud") != audience:
+        return f"aud mismatch: {claims.get('aud')}"
+    exp = claims.get("exp", 0)
+    now = time.time()
+    if exp <= now or exp > now + 86400 + 60:
+        return "exp out of range"
+    if not str(claims.get("sub", "")).startswith(("mailto:", "https:")):
+        return "invalid sub"
+
+    try:
+        public_key = ec.EllipticCurvePublicKey.from_encoded_point(
+            ec.SECP256R1(), _b64_decode(public_key_b64)
+        )
+        signature = _b64_decode(signature_b64)
+        der_signature = encode_dss_signature(
+            int.from_bytes(signature[:32], "big"),
+            int.from_bytes(signature[32:], "big")
+        ) if len(signature) == 64 else signature
+        public_key.verify(
+            der_signature,
+            f"{header_b64}.{payload_b64}".encode(),
+            ec.ECDSA(hashes.SHA256())
+        )
+    except (ValueError, InvalidSignature):
+        return "invalid signature"
+    return None
+
+
+def create_mock_push_app(
+    latency_ms: float = 0,
+    jitter_ms: float = 0,
+    rate_429: float = 0,
+    rate_410: float = 0,
+    retry_after: int = 1,
+    seed: Optional[int] = None
+) -> FastAPI:
+    """
+    모의 푸시 서비스 앱 생성
+
+    Args:
+        latency_ms / jitter_ms: 응답 지연 (평균 + 균등 분포 지터)
+        rate_429: 429 Too Many Requests 비율 (Retry-After 포함)
+        rate_410: 410 Gone(만료된 구독) 비율
+    """
+    app = FastAPI(title="Mock Push Service")
+    rng = random.Random(seed)
+    stats: Dict[str, Any] = {"received": 0, "accepted": 0, "throttled": 0, "gone": 0, "rejected": 0}
+    app.state.stats = stats
+
+    @app.post("/push/{token}")
+    async def receive_push(token: str, request: Request):
+        stats["received"] += 1
+        body = await request.body()
+
+        if request.headers.get("content-encoding") != "aes128gcm" or len(body) < _MIN_AES128GCM_LENGTH:
+            stats["rejected"] += 1
+            return Response("invalid aes128gcm body", status_code=400)
+        if "ttl" not in request.headers:
+            stats["rejected"] += 1
+            return Response("missing TTL", status_code=400)
+
+        vapid = _parse_vapid_authorization(request.headers.get("authorization", ""))
+        audience = f"{request.url.scheme}://{request.url.netloc}"
+        error = "missing VAPID authorization" if vapid is None else verify_vapid_jwt(
+            vapid["t"], vapid["k"], audience
+        )
+        if error:
+            stats["rejected"] += 1
+            return Response(error, status_code=403)
+
+        if latency_ms or jitter_ms:
+            await asyncio.sleep((latency_ms + rng.uniform(0, jitter_ms)) / 1000)
+
+        roll = rng.random()
+        if roll < rate_429:
+            stats["throttled"] += 1
+            return Response("slow down", status_code=429, headers={"Retry-After": str(retry_after)})
+        if roll < rate_429 + rate_410:
+            stats["gone"] += 1
+            return Response("subscription expired", status_code=410)
+
+        stats["accepted"] += 1
+        return Response(status_code=201)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 푸시 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-429", type=float, default=0)
+    parser.add_argument("--rate-410", type=float, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_mock_push_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_410=args.rate_410,
+        retry_after=args.retry_after
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+브로드캐스트 처리량 벤치마크
+모의 푸시 서비스를 별도 프로세스로 띄우고, 합성 구독 N개에 WebPushService로 전송하여
+전체 처리량과 메시지별 지연(p50/p99)을 측정
+
+실행:
+    python -m backend.benchmarks.push_broadcast_benchmark -n 5000 --concurrency 100 --latency-ms 30
+"""
+import argparse
+import asyncio
+import base64
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+from typing import Dict, Any, List
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from backend.services.web_push_service import WebPushService, PreparedBroadcast, PushResult
+from backend.benchmarks.mock_push_server import create_mock_push_app
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def generate_subscriptions(count: int, base_url: str) -> List[Dict[str, Any]]:
+    """합성 구독 생성 (실제 P-256 공개키 + 임의 auth secret)"""
+    subscriptions = []
+    for i in range(count):
+        key = ec.generate_private_key(ec.SECP256R1())
+        public_key = key.public_key().public_bytes(
+            serialization.Encoding.X962,
+            serialization.PublicFormat.UncompressedPoint
+        )
+        subscriptions.append({
+            "endpoint": f"{base_url}/push/{i}",
+            "keys": {"p256dh": _b64(public_key), "auth": _b64(os.urandom(16))}
+        })
+    return subscriptions
+
+
+class TimedWebPushService(WebPushService):
+    """메시지별 전송 지연과 브로드캐스트 시작 후 완료 시각을 기록 (샤딩 모드에서는 완료 시각만)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started_at = 0.0
+        self.send_latencies: List[float] = []
+        self.completion_times: List[float] = []
+
+    async def _post(self, record, encrypted: bytes, push_headers=None) -> PushResult:
+        started = time.perf_counter()
+        result = await super()._post(record, encrypted, push_headers)
+        self.send_latencies.append(time.perf_counter() - started)
+        return result
+
+    async def _dispatch(self, broadcast, entries, on_result, concurrency=None):
+        def _timed(key, result):
+            self.completion_times.append(time.perf_counter() - self.started_at)
+            on_result(key, result)
+
+        await super()._dispatch(broadcast, entries, _timed, concurrency)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_mock_server(port: int, options: Dict[str, Any]):
+    import uvicorn
+    uvicorn.run(create_mock_push_app(**options), host="127.0.0.1", port=port, log_level="warning")
+
+
+async def _wait_until_ready(base_url: str, timeout: float = 15):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(f"{base_url}/stats")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("모의 푸시 서비스가 시작되지 않았습니다")
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    base_url = args.url
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{args.port or _free_port()}"
+    await _wait_until_ready(base_url)
+
+    print(f"합성 구독 {args.count}개 생성 중...")
+    subscriptions = generate_subscriptions(args.count, base_url)
+
+    # 벤치마크용 임시 VAPID 키 (샤드 워커 프로세스도 읽도록 환경 변수로 전달)
+    vapid_key = ec.generate_private_key(ec.SECP256R1())
+    os.environ["VAPID_PRIVATE_KEY_PEM"] = vapid_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    os.environ["VAPID_PUBLIC_KEY"] = _b64(vapid_key.public_key().public_bytes(
+        serialization.Encoding.X962,
+        serialization.PublicFormat.UncompressedPoint
+    ))
+    service = TimedWebPushService(
+        concurrency=args.concurrency,
+        encrypt_mode=args.encrypt_mode,
+        shards=args.shards
+    )
+
+    broadcast = PreparedBroadcast("🚌 벤치마크", "브로드캐스트 처리량 측정", {"route_id": "BENCH"})
+
+    service.started_at = time.perf_counter()
+    results = await service.deliver_payload(broadcast, subscriptions)
+    elapsed = time.perf_counter() - service.started_at
+
+    async with httpx.AsyncClient() as client:
+        server_stats = (await client.get(f"{base_url}/stats")).json()
+    await service.aclose()
+
+    status_counts: Dict[str, int] = {}
+    for result in results:
+        key = str(result.status_code) if result is not None else "error"
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+    return {
+        "count": args.count,
+        "elapsed": elapsed,
+        "throughput": args.count / elapsed if elapsed else 0,
+        "send_p50_ms": _percentile(service.send_latencies, 50) * 1000,
+        "send_p99_ms": _percentile(service.send_latencies, 99) * 1000,
+        "delivered_p50_ms": _percentile(service.completion_times, 50) * 1000,
+        "delivered_p99_ms": _percentile(service.completion_times, 99) * 1000,
+        "status_counts": status_counts,
+        "server_stats": server_stats,
+        "host_lanes": service.host_lane_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web Push 브로드캐스트 처리량 벤치마크")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="합성 구독 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 전송 수")
+    parser.add_argument("--encrypt-mode", choices=["process", "inline"], default="process")
+    parser.add_argument("--shards", type=int, default=0, help="샤드 워커 프로세스 수 (0이면 단일 프로세스)")
+    parser.add_argument("--url", help="이미 실행 중인 모의 푸시 서비스 주소 (없으면 자동 실행)")
+    parser.add_argument("--port", type=int, help="자동 실행할 모의 서비스 포트")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--rate-429", type=float, default=0)
+    parser.add_argument("--rate-410", type=float, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        args.port = args.port or _free_port()
+        server = multiprocessing.get_context("spawn").Process(
+            target=_run_mock_server,
+            args=(args.port, {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "rate_429": args.rate_429,
+                "rate_410": args.rate_410,
+            }),
+            daemon=True
+        )
+        server.start()
+
+    try:
+        report = asyncio.run(run_benchmark(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    print("=" * 60)
+    print("📊 브로드캐스트 벤치마크 결과")
+    print("=" * 60)
+    print(f"  구독 수: {report['count']}")
+    print(f"  동시성: {args.concurrency}, 암호화: {args.encrypt_mode}, 샤드: {args.shards}")
+    print(f"  전체 시간: {report['elapsed']:.2f}s")
+    print(f"  처리량: {report['throughput']:.1f} msg/s")
+    print(f"  전송 지연 p50/p99: {report['send_p50_ms']:.1f} / {report['send_p99_ms']:.1f} ms")
+    print(f"  전달 완료 시각 p50/p99: {report['delivered_p50_ms']:.1f} / {report['delivered_p99_ms']:.1f} ms")
+    print(f"  응답 코드: {report['status_counts']}")
+    print(f"  서버 통계: {report['server_stats']}")
+    print(f"  호스트별 속도: {report['host_lanes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Supabase 데이터 접근 공통 실행기
+supabase-py의 .execute()는 동기 호출이므로 이벤트 루프에서 직접 부르면 그동안 다른 요청이 모두 멈춘다.
+모든 라우트/서비스/폴러는 이 모듈을 통해 크기가 정해진 스레드 풀에서 쿼리를 실행한다.
+
+사용 예:
+    response = await run_query(supabase.table("users").select("*").eq("student_id", sid))
+"""
+import os
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# 동시에 진행할 수 있는 DB 호출 수 (HTTP 커넥션 풀 크기와 맞추는 것을 권장)
+DB_THREAD_POOL_SIZE = int(os.getenv("DB_THREAD_POOL_SIZE", "32"))
+
+_executor = ThreadPoolExecutor(max_workers=DB_THREAD_POOL_SIZE, thread_name_prefix="supabase")
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """동기 함수를 DB 스레드 풀에서 실행 (요청별 DB 계측이 이어지도록 현재 컨텍스트를 넘김)"""
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, context.run, func, *args)
+
+
+async def run_query(query) -> Any:
+    """PostgREST 쿼리 빌더(.execute()를 가진 객체)를 DB 스레드 풀에서 실행하고 응답 반환"""
+    return await run_sync(query.execute)
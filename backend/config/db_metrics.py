@@ -0,0 +1,178 @@
+"""
+요청별 DB 호출 계측
+요청마다 쿼리 수, 테이블별 지연, 총 DB 시간을 기록해 Server-Timing 응답 헤더로 내보내고
+라우트별로 누적해 GET /metrics/db 에서 확인할 수 있게 함
+
+기록은 저장소 구현의 가장 아래 계층이 호출마다 current_db_stats()에 남긴다:
+    supabase - 공용 트랜스포트(http_pool.PooledTransport)가 PostgREST 호출마다
+    sqlite   - 커넥션(sqlite_repository._InstrumentedConnection)이 SQL 문장마다
+DB 스레드 풀(database.run_sync)은 호출한 요청의 컨텍스트를 그대로 넘기므로 스레드에서도 같은 요청으로 집계된다.
+"""
+import os
+import re
+import time
+import threading
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class RequestDBStats:
+    """요청 하나의 DB 호출 기록 (여러 스레드에서 동시에 기록될 수 있음)"""
+
+    __slots__ = ("queries", "db_time", "tables", "_lock")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.tables: Dict[str, list] = {}  # table -> [호출 수, 시간]
+        self._lock = threading.Lock()
+
+    def record(self, table: str, duration: float):
+        with self._lock:
+            self.queries += 1
+            self.db_time += duration
+            entry = self.tables.setdefault(table, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing 헤더 값 (db 합계 + 테이블별 + 전체 처리 시간)"""
+        with self._lock:
+            metrics = [f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"']
+            for table, (count, duration) in sorted(self.tables.items()):
+                metrics.append(f'db-{_TOKEN_UNSAFE.sub("-", table)};dur={duration * 1000:.1f};desc="{count}"')
+        metrics.append(f"app;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_db_stats() -> Optional[RequestDBStats]:
+    return _current.get()
+
+
+def table_of(path: str) -> str:
+    """PostgREST URL 경로에서 테이블 이름 추출 (/rest/v1/users → users, /rest/v1/rpc/book_seats → rpc/book_seats)"""
+    _, sep, rest = path.partition("/rest/v1/")
+    if not sep:
+        return "other"
+    return rest.strip("/") or "other"
+
+
+class RouteDBMetrics:
+    """라우트별 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, route: str, stats: RequestDBStats, total: float):
+        with stats._lock:
+            tables = {table: tuple(entry) for table, entry in stats.tables.items()}
+            queries, db_time = stats.queries, stats.db_time
+        with self._lock:
+            metrics = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_time": 0.0, "total_time": 0.0,
+                "max_queries": 0, "max_db_time": 0.0, "tables": {}
+            })
+            metrics["requests"] += 1
+            metrics["queries"] += queries
+            metrics["db_time"] += db_time
+            metrics["total_time"] += total
+            metrics["max_queries"] = max(metrics["max_queries"], queries)
+            metrics["max_db_time"] = max(metrics["max_db_time"], db_time)
+            for table, (count, duration) in tables.items():
+                entry = metrics["tables"].setdefault(table, [0, 0.0])
+                entry[0] += count
+                entry[1] += duration
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for route, metrics in self._routes.items():
+                requests = metrics["requests"]
+                result[route] = {
+                    "requests": requests,
+                    "avg_queries": round(metrics["queries"] / requests, 2),
+                    "max_queries": metrics["max_queries"],
+                    "avg_db_ms": round(metrics["db_time"] / requests * 1000, 2),
+                    "max_db_ms": round(metrics["max_db_time"] * 1000, 2),
+                    "avg_total_ms": round(metrics["total_time"] / requests * 1000, 2),
+                    "db_share": round(metrics["db_time"] / metrics["total_time"], 3) if metrics["total_time"] else 0.0,
+                    "tables": {
+                        table: {"queries": count, "avg_ms": round(duration / count * 1000, 2)}
+                        for table, (count, duration) in sorted(metrics["tables"].items())
+                    }
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+def _route_key(scope) -> str:
+    """"GET /api/routes/{route_id}" 형태의 라우트 키 (경로 파라미터 값별로 나뉘지 않도록 템플릿 사용)"""
+    method = scope.get("method", "")
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return f"{method} (unmatched)"
+    # include_router 접두사가 템플릿에 없는 FastAPI 버전도 있어 실제 경로에서 접두사를 복원
+    path = scope.get("path", "")
+    prefix_depth = path.count("/") - template.count("/")
+    prefix = "/".join(path.split("/")[:prefix_depth + 1]) if prefix_depth > 0 else ""
+    return f"{method} {prefix}{template}"
+
+
+class DBTimingMiddleware:
+    """
+    요청마다 DB 호출을 집계해 Server-Timing 헤더를 붙이고 라우트별 통계에 누적하는 ASGI 미들웨어
+    (헤더는 응답 시작 시점까지의 호출만 포함, 백그라운드 작업은 제외)
+    """
+
+    def __init__(self, app, metrics: Optional[RouteDBMetrics] = None, enabled: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.metrics = metrics if metrics is not None else route_db_metrics
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        recorded = False
+
+        def finish() -> float:
+            """라우트별 통계에 한 번만 누적하고 경과 시간 반환"""
+            nonlocal recorded
+            total = time.perf_counter() - started
+            if not recorded:
+                recorded = True
+                self.metrics.add(_route_key(scope), stats, total)
+            return total
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total = finish()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(total).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish()
+            _current.reset(token)
+
+
+# 전역 인스턴스
+route_db_metrics = RouteDBMetrics()
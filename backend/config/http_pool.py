@@ -0,0 +1,149 @@
+"""
+Supabase(PostgREST) 공용 HTTP 커넥션 풀
+모든 쿼리가 하나의 HTTP/2 keep-alive 커넥션 풀을 공유해 요청마다 TLS/연결 수립을 반복하지 않도록 하고,
+풀 사용량과 대기 시간을 기록해 워커 수를 Supabase 연결 한도에 맞춰 조정할 수 있게 함
+"""
+import os
+import time
+import threading
+from typing import Dict, Any
+
+import httpx
+
+from .database import DB_THREAD_POOL_SIZE
+from .db_metrics import current_db_stats, table_of
+
+# 풀 설정 (환경 변수로 조정 가능)
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", str(DB_THREAD_POOL_SIZE)))  # 동시에 진행할 수 있는 요청 수
+SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", str(SUPABASE_POOL_SIZE)))  # 유지할 유휴 커넥션 수
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))  # 유휴 커넥션 유지 시간 (초)
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+SUPABASE_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "120"))  # postgrest 기본값과 동일
+SUPABASE_POOL_TIMEOUT = float(os.getenv("SUPABASE_POOL_TIMEOUT", "10"))  # 풀 자리가 날 때까지 기다리는 최대 시간
+
+
+def build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        SUPABASE_READ_TIMEOUT,
+        connect=SUPABASE_CONNECT_TIMEOUT,
+        pool=SUPABASE_POOL_TIMEOUT
+    )
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """응답 본문을 다 읽고 닫을 때 풀 자리를 반납하는 스트림"""
+
+    def __init__(self, stream: httpx.SyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class PooledTransport(httpx.HTTPTransport):
+    """
+    동시 요청 수를 pool_size로 제한하고 사용량/대기 시간을 기록하는 HTTP 트랜스포트
+
+    HTTP/2에서는 커넥션 하나에 여러 요청이 다중화되므로 커넥션 수만으로는 부하를 알 수 없어,
+    요청 단위로 자리를 잡고(응답 본문을 닫을 때 반납) 그 대기 시간을 잰다.
+    """
+
+    def __init__(self, pool_size: int = SUPABASE_POOL_SIZE, pool_timeout: float = SUPABASE_POOL_TIMEOUT, **kwargs):
+        kwargs.setdefault("http2", SUPABASE_HTTP2)
+        kwargs.setdefault("limits", httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=min(SUPABASE_POOL_KEEPALIVE, pool_size),
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+        ))
+        super().__init__(**kwargs)
+        self.pool_size = max(1, pool_size)
+        self.pool_timeout = pool_timeout
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak = 0
+        self._requests = 0
+        self._waited = 0  # 자리가 없어 기다린 요청 수
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def _acquire(self, request: httpx.Request):
+        started = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            if not self._slots.acquire(timeout=self.pool_timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise httpx.PoolTimeout(
+                    f"Supabase 커넥션 풀 대기 시간 초과 ({self.pool_timeout}초, 풀 크기 {self.pool_size})",
+                    request=request
+                )
+            waited = time.perf_counter() - started
+            with self._lock:
+                self._waited += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._acquire(request)
+        # 요청별 DB 시간 계측 (풀 대기 제외, 응답 본문 수신까지 포함)
+        db_stats = current_db_stats()
+        started = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self._release()
+            raise
+
+        released = False
+
+        def release_once():
+            nonlocal released
+            if not released:
+                released = True
+                self._release()
+                if db_stats is not None:
+                    db_stats.record(table_of(request.url.path), time.perf_counter() - started)
+
+        response.stream = _ReleasingStream(response.stream, release_once)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "http2": SUPABASE_HTTP2,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak,
+                "utilization": round(self._in_flight / self.pool_size, 3),
+                "connections": len(connections),
+                "idle_connections": idle,
+                "requests": self._requests,
+                "waited": self._waited,
+                "avg_wait_ms": round(self._wait_total / self._waited * 1000, 2) if self._waited else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+                "pool_timeouts": self._timeouts
+            }
+
+
+# 전역 인스턴스 (Supabase 클라이언트의 PostgREST 세션이 공유)
+supabase_transport = PooledTransport()
@@ -2,15 +2,41 @@
 Supabase 클라이언트 초기화 및 설정 (Lazy initialization)
 """
 import os
-from supabase import create_client, Client
+from supabase import Client
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
 from dotenv import load_dotenv
 
+from .http_pool import supabase_transport, build_timeout
+
 # 환경 변수 로드
 load_dotenv()
 
 # 전역 변수
 _supabase_client: Client = None
 
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """공용 커넥션 풀(supabase_transport)을 사용하는 PostgREST 클라이언트"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None) -> SyncClient:
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=build_timeout(),
+            follow_redirects=True,
+            transport=supabase_transport
+        )
+
+
+class _PooledClient(Client):
+    """PostgREST 세션을 공용 커넥션 풀 위에 만드는 Supabase 클라이언트"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        return _PooledPostgrestClient(rest_url, headers=headers, schema=schema)
+
+
 def get_supabase_client() -> Client:
     """
     Supabase 클라이언트 인스턴스 반환 (Lazy initialization)
@@ -24,7 +50,7 @@ def get_supabase_client() -> Client:
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
         
-        _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        _supabase_client = _PooledClient.create(SUPABASE_URL, SUPABASE_KEY)
     
     return _supabase_client
 
@@ -38,3 +64,8 @@ class _SupabaseLazyProxy:
         return get_supabase_client()(*args, **kwargs)
 
 supabase = _SupabaseLazyProxy()
+
+
+def get_pool_stats() -> dict:
+    """Supabase HTTP 커넥션 풀 사용량 및 대기 시간"""
+    return supabase_transport.stats()
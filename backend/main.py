@@ -1,7 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.api import router as api_router
+from backend.services.web_push_service import web_push_service
+from backend.services.push_outbox import push_outbox
+from backend.services.broadcast_jobs import broadcast_jobs
+from backend.services.waiting_room import waiting_room
+from backend.services.single_flight import single_flight
+from backend.config.supabase_client import get_pool_stats
+from backend.config.db_metrics import DBTimingMiddleware, route_db_metrics
 import os
+import asyncio
 
 app = FastAPI(title="SchoolBus API", version="1.0.0")
 
@@ -17,10 +25,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 DB 호출 수/시간을 Server-Timing 헤더로 전달하고 라우트별로 집계 (GET /metrics/db)
+app.add_middleware(DBTimingMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/api")
 
 
+@app.on_event("startup")
+async def start_push_outbox():
+    """Outbox 모드면 재시작 전에 남은 푸시 작업을 이어서 전송"""
+    if push_outbox.enabled:
+        push_outbox.start()
+
+
+@app.on_event("startup")
+async def resume_broadcast_jobs():
+    """이전 프로세스가 끝내지 못한 브로드캐스트 작업을 백그라운드로 이어서 실행"""
+    app.state.broadcast_resume = asyncio.create_task(broadcast_jobs.resume())
+
+
+@app.on_event("shutdown")
+async def close_push_connections():
+    """푸시 Outbox 워커, 예매 대기열 및 커넥션 풀 정리"""
+    await push_outbox.stop()
+    await waiting_room.stop()
+    await web_push_service.aclose()
+
+
 @app.get("/")
 async def root():
     return {"message": "SchoolBus API Server"}
@@ -29,3 +61,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/db")
+async def db_pool_health():
+    """Supabase 커넥션 풀 사용량 (워커 수를 Supabase 연결 한도에 맞출 때 참고)"""
+    return {"pool": get_pool_stats()}
+
+
+@app.get("/metrics/db")
+async def db_metrics(reset: bool = False):
+    """라우트별 DB 호출 통계 (요청당 평균 쿼리 수, DB 시간, 테이블별 지연)"""
+    routes = route_db_metrics.snapshot()
+    if reset:
+        route_db_metrics.reset()
+    return {"routes": routes, "pool": get_pool_stats(), "single_flight": single_flight.stats()}
@@ -0,0 +1,84 @@
+-- =====================================================
+-- 마이그레이션: 좌석 예매를 한 번의 RPC로 처리하는 book_seats 함수 추가
+-- =====================================================
+
+-- 1. book_seats 함수
+--    예매 오픈 여부 확인, 잔여석 조건부 차감, 예약 생성을 하나의 트랜잭션에서 처리한다.
+--    UPDATE ... WHERE available_seats >= p_seat_count 가 노선 행을 잠그므로
+--    동시에 들어온 예매는 순서대로 처리되고 잔여석보다 많이 팔리지 않는다.
+--
+--    반환값 (JSONB):
+--      {"status": "ok", "reservation": {...}, "available_seats": 남은 좌석}
+--      {"status": "not_found"}                        노선 없음
+--      {"status": "closed"}                           예매가 열려 있지 않음
+--      {"status": "sold_out", "available_seats": n}   잔여석 부족
+--      {"status": "invalid_seat_count"}               예약 인원이 1 미만
+CREATE OR REPLACE FUNCTION book_seats(
+    p_route_id TEXT,
+    p_student_id TEXT,
+    p_seat_count INTEGER DEFAULT 1
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_route bus_routes%ROWTYPE;
+    v_user users%ROWTYPE;
+    v_reservation reservations%ROWTYPE;
+BEGIN
+    IF p_seat_count IS NULL OR p_seat_count < 1 THEN
+        RETURN jsonb_build_object('status', 'invalid_seat_count');
+    END IF;
+
+    -- 열려 있고 잔여석이 충분할 때만 차감
+    UPDATE bus_routes
+       SET available_seats = available_seats - p_seat_count,
+           updated_at = NOW()
+     WHERE route_id = p_route_id
+       AND is_open
+       AND available_seats >= p_seat_count
+    RETURNING * INTO v_route;
+
+    IF NOT FOUND THEN
+        SELECT * INTO v_route FROM bus_routes WHERE route_id = p_route_id;
+        IF NOT FOUND THEN
+            RETURN jsonb_build_object('status', 'not_found');
+        END IF;
+        IF NOT v_route.is_open THEN
+            RETURN jsonb_build_object('status', 'closed');
+        END IF;
+        RETURN jsonb_build_object('status', 'sold_out', 'available_seats', v_route.available_seats);
+    END IF;
+
+    -- 학생 정보가 있으면 이름/연락처 사용 (없으면 학번으로 예약)
+    SELECT * INTO v_user FROM users WHERE student_id = p_student_id;
+
+    INSERT INTO reservations (route_id, user_name, user_email, user_phone, seat_count, status)
+    VALUES (
+        v_route.id,
+        COALESCE(v_user.name, p_student_id),
+        v_user.email,
+        v_user.phone,
+        p_seat_count,
+        'confirmed'
+    )
+    RETURNING * INTO v_reservation;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'reservation', to_jsonb(v_reservation),
+        'available_seats', v_route.available_seats
+    );
+END;
+$$;
+
+-- 2. API(anon key)에서 호출할 수 있도록 권한 부여
+GRANT EXECUTE ON FUNCTION book_seats(TEXT, TEXT, INTEGER) TO anon, authenticated;
+
+-- =====================================================
+-- 완료 메시지
+-- =====================================================
+-- 이 마이그레이션을 실행하면:
+-- 1. book_seats(route_id, student_id, seat_count) 함수가 생성됩니다
+-- 2. POST /api/bookings 가 supabase.rpc("book_seats") 한 번으로 예매를 처리합니다
+-- 3. 잔여석 차감과 예약 생성이 원자적으로 처리되어 초과 예매가 발생하지 않습니다
@@ -0,0 +1,92 @@
+-- =====================================================
+-- 마이그레이션: 브로드캐스트 작업 테이블 추가
+-- =====================================================
+
+-- 1. broadcast_jobs 테이블 생성
+--    노선/예매 오픈 알림 작업을 DB에 저장하여 어느 서버 인스턴스에서든 실행·조회할 수 있게 함
+--    (서버리스에서 BackgroundTasks가 끝까지 실행되지 않아도 POST /push/jobs/run이 이어서 실행)
+CREATE TABLE IF NOT EXISTS broadcast_jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,                -- "route-open:<route_id>", "reservation-open"
+    spec JSONB NOT NULL,               -- 전송 내용 (kind, title, body, data, route_id, bus_type, topic, urgency)
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued INTEGER NOT NULL DEFAULT 0,
+    sent INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    expired INTEGER NOT NULL DEFAULT 0,
+    result JSONB,
+    error TEXT,
+    lease_until TIMESTAMP WITH TIME ZONE,  -- 실행 중인 인스턴스가 진행 상황을 기록할 때마다 연장
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 2. 실행할 작업 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_broadcast_jobs_due
+    ON broadcast_jobs(created_at) WHERE status IN ('pending', 'running');
+
+-- 3. 작업 선점 함수
+--    대기 중이거나 실행하던 인스턴스가 멈춰 임대(lease)가 만료된 작업 하나를 running으로 바꾸고 반환
+--    (p_job_id가 있으면 그 작업만, FOR UPDATE SKIP LOCKED로 여러 인스턴스가 같은 작업을 가져가지 않음)
+--    재시도 횟수를 넘긴 채 멈춘 작업은 failed로 정리
+CREATE OR REPLACE FUNCTION claim_broadcast_job(
+    p_job_id TEXT,
+    p_lease_seconds INTEGER,
+    p_max_attempts INTEGER
+)
+RETURNS SETOF broadcast_jobs
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE broadcast_jobs
+    SET status = 'failed',
+        error = '작업이 중단된 뒤 재시도 횟수를 초과했습니다',
+        finished_at = NOW()
+    WHERE status = 'running' AND lease_until < NOW() AND attempts >= p_max_attempts;
+
+    RETURN QUERY
+    UPDATE broadcast_jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        queued = 0,
+        sent = 0,
+        failed = 0,
+        expired = 0,
+        lease_until = NOW() + make_interval(secs => p_lease_seconds),
+        started_at = NOW()
+    WHERE id = (
+        SELECT id FROM broadcast_jobs
+        WHERE (p_job_id IS NULL OR id = p_job_id)
+          AND (status = 'pending' OR (status = 'running' AND lease_until < NOW()))
+        ORDER BY created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *;
+END;
+$$;
+
+-- 4. RLS 설정 (다른 테이블과 동일하게 anon key로 읽기/쓰기 허용)
+ALTER TABLE broadcast_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can read broadcast jobs" ON broadcast_jobs
+    FOR SELECT USING (true);
+
+CREATE POLICY "Anyone can insert broadcast jobs" ON broadcast_jobs
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Anyone can update broadcast jobs" ON broadcast_jobs
+    FOR UPDATE USING (true);
+
+-- 5. 오래된 작업 정리 (주기적으로 실행하거나 pg_cron에 등록)
+-- DELETE FROM broadcast_jobs WHERE status IN ('done', 'failed') AND finished_at < NOW() - INTERVAL '30 days';
+
+-- =====================================================
+-- 완료 메시지
+-- =====================================================
+-- 이 마이그레이션을 실행하면:
+-- 1. broadcast_jobs 테이블이 생성됩니다
+-- 2. claim_broadcast_job 함수로 인스턴스 하나만 작업을 실행합니다
+-- 3. 작업 진행 상황(GET /push/jobs/{job_id})을 어느 인스턴스에서든 조회할 수 있습니다
@@ -0,0 +1,88 @@
+-- =====================================================
+-- 마이그레이션: Idempotency-Key 응답 저장 테이블 추가
+-- =====================================================
+
+-- 1. idempotency_keys 테이블 생성
+--    POST /bookings 처리 전에 키를 선점(pending)하고, 처리 후 응답을 저장(complete)하여
+--    재시도에는 처음 응답을 그대로 돌려줌
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,              -- "bookings:<Idempotency-Key 헤더>"
+    request_hash TEXT NOT NULL,        -- 요청 본문 SHA-256 (같은 키로 다른 요청 방지)
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'complete')),
+    status_code INTEGER,               -- complete일 때만
+    response JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL  -- pending: 선점 만료 (IDEMPOTENCY_LEASE), complete: 보관 만료
+);
+
+-- 2. 만료된 키 정리용 인덱스
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+
+-- 3. 키 선점 함수
+--    키가 없거나 만료되었으면 pending 행을 만들고 {"claimed": true} 반환,
+--    이미 있으면 그 행을 반환 (INSERT ... ON CONFLICT 한 문장이라 여러 서버가 동시에 호출해도 한 곳만 선점)
+CREATE OR REPLACE FUNCTION claim_idempotency_key(
+    p_key TEXT,
+    p_request_hash TEXT,
+    p_lease_seconds INTEGER
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row idempotency_keys%ROWTYPE;
+BEGIN
+    INSERT INTO idempotency_keys (key, request_hash, status, expires_at)
+    VALUES (p_key, p_request_hash, 'pending', NOW() + make_interval(secs => p_lease_seconds))
+    ON CONFLICT (key) DO UPDATE
+        SET request_hash = EXCLUDED.request_hash,
+            status = 'pending',
+            status_code = NULL,
+            response = NULL,
+            created_at = NOW(),
+            expires_at = EXCLUDED.expires_at
+        WHERE idempotency_keys.expires_at <= NOW()
+    RETURNING * INTO v_row;
+
+    IF FOUND THEN
+        RETURN jsonb_build_object('claimed', true);
+    END IF;
+
+    SELECT * INTO v_row FROM idempotency_keys WHERE key = p_key;
+
+    RETURN jsonb_build_object(
+        'claimed', false,
+        'request_hash', v_row.request_hash,
+        'status', v_row.status,
+        'status_code', v_row.status_code,
+        'response', v_row.response,
+        'expires_at', v_row.expires_at
+    );
+END;
+$$;
+
+-- 4. RLS 설정 (다른 테이블과 동일하게 anon key로 읽기/쓰기 허용)
+ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can read idempotency keys" ON idempotency_keys
+    FOR SELECT USING (true);
+
+CREATE POLICY "Anyone can insert idempotency keys" ON idempotency_keys
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Anyone can update idempotency keys" ON idempotency_keys
+    FOR UPDATE USING (true);
+
+CREATE POLICY "Anyone can delete idempotency keys" ON idempotency_keys
+    FOR DELETE USING (true);
+
+-- 5. 만료된 키 정리 (주기적으로 실행하거나 pg_cron에 등록)
+-- DELETE FROM idempotency_keys WHERE expires_at < NOW();
+
+-- =====================================================
+-- 완료 메시지
+-- =====================================================
+-- 이 마이그레이션을 실행하면:
+-- 1. idempotency_keys 테이블이 생성됩니다
+-- 2. claim_idempotency_key 함수로 처리 전에 키를 선점합니다 (처리 중인 같은 키의 요청은 409)
+-- 3. Idempotency-Key 헤더가 있는 예매 요청의 응답이 IDEMPOTENCY_TTL 동안 보관됩니다
@@ -0,0 +1,90 @@
+-- =====================================================
+-- 마이그레이션: 노선/버스 종류별 푸시 알림 관심 등록 테이블 추가
+-- =====================================================
+
+-- 1. push_interests 테이블 생성
+--    한 행은 특정 노선(route_id) 또는 버스 종류(bus_type: 등교/하교) 중 하나만 가리킨다
+CREATE TABLE IF NOT EXISTS push_interests (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    student_id TEXT NOT NULL REFERENCES users(student_id) ON DELETE CASCADE,
+    route_id TEXT REFERENCES bus_routes(route_id) ON DELETE CASCADE,
+    bus_type TEXT CHECK (bus_type IN ('등교', '하교')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT push_interests_target_check CHECK ((route_id IS NULL) <> (bus_type IS NULL))
+);
+
+-- 2. 중복 등록 방지
+CREATE UNIQUE INDEX IF NOT EXISTS uq_push_interests_student_route
+    ON push_interests(student_id, route_id) WHERE route_id IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_push_interests_student_bus_type
+    ON push_interests(student_id, bus_type) WHERE bus_type IS NOT NULL;
+
+-- 3. 노선 오픈 시 대상자 조회용 인덱스 (student_id 순 keyset 페이지네이션)
+CREATE INDEX IF NOT EXISTS idx_push_interests_route_student
+    ON push_interests(route_id, student_id) WHERE route_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_push_interests_bus_type_student
+    ON push_interests(bus_type, student_id) WHERE bus_type IS NOT NULL;
+
+-- 4. RLS 설정 (다른 테이블과 동일하게 anon key로 읽기/쓰기 허용)
+ALTER TABLE push_interests ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can read push interests" ON push_interests
+    FOR SELECT USING (true);
+
+CREATE POLICY "Anyone can insert push interests" ON push_interests
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Anyone can delete push interests" ON push_interests
+    FOR DELETE USING (true);
+
+-- 5. 관심 등록 교체 함수 (PUT /push/interests)
+--    새 항목은 추가하고(이미 있으면 그대로) 목록에 없는 항목만 삭제 - 함수 하나가 한 트랜잭션이라
+--    중간 상태(관심 등록이 비어 있는 순간)가 보이지 않음. 같은 학생의 동시 변경은 advisory lock으로 직렬화
+CREATE OR REPLACE FUNCTION replace_push_interests(
+    p_student_id TEXT,
+    p_route_ids TEXT[],
+    p_bus_types TEXT[]
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('push_interests:' || p_student_id));
+
+    INSERT INTO push_interests (student_id, route_id)
+    SELECT p_student_id, r FROM unnest(p_route_ids) AS r
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO push_interests (student_id, bus_type)
+    SELECT p_student_id, t FROM unnest(p_bus_types) AS t
+    ON CONFLICT DO NOTHING;
+
+    DELETE FROM push_interests
+    WHERE student_id = p_student_id
+      AND NOT (
+          COALESCE(route_id = ANY(p_route_ids), false)
+          OR COALESCE(bus_type = ANY(p_bus_types), false)
+      );
+END;
+$$;
+
+-- 6. 기존 구독자는 등교/하교 전체를 관심 등록 (한 번만 실행 - 기존처럼 모든 노선 오픈 알림 수신)
+--    이미 관심 등록이 있는 학생은 건드리지 않음. 이후 새로 구독하는 학생은 기본 관심 등록 없음
+--    (앱에서 알림 받을 노선/버스 종류를 직접 선택, 예매 오픈 알림은 관심 등록과 관계없이 구독자 전체에게 전송)
+INSERT INTO push_interests (student_id, bus_type)
+SELECT u.student_id, t.bus_type
+FROM users u
+CROSS JOIN (VALUES ('등교'), ('하교')) AS t(bus_type)
+WHERE u.notification_enabled = true
+  AND u.push_subscription IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM push_interests p WHERE p.student_id = u.student_id)
+ON CONFLICT DO NOTHING;
+
+-- =====================================================
+-- 완료 메시지
+-- =====================================================
+-- 이 마이그레이션을 실행하면:
+-- 1. push_interests 테이블이 생성됩니다
+-- 2. 노선/버스 종류별 대상자 조회 인덱스가 생성됩니다
+-- 3. replace_push_interests 함수로 관심 등록을 한 번에 교체합니다
+-- 4. 이미 구독 중인 사용자는 등교/하교 전체 노선에 관심 등록됩니다 (새 구독자는 직접 선택)
@@ -0,0 +1,107 @@
+-- =====================================================
+-- 마이그레이션: reservations에 user_id 추가 (이름/이메일/전화번호 매칭 대체)
+-- =====================================================
+
+-- 1. reservations 테이블에 user_id 컬럼 추가
+ALTER TABLE reservations
+ADD COLUMN IF NOT EXISTS user_id UUID REFERENCES users(id) ON DELETE SET NULL;
+
+-- 2. 사용자별 예약 조회 인덱스 (최신순)
+CREATE INDEX IF NOT EXISTS idx_reservations_user_id_created_at
+    ON reservations(user_id, created_at DESC);
+
+-- 3. 기존 예약 백필
+--    이메일 → 전화번호 → 이름 순으로, 정확히 한 명의 사용자와 일치하는 경우에만 연결한다
+--    (동명이인 등 애매한 예약은 user_id가 비어 있는 채로 남음)
+UPDATE reservations r
+   SET user_id = u.id
+  FROM users u
+ WHERE r.user_id IS NULL
+   AND r.user_email IS NOT NULL
+   AND u.email = r.user_email
+   AND (SELECT COUNT(*) FROM users u2 WHERE u2.email = r.user_email) = 1;
+
+UPDATE reservations r
+   SET user_id = u.id
+  FROM users u
+ WHERE r.user_id IS NULL
+   AND r.user_phone IS NOT NULL
+   AND u.phone = r.user_phone
+   AND (SELECT COUNT(*) FROM users u2 WHERE u2.phone = r.user_phone) = 1;
+
+UPDATE reservations r
+   SET user_id = u.id
+  FROM users u
+ WHERE r.user_id IS NULL
+   AND u.name = r.user_name
+   AND (SELECT COUNT(*) FROM users u2 WHERE u2.name = r.user_name) = 1;
+
+-- 4. book_seats 함수가 예약에 user_id를 기록하도록 갱신
+CREATE OR REPLACE FUNCTION book_seats(
+    p_route_id TEXT,
+    p_student_id TEXT,
+    p_seat_count INTEGER DEFAULT 1
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_route bus_routes%ROWTYPE;
+    v_user users%ROWTYPE;
+    v_reservation reservations%ROWTYPE;
+BEGIN
+    IF p_seat_count IS NULL OR p_seat_count < 1 THEN
+        RETURN jsonb_build_object('status', 'invalid_seat_count');
+    END IF;
+
+    -- 열려 있고 잔여석이 충분할 때만 차감
+    UPDATE bus_routes
+       SET available_seats = available_seats - p_seat_count,
+           updated_at = NOW()
+     WHERE route_id = p_route_id
+       AND is_open
+       AND available_seats >= p_seat_count
+    RETURNING * INTO v_route;
+
+    IF NOT FOUND THEN
+        SELECT * INTO v_route FROM bus_routes WHERE route_id = p_route_id;
+        IF NOT FOUND THEN
+            RETURN jsonb_build_object('status', 'not_found');
+        END IF;
+        IF NOT v_route.is_open THEN
+            RETURN jsonb_build_object('status', 'closed');
+        END IF;
+        RETURN jsonb_build_object('status', 'sold_out', 'available_seats', v_route.available_seats);
+    END IF;
+
+    -- 학생 정보가 있으면 이름/연락처 사용 (없으면 학번으로 예약)
+    SELECT * INTO v_user FROM users WHERE student_id = p_student_id;
+
+    INSERT INTO reservations (route_id, user_id, user_name, user_email, user_phone, seat_count, status)
+    VALUES (
+        v_route.id,
+        v_user.id,
+        COALESCE(v_user.name, p_student_id),
+        v_user.email,
+        v_user.phone,
+        p_seat_count,
+        'confirmed'
+    )
+    RETURNING * INTO v_reservation;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'reservation', to_jsonb(v_reservation),
+        'available_seats', v_route.available_seats
+    );
+END;
+$$;
+
+-- =====================================================
+-- 완료 메시지
+-- =====================================================
+-- 이 마이그레이션을 실행하면:
+-- 1. reservations 테이블에 user_id 컬럼과 (user_id, created_at) 인덱스가 추가됩니다
+-- 2. 기존 예약 중 한 명의 사용자와만 일치하는 예약에 user_id가 채워집니다
+-- 3. 새 예약은 book_seats에서 user_id가 함께 기록됩니다
+-- 4. GET /api/bookings/user/{student_id} 는 user_id 인덱스로 조회합니다
@@ -7,13 +7,11 @@ from datetime import datetime
 from typing import Optional, Callable, Dict, Any
 import logging
 
-# 🔥 Supabase 클라이언트 import
+# 🔥 데이터 접근 계층 import (DATA_BACKEND=sqlite면 Supabase 없이 실행)
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.supabase_client import get_supabase_client
-
-supabase = get_supabase_client()  
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.repositories import bus_route_repository, reservation_status_repository
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,7 +44,7 @@ class BusReservationPoller:
         
     async def check_reservation_status(self) -> Dict[str, Any]:
         """
-        예매 오픈 상태를 체크하는 메서드 (Supabase에서 조회)
+        예매 오픈 상태를 체크하는 메서드 (데이터 저장소에서 조회)
         
         Returns:
             예매 상태 정보 딕셔너리
@@ -54,17 +52,17 @@ class BusReservationPoller:
         self.check_count += 1
         
         try:
-            # 🔥 Supabase에서 예매 상태 조회
-            response = supabase.table("reservation_status").select("*").limit(1).execute()
+            # 🔥 예매 상태 조회
+            reservation_status = await reservation_status_repository.get()
             
-            if response.data and len(response.data) > 0:
-                is_open = response.data[0]["is_open"]
+            if reservation_status is not None:
+                is_open = reservation_status["is_open"]
             else:
                 is_open = False
                 logger.warning("예매 상태 레코드가 없습니다. 기본값(False) 사용")
             
             # 오픈된 노선 정보 조회 (선택사항)
-            routes_response = supabase.table("bus_routes").select("*").eq("is_open", True).execute()
+            open_routes = await bus_route_repository.list_open()
             
             route_info = {
                 "route_id": "ROUTE_001",
@@ -74,8 +72,8 @@ class BusReservationPoller:
             }
             
             # 실제 오픈된 노선이 있으면 첫 번째 노선 정보 사용
-            if routes_response.data and len(routes_response.data) > 0:
-                first_route = routes_response.data[0]
+            if open_routes:
+                first_route = open_routes[0]
                 route_info = {
                     "route_id": first_route["route_id"],
                     "route_name": first_route["route_name"],
@@ -95,7 +93,7 @@ class BusReservationPoller:
             return status
             
         except Exception as e:
-            logger.error(f"Supabase 조회 중 오류: {e}")
+            logger.error(f"예매 상태 조회 중 오류: {e}")
             # 오류 발생 시 기본값 반환
             return {
                 "timestamp": datetime.now().isoformat(),
@@ -0,0 +1,71 @@
+"""
+데이터 접근 계층
+DATA_BACKEND 환경 변수로 구현체 선택:
+    supabase (기본) - Supabase(PostgREST)
+    sqlite          - 로컬 SQLite 파일 (SQLITE_DB_PATH), Supabase 없이 API/폴러/벤치마크 실행
+
+사용 예:
+    from backend.repositories import bus_route_repository
+    route = await bus_route_repository.get(route_id)
+"""
+import os
+import tempfile
+
+from .base import (
+    UserRepository,
+    BusRouteRepository,
+    ReservationRepository,
+    ReservationStatusRepository,
+    PushInterestRepository,
+    IdempotencyRepository,
+    BroadcastJobRepository,
+)
+
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase").lower()
+SQLITE_DB_PATH = os.getenv(
+    "SQLITE_DB_PATH",
+    os.path.join(tempfile.gettempdir(), "schoolbus.db")
+)
+
+if DATA_BACKEND == "sqlite":
+    from .sqlite_repository import (
+        SQLiteDatabase,
+        SQLiteUserRepository,
+        SQLiteBusRouteRepository,
+        SQLiteReservationRepository,
+        SQLiteReservationStatusRepository,
+        SQLitePushInterestRepository,
+        SQLiteIdempotencyRepository,
+        SQLiteBroadcastJobRepository,
+    )
+
+    sqlite_database = SQLiteDatabase(SQLITE_DB_PATH)
+    user_repository: UserRepository = SQLiteUserRepository(sqlite_database)
+    bus_route_repository: BusRouteRepository = SQLiteBusRouteRepository(sqlite_database)
+    reservation_repository: ReservationRepository = SQLiteReservationRepository(sqlite_database)
+    reservation_status_repository: ReservationStatusRepository = SQLiteReservationStatusRepository(sqlite_database)
+    push_interest_repository: PushInterestRepository = SQLitePushInterestRepository(sqlite_database)
+    idempotency_repository: IdempotencyRepository = SQLiteIdempotencyRepository(sqlite_database)
+    broadcast_job_repository: BroadcastJobRepository = SQLiteBroadcastJobRepository(sqlite_database)
+elif DATA_BACKEND == "supabase":
+    from backend.config.supabase_client import supabase
+    from .supabase_repository import (
+        SupabaseUserRepository,
+        SupabaseBusRouteRepository,
+        SupabaseReservationRepository,
+        SupabaseReservationStatusRepository,
+        SupabasePushInterestRepository,
+        SupabaseIdempotencyRepository,
+        SupabaseBroadcastJobRepository,
+    )
+
+    # supabase는 첫 사용 시 연결되는 지연 프록시
+    user_repository = SupabaseUserRepository(supabase)
+    bus_route_repository = SupabaseBusRouteRepository(supabase)
+    reservation_repository = SupabaseReservationRepository(supabase)
+    reservation_status_repository = SupabaseReservationStatusRepository(supabase)
+    push_interest_repository = SupabasePushInterestRepository(supabase)
+    idempotency_repository = SupabaseIdempotencyRepository(supabase)
+    broadcast_job_repository = SupabaseBroadcastJobRepository(supabase)
+else:
+    raise ValueError(f"지원하지 않는 DATA_BACKEND: {DATA_BACKEND} (supabase 또는 sqlite)")
@@ -0,0 +1,201 @@
+"""
+데이터 접근 인터페이스
+라우트/폴러/서비스는 테이블을 직접 조회하지 않고 이 인터페이스로만 접근한다.
+구현체: supabase_repository (기본), sqlite_repository (오프라인 실행/부하 테스트용)
+
+모든 행은 Supabase(PostgREST) 응답과 같은 모양의 dict로 반환한다.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class UserRepository(ABC):
+    """users 테이블"""
+
+    @abstractmethod
+    async def get_by_student_id(self, student_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+        """학번으로 회원 조회 (columns: "*" 또는 쉼표로 구분한 컬럼 목록)"""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """회원 생성 후 생성된 행 반환"""
+
+    @abstractmethod
+    async def update(self, student_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """회원 정보 변경 후 변경된 행 반환 (회원이 없으면 None)"""
+
+    @abstractmethod
+    async def list_all(self, columns: str = "*") -> List[Dict[str, Any]]:
+        """전체 회원 (가입 최신순)"""
+
+    @abstractmethod
+    async def list_notification_enabled(self) -> List[Dict[str, Any]]:
+        """알림을 켠 회원"""
+
+    @abstractmethod
+    async def list_push_subscribers(self, limit: int, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        알림을 켜고 구독 정보가 있는 회원의 id, student_id, push_subscription (id 순)
+
+        Args:
+            after_id: keyset 커서 - 이 id 다음부터
+        """
+
+    @abstractmethod
+    async def clear_push_subscriptions(self, student_ids: List[str]) -> None:
+        """회원들의 구독 정보 삭제 (만료된 구독 정리)"""
+
+
+class BusRouteRepository(ABC):
+    """bus_routes 테이블"""
+
+    @abstractmethod
+    async def list_all(self) -> List[Dict[str, Any]]:
+        """전체 노선 (id 순)"""
+
+    @abstractmethod
+    async def list_open(self) -> List[Dict[str, Any]]:
+        """예매가 열린 노선"""
+
+    @abstractmethod
+    async def get(self, route_id: str) -> Optional[Dict[str, Any]]:
+        """route_id로 노선 조회"""
+
+    @abstractmethod
+    async def list_by_route_ids(self, route_ids: List[str]) -> List[Dict[str, Any]]:
+        """route_id 목록 중 존재하는 노선"""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """노선 생성 후 생성된 행 반환"""
+
+    @abstractmethod
+    async def update(self, route_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """노선 변경 후 변경된 행 반환 (노선이 없으면 None)"""
+
+    @abstractmethod
+    async def delete(self, route_id: str) -> Optional[Dict[str, Any]]:
+        """노선 삭제 후 삭제된 행 반환 (노선이 없으면 None)"""
+
+
+class ReservationRepository(ABC):
+    """reservations 테이블"""
+
+    @abstractmethod
+    async def book(self, route_id: str, student_id: str, seat_count: int) -> Dict[str, Any]:
+        """
+        좌석 예매 (book_seats RPC와 같은 규칙을 원자적으로 수행)
+
+        Returns:
+            {"status": "ok" | "not_found" | "closed" | "sold_out" | "invalid_seat_count",
+             "reservation": {...}, "available_seats": int}
+        """
+
+    @abstractmethod
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        departing_from: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        사용자의 예약 (created_at, id 내림차순), 각 행의 "bus_routes"에 노선 정보 포함
+
+        Args:
+            limit: 최대 행 수 (None이면 전체)
+            after: (created_at, id) 커서 - 이 예약보다 오래된 것만
+            departing_from: "YYYY-MM-DD" - 출발일이 이 날짜 이후인 노선의 예약만
+        """
+
+
+class PushInterestRepository(ABC):
+    """push_interests 테이블 (노선/버스 종류별 오픈 알림 관심 등록)"""
+
+    @abstractmethod
+    async def list_for_student(self, student_id: str) -> List[Dict[str, Any]]:
+        """학생의 관심 등록 (route_id 또는 bus_type 중 하나가 있는 행)"""
+
+    @abstractmethod
+    async def replace(self, student_id: str, route_ids: List[str], bus_types: List[str]) -> None:
+        """학생의 관심 등록을 전달한 노선/버스 종류로 교체 (한 트랜잭션 - 중간 상태가 보이지 않음)"""
+
+    @abstractmethod
+    async def list_subscribers(
+        self,
+        route_id: Optional[str],
+        bus_type: Optional[str],
+        limit: int,
+        after_student_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        해당 노선 또는 버스 종류에 관심 등록한, 알림을 켜고 구독 정보가 있는 회원의
+        student_id, push_subscription (student_id 순, 노선과 종류를 모두 등록한 학생은 중복될 수 있음)
+        """
+
+
+class IdempotencyRepository(ABC):
+    """idempotency_keys 테이블 (Idempotency-Key 선점 및 응답 저장)"""
+
+    @abstractmethod
+    async def claim(self, key: str, request_hash: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        키 선점 - 키가 없거나 만료되었으면 처리 중(pending) 행을 만들고 None 반환,
+        이미 있으면 그 행 (request_hash, status, status_code, response, expires_at) 반환
+        (여러 인스턴스가 동시에 호출해도 한 곳만 선점하도록 원자적으로 수행)
+        """
+
+    @abstractmethod
+    async def complete(self, key: str, status_code: int, response: Any, expires_at: datetime) -> None:
+        """선점한 키에 처리 결과 저장 (status=complete)"""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """처리 중인 선점 삭제 (완료된 응답은 그대로 둠)"""
+
+
+class BroadcastJobRepository(ABC):
+    """broadcast_jobs 테이블 (노선/예매 오픈 알림 작업과 진행 상황)"""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """작업 생성 (status=pending) 후 생성된 행 반환"""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 행 (없으면 None)"""
+
+    @abstractmethod
+    async def claim(
+        self,
+        job_id: Optional[str],
+        lease_seconds: int,
+        max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        실행할 작업 하나 선점 - pending이거나 running인데 임대(lease_until)가 만료된 작업을
+        running으로 바꾸고(attempts+1, 진행 수 초기화) 반환, 없으면 None
+        (job_id가 있으면 그 작업만, 여러 인스턴스가 동시에 호출해도 한 곳만 선점하도록 원자적으로 수행)
+        재시도 횟수(max_attempts)를 넘긴 채 임대가 만료된 작업은 failed로 정리
+        """
+
+    @abstractmethod
+    async def update(self, job_id: str, data: Dict[str, Any]) -> None:
+        """진행 상황/결과 기록"""
+
+
+class ReservationStatusRepository(ABC):
+    """reservation_status 테이블 (싱글톤 레코드)"""
+
+    @abstractmethod
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """예매 상태 레코드 (없으면 None)"""
+
+    @abstractmethod
+    async def create(self, is_open: bool) -> Dict[str, Any]:
+        """예매 상태 레코드 생성"""
+
+    @abstractmethod
+    async def update(self, status_id: str, is_open: bool) -> Dict[str, Any]:
+        """예매 상태 변경 후 변경된 행 반환"""
@@ -0,0 +1,649 @@
+"""
+SQLite 데이터 접근 구현 (DATA_BACKEND=sqlite)
+Supabase 프로젝트 없이 API/폴러/벤치마크를 실행하거나 대량 데이터로 부하 테스트할 때 사용.
+스키마는 supabase_schema.sql + 마이그레이션의 users/bus_routes/reservations/reservation_status/push_interests/idempotency_keys/broadcast_jobs와 같은 컬럼을 가진다.
+
+쿼리는 backend.config.database의 스레드 풀에서 실행되며, 스레드마다 커넥션을 하나씩 재사용한다.
+"""
+import re
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+from backend.config.database import run_sync
+from backend.config.db_metrics import current_db_stats
+from .base import (
+    UserRepository,
+    BusRouteRepository,
+    ReservationRepository,
+    ReservationStatusRepository,
+    PushInterestRepository,
+    IdempotencyRepository,
+    BroadcastJobRepository,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    student_id TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    password TEXT,
+    email TEXT,
+    phone TEXT,
+    fcm_token TEXT,
+    apn_token TEXT,
+    push_subscription TEXT,  -- JSON 문자열 (dict로 저장하면 직렬화)
+    notification_enabled INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bus_routes (
+    id TEXT PRIMARY KEY,
+    route_name TEXT NOT NULL,
+    route_id TEXT UNIQUE NOT NULL,
+    bus_type TEXT NOT NULL DEFAULT '등교',
+    departure_date TEXT NOT NULL,
+    departure_time TEXT NOT NULL,
+    total_seats INTEGER NOT NULL DEFAULT 30,
+    available_seats INTEGER NOT NULL DEFAULT 30,
+    is_open INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reservation_status (
+    id TEXT PRIMARY KEY,
+    is_open INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    id TEXT PRIMARY KEY,
+    route_id TEXT REFERENCES bus_routes(id) ON DELETE CASCADE,
+    user_id TEXT REFERENCES users(id) ON DELETE SET NULL,
+    user_name TEXT NOT NULL,
+    user_email TEXT,
+    user_phone TEXT,
+    seat_count INTEGER NOT NULL DEFAULT 1,
+    status TEXT DEFAULT 'confirmed',
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS push_interests (
+    id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL REFERENCES users(student_id) ON DELETE CASCADE,
+    route_id TEXT REFERENCES bus_routes(route_id) ON DELETE CASCADE,
+    bus_type TEXT CHECK (bus_type IN ('등교', '하교')),
+    created_at TEXT NOT NULL,
+    CHECK ((route_id IS NULL) <> (bus_type IS NULL))
+);
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    request_hash TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, complete
+    status_code INTEGER,
+    response TEXT,  -- JSON 문자열
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS broadcast_jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    spec TEXT NOT NULL,  -- JSON 문자열
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, running, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued INTEGER NOT NULL DEFAULT 0,
+    sent INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    expired INTEGER NOT NULL DEFAULT 0,
+    result TEXT,  -- JSON 문자열
+    error TEXT,
+    lease_until TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_notification_enabled ON users(notification_enabled);
+CREATE INDEX IF NOT EXISTS idx_bus_routes_is_open ON bus_routes(is_open);
+CREATE INDEX IF NOT EXISTS idx_reservations_user_id_created_at ON reservations(user_id, created_at DESC, id DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_push_interests_student_route
+    ON push_interests(student_id, route_id) WHERE route_id IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_push_interests_student_bus_type
+    ON push_interests(student_id, bus_type) WHERE bus_type IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_push_interests_route_student
+    ON push_interests(route_id, student_id) WHERE route_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_push_interests_bus_type_student
+    ON push_interests(bus_type, student_id) WHERE bus_type IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_broadcast_jobs_due
+    ON broadcast_jobs(created_at) WHERE status IN ('pending', 'running');
+"""
+
+# 테이블별 컬럼 (외부에서 받은 컬럼 이름 검증용), bool로 돌려줄 컬럼, JSON으로 저장할 컬럼
+_COLUMNS = {
+    "users": {
+        "id", "student_id", "name", "password", "email", "phone", "fcm_token", "apn_token",
+        "push_subscription", "notification_enabled", "created_at", "updated_at"
+    },
+    "bus_routes": {
+        "id", "route_name", "route_id", "bus_type", "departure_date", "departure_time",
+        "total_seats", "available_seats", "is_open", "created_at", "updated_at"
+    },
+    "broadcast_jobs": {
+        "id", "name", "spec", "status", "attempts", "queued", "sent", "failed", "expired",
+        "result", "error", "lease_until", "created_at", "started_at", "finished_at"
+    },
+}
+_BOOL_COLUMNS = {"notification_enabled", "is_open"}
+_JSON_COLUMNS = {"push_subscription", "spec", "result"}
+_ROUTE_SUMMARY_COLUMNS = ("id", "route_id", "route_name", "departure_date", "departure_time")
+
+
+def _now() -> str:
+    """created_at/updated_at - 문자열 정렬이 시간 순서와 같도록 항상 마이크로초까지 기록"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _timestamp(value: datetime) -> str:
+    """외부에서 받은 시각을 _now()와 같은 형식(UTC)으로 - 문자열 비교로 만료 판단"""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _to_row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    result = dict(row)
+    for key in _BOOL_COLUMNS & result.keys():
+        if result[key] is not None:
+            result[key] = bool(result[key])
+    return result
+
+
+def _to_params(data: Dict[str, Any]) -> Dict[str, Any]:
+    params = {}
+    for key, value in data.items():
+        if key in _JSON_COLUMNS and value is not None and not isinstance(value, str):
+            value = json.dumps(value)
+        elif isinstance(value, bool):
+            value = int(value)
+        params[key] = value
+    return params
+
+
+def _columns(table: str, names: Iterable[str]) -> List[str]:
+    columns = [name.strip() for name in names]
+    unknown = [name for name in columns if name not in _COLUMNS[table]]
+    if unknown:
+        raise ValueError(f"{table}에 없는 컬럼: {', '.join(unknown)}")
+    return columns
+
+
+def _select_list(table: str, columns: str) -> str:
+    if columns.strip() == "*":
+        return "*"
+    return ", ".join(_columns(table, columns.split(",")))
+
+
+_TABLE_OF_SQL = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", re.IGNORECASE)
+
+
+class _InstrumentedConnection(sqlite3.Connection):
+    """
+    요청별 DB 계측 (Supabase의 http_pool.PooledTransport와 같은 역할)
+    테이블을 다루는 문장마다 current_db_stats()에 기록 - PRAGMA/BEGIN/COMMIT은 제외, 시간은 결과 읽기 전까지
+    """
+
+    def _timed(self, method, sql: str, params: Any):
+        db_stats = current_db_stats()
+        match = _TABLE_OF_SQL.search(sql) if db_stats is not None else None
+        if match is None:
+            return method(self, sql, params)
+        started = time.perf_counter()
+        try:
+            return method(self, sql, params)
+        finally:
+            db_stats.record(match.group(1), time.perf_counter() - started)
+
+    def execute(self, sql: str, params: Any = ()) -> sqlite3.Cursor:
+        return self._timed(sqlite3.Connection.execute, sql, params)
+
+    def executemany(self, sql: str, params: Any) -> sqlite3.Cursor:
+        return self._timed(sqlite3.Connection.executemany, sql, params)
+
+
+class SQLiteDatabase:
+    """SQLite 파일 하나 - 스레드별 커넥션 관리와 스키마 생성"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+                factory=_InstrumentedConnection
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def fetch_one(self, sql: str, params: Any = ()) -> Optional[Dict[str, Any]]:
+        return _to_row(self.connect().execute(sql, params).fetchone())
+
+    def fetch_all(self, sql: str, params: Any = ()) -> List[Dict[str, Any]]:
+        return [_to_row(row) for row in self.connect().execute(sql, params).fetchall()]
+
+    def execute(self, sql: str, params: Any = ()) -> int:
+        """변경 쿼리 실행 후 변경된 행 수 반환"""
+        return self.connect().execute(sql, params).rowcount
+
+    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        params = _to_params(data)
+        columns = _columns(table, params.keys()) if table in _COLUMNS else list(params)
+        self.connect().execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [params[column] for column in columns]
+        )
+        return self.fetch_one(f"SELECT * FROM {table} WHERE id = ?", (data["id"],))
+
+    def update(self, table: str, key: str, value: Any, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        params = _to_params(data)
+        columns = _columns(table, params.keys()) if table in _COLUMNS else list(params)
+        cursor = self.connect().execute(
+            f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE {key} = ?",
+            [params[column] for column in columns] + [value]
+        )
+        if cursor.rowcount == 0:
+            return None
+        return self.fetch_one(f"SELECT * FROM {table} WHERE {key} = ?", (value,))
+
+
+class SQLiteUserRepository(UserRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def get_by_student_id(self, student_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+        sql = f"SELECT {_select_list('users', columns)} FROM users WHERE student_id = ? LIMIT 1"
+        return await run_sync(self.db.fetch_one, sql, (student_id,))
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        row = {"id": str(uuid.uuid4()), "notification_enabled": True, "created_at": now, "updated_at": now, **data}
+        return await run_sync(self.db.insert, "users", row)
+
+    async def update(self, student_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await run_sync(self.db.update, "users", "student_id", student_id, {**data, "updated_at": _now()})
+
+    async def list_all(self, columns: str = "*") -> List[Dict[str, Any]]:
+        sql = f"SELECT {_select_list('users', columns)} FROM users ORDER BY created_at DESC"
+        return await run_sync(self.db.fetch_all, sql)
+
+    async def list_notification_enabled(self) -> List[Dict[str, Any]]:
+        return await run_sync(self.db.fetch_all, "SELECT * FROM users WHERE notification_enabled = 1")
+
+    async def list_push_subscribers(self, limit: int, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = (
+            "SELECT id, student_id, push_subscription FROM users "
+            "WHERE notification_enabled = 1 AND push_subscription IS NOT NULL AND id > ? "
+            "ORDER BY id LIMIT ?"
+        )
+        return await run_sync(self.db.fetch_all, sql, (after_id or "", limit))
+
+    async def clear_push_subscriptions(self, student_ids: List[str]) -> None:
+        sql = (
+            f"UPDATE users SET push_subscription = NULL, updated_at = ? "
+            f"WHERE student_id IN ({', '.join('?' for _ in student_ids)})"
+        )
+        await run_sync(self.db.execute, sql, [_now(), *student_ids])
+
+
+class SQLiteBusRouteRepository(BusRouteRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def list_all(self) -> List[Dict[str, Any]]:
+        return await run_sync(self.db.fetch_all, "SELECT * FROM bus_routes ORDER BY id")
+
+    async def list_open(self) -> List[Dict[str, Any]]:
+        return await run_sync(self.db.fetch_all, "SELECT * FROM bus_routes WHERE is_open = 1")
+
+    async def get(self, route_id: str) -> Optional[Dict[str, Any]]:
+        return await run_sync(self.db.fetch_one, "SELECT * FROM bus_routes WHERE route_id = ?", (route_id,))
+
+    async def list_by_route_ids(self, route_ids: List[str]) -> List[Dict[str, Any]]:
+        if not route_ids:
+            return []
+        sql = f"SELECT * FROM bus_routes WHERE route_id IN ({', '.join('?' for _ in route_ids)})"
+        return await run_sync(self.db.fetch_all, sql, list(route_ids))
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        row = {
+            "id": str(uuid.uuid4()),
+            "departure_date": now[:10],
+            "is_open": False,
+            "created_at": now,
+            "updated_at": now,
+            **data
+        }
+        row.setdefault("available_seats", row.get("total_seats", 30))
+        return await run_sync(self.db.insert, "bus_routes", row)
+
+    async def update(self, route_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await run_sync(self.db.update, "bus_routes", "route_id", route_id, {**data, "updated_at": _now()})
+
+    def _delete(self, route_id: str) -> Optional[Dict[str, Any]]:
+        conn = self.db.connect()
+        row = self.db.fetch_one("SELECT * FROM bus_routes WHERE route_id = ?", (route_id,))
+        if row is not None:
+            conn.execute("DELETE FROM bus_routes WHERE route_id = ?", (route_id,))
+        return row
+
+    async def delete(self, route_id: str) -> Optional[Dict[str, Any]]:
+        return await run_sync(self._delete, route_id)
+
+
+class SQLiteReservationRepository(ReservationRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def _book(self, route_id: str, student_id: str, seat_count: int) -> Dict[str, Any]:
+        """book_seats RPC와 같은 순서: 조건부 잔여석 차감 → 거절 사유 판별 → 예약 생성"""
+        if seat_count is None or seat_count < 1:
+            return {"status": "invalid_seat_count"}
+
+        conn = self.db.connect()
+        now = _now()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "UPDATE bus_routes SET available_seats = available_seats - ?, updated_at = ? "
+                "WHERE route_id = ? AND is_open = 1 AND available_seats >= ?",
+                (seat_count, now, route_id, seat_count)
+            )
+            route = self.db.fetch_one("SELECT * FROM bus_routes WHERE route_id = ?", (route_id,))
+            if cursor.rowcount == 0:
+                conn.execute("ROLLBACK")
+                if route is None:
+                    return {"status": "not_found"}
+                if not route["is_open"]:
+                    return {"status": "closed"}
+                return {"status": "sold_out", "available_seats": route["available_seats"]}
+
+            # 학생 정보가 있으면 이름/연락처 사용 (없으면 학번으로 예약)
+            user = self.db.fetch_one(
+                "SELECT id, name, email, phone FROM users WHERE student_id = ?", (student_id,)
+            ) or {}
+            reservation = {
+                "id": str(uuid.uuid4()),
+                "route_id": route["id"],
+                "user_id": user.get("id"),
+                "user_name": user.get("name") or student_id,
+                "user_email": user.get("email"),
+                "user_phone": user.get("phone"),
+                "seat_count": seat_count,
+                "status": "confirmed",
+                "created_at": now
+            }
+            reservation = self.db.insert("reservations", reservation)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return {"status": "ok", "reservation": reservation, "available_seats": route["available_seats"]}
+
+    async def book(self, route_id: str, student_id: str, seat_count: int) -> Dict[str, Any]:
+        return await run_sync(self._book, route_id, student_id, seat_count)
+
+    def _list_for_user(
+        self,
+        user_id: str,
+        limit: Optional[int],
+        after: Optional[Tuple[str, str]],
+        departing_from: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        route_select = ", ".join(f"b.{column} AS _route_{column}" for column in _ROUTE_SUMMARY_COLUMNS)
+        sql = [
+            f"SELECT r.*, {route_select} FROM reservations r",
+            "JOIN bus_routes b ON b.id = r.route_id" if departing_from else "LEFT JOIN bus_routes b ON b.id = r.route_id",
+            "WHERE r.user_id = ?"
+        ]
+        params: List[Any] = [user_id]
+        if departing_from:
+            sql.append("AND b.departure_date >= ?")
+            params.append(departing_from)
+        if after:
+            created_at, reservation_id = after
+            sql.append("AND (r.created_at < ? OR (r.created_at = ? AND r.id < ?))")
+            params += [created_at, created_at, reservation_id]
+        sql.append("ORDER BY r.created_at DESC, r.id DESC")
+        if limit is not None:
+            sql.append("LIMIT ?")
+            params.append(limit)
+
+        rows = []
+        for row in self.db.fetch_all(" ".join(sql), params):
+            route = {column: row.pop(f"_route_{column}") for column in _ROUTE_SUMMARY_COLUMNS}
+            row["bus_routes"] = route if route["id"] is not None else None
+            rows.append(row)
+        return rows
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        departing_from: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await run_sync(self._list_for_user, user_id, limit, after, departing_from)
+
+
+class SQLitePushInterestRepository(PushInterestRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def list_for_student(self, student_id: str) -> List[Dict[str, Any]]:
+        return await run_sync(
+            self.db.fetch_all, "SELECT route_id, bus_type FROM push_interests WHERE student_id = ?", (student_id,)
+        )
+
+    def _replace(self, student_id: str, route_ids: List[str], bus_types: List[str]):
+        conn = self.db.connect()
+        now = _now()
+        rows = [(route_id, None) for route_id in route_ids] + [(None, bus_type) for bus_type in bus_types]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM push_interests WHERE student_id = ?", (student_id,))
+            conn.executemany(
+                "INSERT INTO push_interests (id, student_id, route_id, bus_type, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(str(uuid.uuid4()), student_id, route_id, bus_type, now) for route_id, bus_type in rows]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def replace(self, student_id: str, route_ids: List[str], bus_types: List[str]) -> None:
+        await run_sync(self._replace, student_id, route_ids, bus_types)
+
+    async def list_subscribers(
+        self,
+        route_id: Optional[str],
+        bus_type: Optional[str],
+        limit: int,
+        after_student_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if route_id:
+            conditions.append("i.route_id = ?")
+            params.append(route_id)
+        if bus_type:
+            conditions.append("i.bus_type = ?")
+            params.append(bus_type)
+        if not conditions:
+            return []
+
+        sql = (
+            "SELECT i.student_id, u.push_subscription FROM push_interests i "
+            "JOIN users u ON u.student_id = i.student_id "
+            f"WHERE ({' OR '.join(conditions)}) AND u.notification_enabled = 1 "
+            "AND u.push_subscription IS NOT NULL AND i.student_id > ? "
+            "ORDER BY i.student_id LIMIT ?"
+        )
+        return await run_sync(self.db.fetch_all, sql, [*params, after_student_id or "", limit])
+
+
+class SQLiteIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def _claim(self, key: str, request_hash: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        conn = self.db.connect()
+        now = datetime.now(timezone.utc)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.fetch_one(
+                "SELECT request_hash, status, status_code, response, expires_at FROM idempotency_keys "
+                "WHERE key = ? AND expires_at > ?",
+                (key, _timestamp(now))
+            )
+            if row is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (key, request_hash, status, created_at, expires_at) "
+                    "VALUES (?, ?, 'pending', ?, ?)",
+                    (key, request_hash, _timestamp(now), _timestamp(now + timedelta(seconds=lease_seconds)))
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if row is not None and row["response"] is not None:
+            row["response"] = json.loads(row["response"])
+        return row
+
+    async def claim(self, key: str, request_hash: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        return await run_sync(self._claim, key, request_hash, lease_seconds)
+
+    async def complete(self, key: str, status_code: int, response: Any, expires_at: datetime) -> None:
+        await run_sync(
+            self.db.execute,
+            "UPDATE idempotency_keys SET status = 'complete', status_code = ?, response = ?, expires_at = ? "
+            "WHERE key = ?",
+            (status_code, json.dumps(response, ensure_ascii=False), _timestamp(expires_at), key)
+        )
+
+    async def release(self, key: str) -> None:
+        await run_sync(self.db.execute, "DELETE FROM idempotency_keys WHERE key = ? AND status = 'pending'", (key,))
+
+
+class SQLiteBroadcastJobRepository(BroadcastJobRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    @staticmethod
+    def _decode(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if row is not None:
+            for column in ("spec", "result"):
+                if row[column] is not None:
+                    row[column] = json.loads(row[column])
+        return row
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        row = await run_sync(self.db.insert, "broadcast_jobs", {"created_at": _now(), **data})
+        return self._decode(row)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = await run_sync(self.db.fetch_one, "SELECT * FROM broadcast_jobs WHERE id = ?", (job_id,))
+        return self._decode(row)
+
+    def _claim(self, job_id: Optional[str], lease_seconds: int, max_attempts: int) -> Optional[Dict[str, Any]]:
+        conn = self.db.connect()
+        now = datetime.now(timezone.utc)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE broadcast_jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                ("작업이 중단된 뒤 재시도 횟수를 초과했습니다", _timestamp(now), _timestamp(now), max_attempts)
+            )
+            row = self.db.fetch_one(
+                "SELECT id FROM broadcast_jobs "
+                "WHERE (? IS NULL OR id = ?) "
+                "AND (status = 'pending' OR (status = 'running' AND lease_until < ?)) "
+                "ORDER BY created_at LIMIT 1",
+                (job_id, job_id, _timestamp(now))
+            )
+            if row is not None:
+                conn.execute(
+                    "UPDATE broadcast_jobs SET status = 'running', attempts = attempts + 1, "
+                    "queued = 0, sent = 0, failed = 0, expired = 0, lease_until = ?, started_at = ? "
+                    "WHERE id = ?",
+                    (_timestamp(now + timedelta(seconds=lease_seconds)), _timestamp(now), row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return self._decode(self.db.fetch_one("SELECT * FROM broadcast_jobs WHERE id = ?", (row["id"],)))
+
+    async def claim(
+        self,
+        job_id: Optional[str],
+        lease_seconds: int,
+        max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        return await run_sync(self._claim, job_id, lease_seconds, max_attempts)
+
+    async def update(self, job_id: str, data: Dict[str, Any]) -> None:
+        data = {
+            column: _timestamp(value) if isinstance(value, datetime) else value
+            for column, value in data.items()
+        }
+        await run_sync(self.db.update, "broadcast_jobs", "id", job_id, data)
+
+
+class SQLiteReservationStatusRepository(ReservationStatusRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        return await run_sync(self.db.fetch_one, "SELECT * FROM reservation_status LIMIT 1")
+
+    async def create(self, is_open: bool) -> Dict[str, Any]:
+        return await run_sync(self.db.insert, "reservation_status", {
+            "id": str(uuid.uuid4()),
+            "is_open": is_open,
+            "updated_at": _now()
+        })
+
+    async def update(self, status_id: str, is_open: bool) -> Dict[str, Any]:
+        return await run_sync(self.db.update, "reservation_status", "id", status_id, {
+            "is_open": is_open,
+            "updated_at": _now()
+        })
@@ -0,0 +1,287 @@
+"""
+Supabase(PostgREST) 데이터 접근 구현
+모든 쿼리는 backend.config.database의 스레드 풀에서 실행
+"""
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.config.database import run_query
+from .base import (
+    UserRepository,
+    BusRouteRepository,
+    ReservationRepository,
+    ReservationStatusRepository,
+    PushInterestRepository,
+    IdempotencyRepository,
+    BroadcastJobRepository,
+)
+
+
+def _first(response) -> Optional[Dict[str, Any]]:
+    return response.data[0] if response.data else None
+
+
+def _quote(value: str) -> str:
+    """PostgREST or 필터 값 인용 (타임스탬프의 ':'/'+' 등)"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class SupabaseUserRepository(UserRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def get_by_student_id(self, student_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("users").select(columns).eq("student_id", student_id).limit(1)
+        ))
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return _first(await run_query(self.supabase_client.table("users").insert(data)))
+
+    async def update(self, student_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("users").update(data).eq("student_id", student_id)
+        ))
+
+    async def list_all(self, columns: str = "*") -> List[Dict[str, Any]]:
+        response = await run_query(
+            self.supabase_client.table("users").select(columns).order("created_at", desc=True)
+        )
+        return response.data or []
+
+    async def list_notification_enabled(self) -> List[Dict[str, Any]]:
+        response = await run_query(
+            self.supabase_client.table("users").select("*").eq("notification_enabled", True)
+        )
+        return response.data or []
+
+    async def list_push_subscribers(self, limit: int, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = self.supabase_client.table("users")\
+            .select("id, student_id, push_subscription")\
+            .eq("notification_enabled", True)\
+            .not_.is_("push_subscription", "null")\
+            .order("id")\
+            .limit(limit)
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        return (await run_query(query)).data or []
+
+    async def clear_push_subscriptions(self, student_ids: List[str]) -> None:
+        await run_query(
+            self.supabase_client.table("users").update({"push_subscription": None}).in_("student_id", student_ids)
+        )
+
+
+class SupabaseBusRouteRepository(BusRouteRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def list_all(self) -> List[Dict[str, Any]]:
+        response = await run_query(self.supabase_client.table("bus_routes").select("*").order("id"))
+        return response.data or []
+
+    async def list_open(self) -> List[Dict[str, Any]]:
+        response = await run_query(self.supabase_client.table("bus_routes").select("*").eq("is_open", True))
+        return response.data or []
+
+    async def get(self, route_id: str) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("bus_routes").select("*").eq("route_id", route_id).limit(1)
+        ))
+
+    async def list_by_route_ids(self, route_ids: List[str]) -> List[Dict[str, Any]]:
+        if not route_ids:
+            return []
+        response = await run_query(self.supabase_client.table("bus_routes").select("*").in_("route_id", route_ids))
+        return response.data or []
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return _first(await run_query(self.supabase_client.table("bus_routes").insert(data)))
+
+    async def update(self, route_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("bus_routes").update(data).eq("route_id", route_id)
+        ))
+
+    async def delete(self, route_id: str) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("bus_routes").delete().eq("route_id", route_id)
+        ))
+
+
+class SupabaseReservationRepository(ReservationRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def book(self, route_id: str, student_id: str, seat_count: int) -> Dict[str, Any]:
+        # book_seats RPC (migration_add_book_seats_function.sql)
+        response = await run_query(self.supabase_client.rpc("book_seats", {
+            "p_route_id": route_id,
+            "p_student_id": student_id,
+            "p_seat_count": seat_count
+        }))
+        return response.data or {}
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        departing_from: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        # 예약 + 노선 정보를 한 번에 조회 (필터/정렬/페이지네이션은 모두 DB에서)
+        route_columns = "id, route_id, route_name, departure_date, departure_time"
+        query = self.supabase_client.table("reservations")\
+            .select(f"*, bus_routes{'!inner' if departing_from else ''}({route_columns})")\
+            .eq("user_id", user_id)
+
+        if departing_from:
+            query = query.gte("bus_routes.departure_date", departing_from)
+
+        if after:
+            created_at, reservation_id = after
+            query = query.or_(
+                f"created_at.lt.{_quote(created_at)},"
+                f"and(created_at.eq.{_quote(created_at)},id.lt.{_quote(reservation_id)})"
+            )
+
+        query = query.order("created_at", desc=True).order("id", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
+
+        return (await run_query(query)).data or []
+
+
+class SupabasePushInterestRepository(PushInterestRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def list_for_student(self, student_id: str) -> List[Dict[str, Any]]:
+        response = await run_query(
+            self.supabase_client.table("push_interests").select("route_id, bus_type").eq("student_id", student_id)
+        )
+        return response.data or []
+
+    async def replace(self, student_id: str, route_ids: List[str], bus_types: List[str]) -> None:
+        # replace_push_interests RPC (migration_add_push_interests.sql) - 새 항목 추가와 나머지 삭제를 한 트랜잭션으로
+        await run_query(self.supabase_client.rpc("replace_push_interests", {
+            "p_student_id": student_id,
+            "p_route_ids": route_ids,
+            "p_bus_types": bus_types
+        }))
+
+    async def list_subscribers(
+        self,
+        route_id: Optional[str],
+        bus_type: Optional[str],
+        limit: int,
+        after_student_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        conditions = []
+        if route_id:
+            conditions.append(f"route_id.eq.{_quote(route_id)}")
+        if bus_type:
+            conditions.append(f"bus_type.eq.{_quote(bus_type)}")
+        if not conditions:
+            return []
+
+        # users를 inner join하여 한 번의 요청으로 구독 정보까지 가져옴
+        query = self.supabase_client.table("push_interests")\
+            .select("student_id, users!inner(push_subscription)")\
+            .or_(",".join(conditions))\
+            .eq("users.notification_enabled", True)\
+            .not_.is_("users.push_subscription", "null")\
+            .order("student_id")\
+            .limit(limit)
+        if after_student_id is not None:
+            query = query.gt("student_id", after_student_id)
+
+        return [
+            {"student_id": row["student_id"], "push_subscription": (row.get("users") or {}).get("push_subscription")}
+            for row in (await run_query(query)).data or []
+        ]
+
+
+class SupabaseIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def claim(self, key: str, request_hash: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        # claim_idempotency_key RPC (migration_add_idempotency_keys.sql) - INSERT ... ON CONFLICT 한 번으로 선점
+        response = await run_query(self.supabase_client.rpc("claim_idempotency_key", {
+            "p_key": key,
+            "p_request_hash": request_hash,
+            "p_lease_seconds": lease_seconds
+        }))
+        row = response.data or {}
+        return None if row.get("claimed") else row
+
+    async def complete(self, key: str, status_code: int, response: Any, expires_at: datetime) -> None:
+        await run_query(
+            self.supabase_client.table("idempotency_keys").update({
+                "status": "complete",
+                "status_code": status_code,
+                "response": response,
+                "expires_at": expires_at.isoformat()
+            }).eq("key", key)
+        )
+
+    async def release(self, key: str) -> None:
+        await run_query(
+            self.supabase_client.table("idempotency_keys").delete().eq("key", key).eq("status", "pending")
+        )
+
+
+class SupabaseBroadcastJobRepository(BroadcastJobRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return _first(await run_query(self.supabase_client.table("broadcast_jobs").insert(data)))
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(
+            self.supabase_client.table("broadcast_jobs").select("*").eq("id", job_id).limit(1)
+        ))
+
+    async def claim(
+        self,
+        job_id: Optional[str],
+        lease_seconds: int,
+        max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        # claim_broadcast_job RPC (migration_add_broadcast_jobs.sql) - FOR UPDATE SKIP LOCKED로 한 곳만 선점
+        response = await run_query(self.supabase_client.rpc("claim_broadcast_job", {
+            "p_job_id": job_id,
+            "p_lease_seconds": lease_seconds,
+            "p_max_attempts": max_attempts
+        }))
+        return _first(response)
+
+    async def update(self, job_id: str, data: Dict[str, Any]) -> None:
+        data = {
+            column: value.isoformat() if isinstance(value, datetime) else value
+            for column, value in data.items()
+        }
+        await run_query(self.supabase_client.table("broadcast_jobs").update(data).eq("id", job_id))
+
+
+class SupabaseReservationStatusRepository(ReservationStatusRepository):
+    def __init__(self, supabase_client):
+        self.supabase_client = supabase_client
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        return _first(await run_query(self.supabase_client.table("reservation_status").select("*").limit(1)))
+
+    async def create(self, is_open: bool) -> Dict[str, Any]:
+        return _first(await run_query(
+            self.supabase_client.table("reservation_status").insert({"is_open": is_open})
+        ))
+
+    async def update(self, status_id: str, is_open: bool) -> Dict[str, Any]:
+        return _first(await run_query(
+            self.supabase_client.table("reservation_status").update({
+                "is_open": is_open,
+                "updated_at": datetime.now().isoformat()
+            }).eq("id", status_id)
+        ))
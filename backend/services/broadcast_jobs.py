@@ -0,0 +1,264 @@
+"""
+브로드캐스트 작업 관리 (broadcast_jobs 테이블, migration_add_broadcast_jobs.sql)
+관리자 요청은 작업을 DB에 등록하고 작업 ID만 받아 바로 반환하며, 진행 상황은 /push/jobs/{id}로 조회
+
+작업 행에 전송 내용(spec)이 함께 저장되므로 어느 서버 인스턴스에서든 실행할 수 있다:
+    run(job_id)  - 등록한 요청의 BackgroundTasks에서 바로 실행 (상시 실행 서버)
+    run_due()    - 아직 시작하지 않았거나 실행하던 인스턴스가 멈춘 작업을 이어서 실행
+                   (POST /push/jobs/run - 서버리스(Vercel)에서는 BackgroundTasks가 응답 후 끝까지
+                   실행된다는 보장이 없으므로 관리자 페이지/Cron이 호출, 서버 시작 시에도 한 번 실행)
+실행하는 동안 진행 상황을 주기적으로 기록하며 임대(lease_until)를 연장한다. 임대가 만료되면 다른
+인스턴스가 처음부터 다시 전송한다 (같은 Topic 알림은 기기에서 교체되므로 중복으로 쌓이지 않음).
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from backend.repositories import broadcast_job_repository, BroadcastJobRepository
+from .web_push_service import web_push_service
+
+logger = logging.getLogger(__name__)
+
+# 실행 중인 작업의 임대 시간 (초) - 진행 상황을 기록할 때마다 연장, 인스턴스가 멈추면 이 시간 뒤 재실행
+BROADCAST_JOB_LEASE = int(os.getenv("BROADCAST_JOB_LEASE", "60"))
+# 최대 실행 횟수 (임대 만료로 다시 실행된 횟수 포함)
+BROADCAST_JOB_MAX_ATTEMPTS = int(os.getenv("BROADCAST_JOB_MAX_ATTEMPTS", "3"))
+# 진행 상황을 DB에 기록하는 간격 (초)
+BROADCAST_JOB_FLUSH_INTERVAL = float(os.getenv("BROADCAST_JOB_FLUSH_INTERVAL", "2"))
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+@dataclass
+class BroadcastJob:
+    """
+    브로드캐스트 진행 상황
+
+    spec: 전송 내용 (kind=all|interested, title, body, data, route_id, bus_type, topic, urgency)
+    queued: 전송 대기열에 들어간 구독자 수 (Outbox 모드면 등록된 작업 수)
+    sent / failed / expired: 전송 결과별 수 (expired는 404/410, failed에는 포함되지 않음)
+    """
+    id: str
+    name: str
+    spec: Dict[str, Any] = field(default_factory=dict)
+    status: str = "pending"  # pending | running | done | failed
+    attempts: int = 0
+    queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    expired: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "BroadcastJob":
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            spec=row.get("spec") or {},
+            status=row.get("status") or "pending",
+            attempts=row.get("attempts") or 0,
+            queued=row.get("queued") or 0,
+            sent=row.get("sent") or 0,
+            failed=row.get("failed") or 0,
+            expired=row.get("expired") or 0,
+            created_at=_parse_timestamp(row.get("created_at")) or time.time(),
+            started_at=_parse_timestamp(row.get("started_at")),
+            finished_at=_parse_timestamp(row.get("finished_at")),
+            result=row.get("result"),
+            error=row.get("error")
+        )
+
+    def record(self, result) -> None:
+        """PushResult 하나를 집계 (None이면 실패)"""
+        if result is not None and result.ok:
+            self.sent += 1
+        elif result is not None and result.expired:
+            self.expired += 1
+        else:
+            self.failed += 1
+
+    def progress(self) -> Dict[str, Any]:
+        """DB에 기록할 진행 수"""
+        return {"queued": self.queued, "sent": self.sent, "failed": self.failed, "expired": self.expired}
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        completed = self.sent + self.failed + self.expired
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "attempts": self.attempts,
+            "queued": self.queued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "expired": self.expired,
+            "elapsed": round(elapsed, 3),
+            "rate": round(completed / elapsed, 1) if elapsed > 0 else 0.0,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class BroadcastJobManager:
+    """DB에 저장된 브로드캐스트 작업 생성/조회/실행"""
+
+    def __init__(
+        self,
+        repository: BroadcastJobRepository,
+        lease: int = BROADCAST_JOB_LEASE,
+        max_attempts: int = BROADCAST_JOB_MAX_ATTEMPTS,
+        flush_interval: float = BROADCAST_JOB_FLUSH_INTERVAL
+    ):
+        self.repository = repository
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.flush_interval = flush_interval
+
+    async def create(self, name: str, spec: Dict[str, Any]) -> BroadcastJob:
+        """작업 등록 (pending) - spec은 JSON으로 저장할 수 있는 값만"""
+        row = await self.repository.create({
+            "id": uuid.uuid4().hex,
+            "name": name,
+            "spec": spec,
+            "status": "pending"
+        })
+        return BroadcastJob.from_row(row)
+
+    async def get(self, job_id: str) -> Optional[BroadcastJob]:
+        row = await self.repository.get(job_id)
+        return BroadcastJob.from_row(row) if row is not None else None
+
+    async def run(self, job_id: str) -> Optional[BroadcastJob]:
+        """
+        작업 하나 실행 (BackgroundTasks에서 호출)
+        다른 인스턴스가 이미 실행 중이거나 끝난 작업이면 아무것도 하지 않고 None 반환
+        """
+        try:
+            row = await self.repository.claim(job_id, self.lease, self.max_attempts)
+        except Exception as e:
+            # 작업은 pending으로 남아 run_due()에서 실행됨
+            logger.error(f"브로드캐스트 작업 선점 실패 ({job_id}): {e}", exc_info=True)
+            return None
+        if row is None:
+            return None
+        job = BroadcastJob.from_row(row)
+        await self._execute(job)
+        return job
+
+    async def run_due(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """실행할 작업(pending 또는 임대 만료)을 최대 limit개 차례로 실행하고 결과 반환"""
+        finished = []
+        for _ in range(limit):
+            row = await self.repository.claim(None, self.lease, self.max_attempts)
+            if row is None:
+                break
+            job = BroadcastJob.from_row(row)
+            await self._execute(job)
+            finished.append(job.to_dict())
+        return finished
+
+    async def resume(self):
+        """서버 시작 시 이전 프로세스가 남긴 작업 이어서 실행 (startup 이벤트에서 호출)"""
+        try:
+            finished = await self.run_due()
+            if finished:
+                logger.info(f"📤 남은 브로드캐스트 작업 {len(finished)}개 실행 완료")
+        except Exception as e:
+            logger.error(f"남은 브로드캐스트 작업 실행 실패: {e}", exc_info=True)
+
+    def _broadcast(self, job: BroadcastJob):
+        spec = job.spec
+        if spec.get("kind") == "interested":
+            return web_push_service.send_to_interested_users(
+                spec["title"],
+                spec["body"],
+                spec.get("data"),
+                route_id=spec.get("route_id"),
+                bus_type=spec.get("bus_type"),
+                topic=spec.get("topic"),
+                urgency=spec.get("urgency", "normal"),
+                progress=job
+            )
+        return web_push_service.send_to_all_users(
+            spec["title"],
+            spec["body"],
+            spec.get("data"),
+            topic=spec.get("topic"),
+            urgency=spec.get("urgency", "normal"),
+            progress=job
+        )
+
+    async def _flush(self, job: BroadcastJob):
+        """진행 상황 기록 + 임대 연장"""
+        await self.repository.update(job.id, {
+            **job.progress(),
+            "lease_until": datetime.now(timezone.utc) + timedelta(seconds=self.lease)
+        })
+
+    async def _keep_alive(self, job: BroadcastJob):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._flush(job)
+            except Exception as e:
+                # 기록에 계속 실패하면 임대가 만료되어 다른 인스턴스가 다시 실행할 수 있음
+                logger.warning(f"브로드캐스트 작업 진행 상황 기록 실패 ({job.id}): {e}")
+
+    async def _execute(self, job: BroadcastJob):
+        """선점한 작업 실행 후 결과 기록"""
+        logger.info(f"📤 브로드캐스트 작업 시작: {job.name} ({job.id}, {job.attempts}번째 시도)")
+        job.status = "running"
+        job.started_at = job.started_at or time.time()
+        keep_alive = asyncio.create_task(self._keep_alive(job))
+        try:
+            job.result = await self._broadcast(job)
+            if job.result.get("error"):
+                job.status = "failed"
+                job.error = job.result["error"]
+            else:
+                job.status = "done"
+        except Exception as e:
+            logger.error(f"브로드캐스트 작업 실패 ({job.id}): {e}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            keep_alive.cancel()
+            try:
+                await keep_alive
+            except asyncio.CancelledError:
+                pass
+            job.finished_at = time.time()
+
+        try:
+            await self.repository.update(job.id, {
+                **job.progress(),
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+                "lease_until": None,
+                "finished_at": datetime.fromtimestamp(job.finished_at, timezone.utc)
+            })
+        except Exception as e:
+            # 임대가 만료되면 다시 실행됨 (같은 Topic이라 기기에는 알림이 하나만 남음)
+            logger.error(f"브로드캐스트 작업 결과 기록 실패 ({job.id}): {e}", exc_info=True)
+        logger.info(f"브로드캐스트 작업 종료: {job.name} ({job.id}) - {job.to_dict()}")
+
+
+# 전역 인스턴스 (DATA_BACKEND에 따른 작업 저장소 사용)
+broadcast_jobs = BroadcastJobManager(broadcast_job_repository)
@@ -0,0 +1,141 @@
+"""
+Idempotency-Key 응답 저장소
+같은 키로 재시도된 요청에는 처음 응답을 그대로 돌려주어 예매가 중복 생성되지 않도록 함
+(메모리 TTL 캐시 + idempotency_keys 테이블, migration_add_idempotency_keys.sql)
+
+처리 순서:
+    claim(키)    - 처리 전에 DB에 pending 행을 먼저 넣어 키를 선점 (INSERT ... ON CONFLICT DO NOTHING)
+                   이미 있는 키면 그 행을 반환 → 처리 중(pending)이면 409, 완료면 저장된 응답 재전송
+    complete(키) - 처리 결과를 저장하고 보관 기간(IDEMPOTENCY_TTL)으로 연장
+    release(키)  - 5xx 등 다시 시도해야 하는 실패면 선점 해제
+선점은 DB에서 이루어지므로 서버 인스턴스(프로세스)가 여러 개여도 한 요청만 처리된다.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from backend.repositories import idempotency_repository, IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+# 응답을 보관하는 시간 (초) 및 메모리 캐시 크기
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+# 처리 중(pending) 선점 유지 시간 (초) - 처리하던 서버가 죽어도 이 시간이 지나면 다시 처리 가능
+IDEMPOTENCY_LEASE = int(os.getenv("IDEMPOTENCY_LEASE", "60"))
+
+
+@dataclass
+class StoredResponse:
+    """저장된 응답 (status가 pending이면 다른 요청이 처리 중이라 status_code/body 없음)"""
+    request_hash: str
+    status_code: Optional[int]
+    body: Any
+    expires_at: float
+    status: str = "complete"  # pending | complete
+
+    @property
+    def pending(self) -> bool:
+        return self.status == "pending"
+
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """요청 본문 해시 - 같은 키로 다른 요청을 보낸 경우를 구분"""
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _parse_timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key → 처음 응답
+
+    완료된 응답은 메모리에서 먼저 찾고, 없으면 DB에서 키를 선점한다.
+    DB 오류는 호출한 쪽으로 올려보낸다 (claim 실패 시 예매를 진행하지 않음 - fail closed).
+    """
+
+    def __init__(
+        self,
+        repository: IdempotencyRepository,
+        ttl: int = IDEMPOTENCY_TTL,
+        cache_size: int = IDEMPOTENCY_CACHE_SIZE,
+        lease: int = IDEMPOTENCY_LEASE
+    ):
+        self.repository = repository
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.lease = lease
+        self._cache: "OrderedDict[str, StoredResponse]" = OrderedDict()
+
+    def _remember(self, key: str, stored: StoredResponse):
+        self._cache[key] = stored
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cached(self, key: str) -> Optional[StoredResponse]:
+        stored = self._cache.get(key)
+        if stored is not None and stored.expires_at <= time.time():
+            del self._cache[key]
+            return None
+        return stored
+
+    async def claim(self, key: str, request_hash: str) -> Optional[StoredResponse]:
+        """
+        키 선점 - 선점했으면 None, 이미 있는 키면 저장된 응답(처리 중이면 pending) 반환
+
+        Raises:
+            DB 오류 (선점 여부를 알 수 없으므로 요청을 처리하면 안 됨)
+        """
+        stored = self._cached(key)
+        if stored is not None:
+            return stored
+
+        row = await self.repository.claim(key, request_hash, self.lease)
+        if row is None:
+            return None
+
+        stored = StoredResponse(
+            row["request_hash"],
+            row.get("status_code"),
+            row.get("response"),
+            _parse_timestamp(row["expires_at"]),
+            row.get("status") or "complete"
+        )
+        if not stored.pending:
+            self._remember(key, stored)
+        return stored
+
+    async def complete(self, key: str, request_hash: str, status_code: int, body: Any):
+        """처리 결과 저장 (실패해도 응답은 그대로 돌려주고 기록만 - 같은 프로세스에서는 메모리로 재전송)"""
+        stored = StoredResponse(request_hash, status_code, body, time.time() + self.ttl)
+        self._remember(key, stored)
+        try:
+            await self.repository.complete(
+                key, status_code, body, datetime.fromtimestamp(stored.expires_at, timezone.utc)
+            )
+        except Exception as e:
+            # 선점은 IDEMPOTENCY_LEASE 뒤 만료되어 다른 인스턴스에서는 다시 처리될 수 있음
+            logger.error(f"Idempotency 응답 저장 실패 ({key}): {e}", exc_info=True)
+
+    async def release(self, key: str):
+        """선점 해제 (다시 시도할 수 있는 실패)"""
+        try:
+            await self.repository.release(key)
+        except Exception as e:
+            logger.error(f"Idempotency 선점 해제 실패 ({key}, {self.lease}초 뒤 만료): {e}", exc_info=True)
+
+
+# 전역 인스턴스
+idempotency_store = IdempotencyStore(idempotency_repository)
@@ -0,0 +1,325 @@
+"""
+푸시 알림 Outbox - SQLite 기반 영속 전송 큐
+브로드캐스트를 작업 단위로 저장하고 워커가 재시도(지수 백오프 + 지터, Retry-After)하며 전송
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import asyncio
+import logging
+import tempfile
+from typing import List, Dict, Optional, Tuple
+
+from .web_push_service import web_push_service, PushResult, PreparedBroadcast
+from .push_subscription import SubscriptionRecord
+
+logger = logging.getLogger(__name__)
+
+PUSH_OUTBOX_ENABLED = os.getenv("PUSH_OUTBOX_ENABLED", "false").lower() == "true"
+PUSH_OUTBOX_PATH = os.getenv(
+    "PUSH_OUTBOX_PATH",
+    os.path.join(tempfile.gettempdir(), "schoolbus_push_outbox.db")
+)
+PUSH_OUTBOX_MAX_ATTEMPTS = int(os.getenv("PUSH_OUTBOX_MAX_ATTEMPTS", "8"))
+PUSH_OUTBOX_BASE_DELAY = float(os.getenv("PUSH_OUTBOX_BASE_DELAY", "2"))
+PUSH_OUTBOX_MAX_DELAY = float(os.getenv("PUSH_OUTBOX_MAX_DELAY", "900"))
+PUSH_OUTBOX_BATCH_SIZE = int(os.getenv("PUSH_OUTBOX_BATCH_SIZE", "500"))
+PUSH_OUTBOX_POLL_INTERVAL = float(os.getenv("PUSH_OUTBOX_POLL_INTERVAL", "1"))
+PUSH_OUTBOX_RETENTION = float(os.getenv("PUSH_OUTBOX_RETENTION", str(24 * 3600)))
+
+# 워커가 작업을 가져간 뒤 응답 없이 죽었을 때 다시 전송 대상이 되기까지의 시간 (초)
+_LEASE_SECONDS = 120
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS push_outbox_payloads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload BLOB NOT NULL,
+    headers TEXT NOT NULL DEFAULT '{}',  -- TTL/Urgency/Topic
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS push_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload_id INTEGER NOT NULL REFERENCES push_outbox_payloads(id),
+    student_id TEXT NOT NULL,
+    subscription TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, sending, sent, expired, dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_status INTEGER,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_push_outbox_due ON push_outbox(status, next_attempt_at);
+"""
+
+
+class PushOutbox:
+    """
+    SQLite에 저장된 푸시 작업을 꺼내 전송하는 Outbox
+
+    - enqueue: 브로드캐스트 페이로드를 한 번 저장하고 구독자별 작업 생성
+    - 워커: 기한이 된 작업을 임대(lease)하여 전송, 결과에 따라
+      sent / expired(404, 410) / 재시도(429, 5xx, 네트워크 오류) / dead(최대 시도 초과, 영구 오류)
+    """
+
+    def __init__(
+        self,
+        path: str = PUSH_OUTBOX_PATH,
+        push_service=web_push_service,
+        max_attempts: int = PUSH_OUTBOX_MAX_ATTEMPTS,
+        enabled: bool = PUSH_OUTBOX_ENABLED
+    ):
+        self.path = path
+        self.push_service = push_service
+        self.max_attempts = max_attempts
+        self.enabled = enabled
+        self._schema_ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # SQLite 접근 (스레드에서 실행)
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def _enqueue_sync(
+        self,
+        broadcast: PreparedBroadcast,
+        recipients: List[Tuple[str, SubscriptionRecord]]
+    ) -> int:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "INSERT INTO push_outbox_payloads (payload, headers, created_at) VALUES (?, ?, ?)",
+                (broadcast.payload, json.dumps(broadcast.headers), now)
+            )
+            payload_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO push_outbox "
+                "(payload_id, student_id, subscription, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (payload_id, student_id, record.to_json(), now, now, now)
+                    for student_id, record in recipients
+                ]
+            )
+            # 보관 기간이 지난 완료 작업 정리
+            conn.execute(
+                "DELETE FROM push_outbox WHERE status IN ('sent', 'expired') AND updated_at < ?",
+                (now - PUSH_OUTBOX_RETENTION,)
+            )
+            conn.execute(
+                "DELETE FROM push_outbox_payloads WHERE id NOT IN "
+                "(SELECT DISTINCT payload_id FROM push_outbox)"
+            )
+            conn.execute("COMMIT")
+            return len(recipients)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _claim_sync(self, limit: int) -> List[sqlite3.Row]:
+        """기한이 된 작업을 임대 상태(sending)로 바꾸고 반환"""
+        now = time.time()
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT o.id, o.student_id, o.subscription, o.attempts, o.payload_id, p.payload, p.headers "
+                "FROM push_outbox o JOIN push_outbox_payloads p ON p.id = o.payload_id "
+                "WHERE o.status IN ('pending', 'sending') AND o.next_attempt_at <= ? "
+                "ORDER BY o.next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE push_outbox SET status = 'sending', next_attempt_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    [(now + _LEASE_SECONDS, now, row["id"]) for row in rows]
+                )
+            conn.execute("COMMIT")
+            return rows
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _record_sync(self, updates: List[Tuple]) -> None:
+        """(status, attempts, next_attempt_at, last_status, last_error, updated_at, id) 목록 반영"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE push_outbox SET status = ?, attempts = ?, next_attempt_at = ?, "
+                "last_status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                updates
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _stats_sync(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM push_outbox GROUP BY status"
+            ).fetchall()
+            return {status: count for status, count in rows}
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    async def enqueue(
+        self,
+        broadcast: PreparedBroadcast,
+        recipients: List[Tuple[str, SubscriptionRecord]]
+    ) -> int:
+        """
+        브로드캐스트 작업 등록
+
+        Args:
+            broadcast: 직렬화된 페이로드와 푸시 헤더
+            recipients: (student_id, SubscriptionRecord) 목록
+        """
+        if not recipients:
+            return 0
+        count = await asyncio.to_thread(self._enqueue_sync, broadcast, recipients)
+        logger.info(f"Outbox에 {count}건의 푸시 작업 등록")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return count
+
+    async def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        return await asyncio.to_thread(self._stats_sync)
+
+    def backoff_delay(self, attempts: int, retry_after: Optional[float] = None) -> float:
+        """지수 백오프 + 지터 (Retry-After가 더 길면 그 값을 따름)"""
+        delay = min(PUSH_OUTBOX_MAX_DELAY, PUSH_OUTBOX_BASE_DELAY * (2 ** max(0, attempts - 1)))
+        # equal jitter: 절반은 고정, 절반은 무작위
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def drain_once(self, limit: int = PUSH_OUTBOX_BATCH_SIZE) -> int:
+        """기한이 된 작업 한 묶음 전송, 처리한 작업 수 반환"""
+        rows = await asyncio.to_thread(self._claim_sync, limit)
+        if not rows:
+            return 0
+
+        # 같은 페이로드끼리 묶어서 전송
+        groups: Dict[int, List[sqlite3.Row]] = {}
+        for row in rows:
+            groups.setdefault(row["payload_id"], []).append(row)
+
+        updates = []
+        expired_student_ids = []
+        now = time.time()
+
+        for group in groups.values():
+            broadcast = PreparedBroadcast.from_parts(
+                group[0]["payload"], json.loads(group[0]["headers"])
+            )
+            # 저장된 구독 JSON은 구독 캐시를 거쳐 변환됨
+            subscriptions = [row["subscription"] for row in group]
+            results = await self.push_service.deliver_payload(broadcast, subscriptions)
+
+            for row, result in zip(group, results):
+                attempts = row["attempts"] + 1
+                result = result or PushResult(error="unexpected error", transient=True)
+
+                if result.ok:
+                    status, next_at = "sent", now
+                elif result.expired:
+                    status, next_at = "expired", now
+                    expired_student_ids.append(row["student_id"])
+                elif result.retryable and attempts < self.max_attempts:
+                    status = "pending"
+                    next_at = now + self.backoff_delay(attempts, result.retry_after)
+                else:
+                    status, next_at = "dead", now
+                    logger.error(
+                        f"푸시 작업 dead-letter 처리 ({row['student_id']}, "
+                        f"{attempts}회 시도, 상태 {result.status_code}): {result.error}"
+                    )
+
+                updates.append((
+                    status, attempts, next_at, result.status_code,
+                    (result.error or "")[:500] or None, now, row["id"]
+                ))
+
+        await asyncio.to_thread(self._record_sync, updates)
+
+        if expired_student_ids:
+            await self.push_service.clear_expired_subscriptions(expired_student_ids)
+
+        return len(rows)
+
+    async def _run(self):
+        """워커 루프 - 처리할 작업이 없으면 enqueue 신호나 폴링 주기까지 대기"""
+        logger.info("푸시 Outbox 워커 시작")
+        while True:
+            try:
+                processed = await self.drain_once()
+                if processed:
+                    continue
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), PUSH_OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                logger.info("푸시 Outbox 워커 중지")
+                raise
+            except Exception as e:
+                logger.error(f"푸시 Outbox 처리 중 오류: {e}", exc_info=True)
+                await asyncio.sleep(PUSH_OUTBOX_POLL_INTERVAL)
+
+    def start(self):
+        """현재 이벤트 루프에서 워커 시작 (이미 실행 중이면 무시)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """워커 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 전역 인스턴스
+push_outbox = PushOutbox()
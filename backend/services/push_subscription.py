@@ -0,0 +1,152 @@
+"""
+푸시 구독 정보 정규화 및 캐시
+구독 JSON을 한 번만 파싱/디코딩하여 전송 루프에서는 암호화와 I/O만 수행하도록 함
+"""
+
+import os
+import json
+import base64
+import threading
+import urllib.parse
+from collections import OrderedDict
+from typing import Dict, Any, NamedTuple, Union
+
+SUBSCRIPTION_CACHE_SIZE = int(os.getenv("SUBSCRIPTION_CACHE_SIZE", "20000"))
+
+
+class SubscriptionRecord(NamedTuple):
+    """전송에 필요한 값만 담은 구독 정보 (키는 디코딩된 bytes)"""
+    endpoint: str
+    audience: str  # VAPID aud (푸시 서비스 origin)
+    p256dh: bytes  # 구독자 공개키 (65바이트 uncompressed point)
+    auth: bytes    # auth secret (16바이트)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """브라우저 PushSubscription과 같은 형태로 변환 (저장용)"""
+        return {
+            "endpoint": self.endpoint,
+            "keys": {
+                "p256dh": base64.urlsafe_b64encode(self.p256dh).decode().rstrip("="),
+                "auth": base64.urlsafe_b64encode(self.auth).decode().rstrip("=")
+            }
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+def _b64_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def normalize_subscription(subscription: Dict[str, Any]) -> SubscriptionRecord:
+    """
+    PushSubscription JSON을 SubscriptionRecord로 변환
+
+    Raises:
+        ValueError: endpoint나 키가 없거나 형식이 잘못된 경우
+    """
+    # 저장된 JSON이 객체가 아닌 경우(목록, 문자열 등)도 형식 오류로 처리
+    if not isinstance(subscription, dict):
+        raise ValueError(f"구독 정보 형식이 올바르지 않습니다: {type(subscription).__name__}")
+    endpoint = subscription.get("endpoint") or ""
+    keys = subscription.get("keys") or {}
+    if not isinstance(keys, dict):
+        raise ValueError(f"구독 키 형식이 올바르지 않습니다: {type(keys).__name__}")
+    p256dh = keys.get("p256dh") or ""
+    auth = keys.get("auth") or ""
+
+    if not all(isinstance(value, str) for value in (endpoint, p256dh, auth)):
+        raise ValueError("구독 정보 값은 문자열이어야 합니다")
+    if not all([endpoint, p256dh, auth]):
+        raise ValueError("구독 정보가 불완전합니다")
+
+    parsed = urllib.parse.urlparse(endpoint)
+    if parsed.scheme not in ("https", "http") or not parsed.netloc:
+        raise ValueError(f"잘못된 endpoint: {endpoint[:60]}")
+
+    try:
+        p256dh_bytes = _b64_decode(p256dh)
+        auth_bytes = _b64_decode(auth)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"구독 키 디코딩 실패: {e}")
+
+    if len(p256dh_bytes) != 65 or p256dh_bytes[0] != 0x04:
+        raise ValueError("p256dh 키 형식이 올바르지 않습니다")
+    if len(auth_bytes) != 16:
+        raise ValueError("auth secret 길이가 올바르지 않습니다")
+
+    return SubscriptionRecord(
+        endpoint=endpoint,
+        audience=f"{parsed.scheme}://{parsed.netloc}",
+        p256dh=p256dh_bytes,
+        auth=auth_bytes
+    )
+
+
+class SubscriptionCache:
+    """
+    users.push_subscription 원본 문자열 → SubscriptionRecord LRU 캐시
+
+    같은 구독 문자열은 프로세스 안에서 한 번만 파싱/디코딩된다.
+    """
+
+    def __init__(self, max_size: int = SUBSCRIPTION_CACHE_SIZE):
+        self.max_size = max_size
+        self._records: "OrderedDict[str, SubscriptionRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, raw: Union[str, Dict[str, Any]]) -> SubscriptionRecord:
+        """
+        원본(JSON 문자열 또는 dict)에 해당하는 레코드 반환
+
+        Raises:
+            ValueError: 파싱/정규화 실패
+        """
+        if isinstance(raw, dict):
+            # jsonb 컬럼 등으로 dict가 들어오면 정렬된 JSON을 캐시 키로 사용
+            subscription = raw
+            raw = json.dumps(raw, sort_keys=True, separators=(",", ":"))
+        elif isinstance(raw, str):
+            subscription = None
+        else:
+            # jsonb 목록/숫자 등 (캐시 키로 쓸 수 없음)
+            raise ValueError(f"구독 정보 형식이 올바르지 않습니다: {type(raw).__name__}")
+
+        with self._lock:
+            record = self._records.get(raw)
+            if record is not None:
+                self._records.move_to_end(raw)
+                self.hits += 1
+                return record
+            self.misses += 1
+
+        if subscription is None:
+            try:
+                subscription = json.loads(raw)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"구독 정보 JSON 파싱 실패: {e}")
+        record = normalize_subscription(subscription)
+        self.put(raw, record)
+        return record
+
+    def put(self, raw: str, record: SubscriptionRecord):
+        with self._lock:
+            self._records[raw] = record
+            self._records.move_to_end(raw)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._records),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# 전역 인스턴스
+subscription_cache = SubscriptionCache()
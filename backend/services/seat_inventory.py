@@ -0,0 +1,177 @@
+"""
+노선별 좌석 재고 (프로세스 메모리) 및 예매 입장 제어
+노선 오픈 직후 몰리는 예매 요청 중 매진/미오픈 요청은 DB 호출 없이 바로 거절하고,
+남은 좌석 수만큼만 동시에 book_seats RPC로 보내 DB 부하를 수요가 아닌 좌석 수에 비례하게 유지
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from backend.repositories import bus_route_repository, BusRouteRepository
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# bus_routes에서 다시 읽어오기 전까지 재고를 신뢰하는 시간 (초)
+# 다른 서버 인스턴스의 예매/관리자 변경은 이 시간 안에 반영된다
+SEAT_INVENTORY_TTL = float(os.getenv("SEAT_INVENTORY_TTL", "5"))
+# 메모리에 보관할 최대 노선 수 (없는 route_id 포함, 오래 조회되지 않은 노선부터 제거)
+SEAT_INVENTORY_MAX_ROUTES = int(os.getenv("SEAT_INVENTORY_MAX_ROUTES", "1000"))
+
+
+@dataclass
+class RouteSeats:
+    """
+    노선 하나의 재고 스냅샷 (DB에서 읽을 때마다 새로 만듦)
+
+    in_flight는 이 스냅샷을 기준으로 입장시킨 좌석 수만 센다. 스냅샷 이전에 입장한 예매는
+    이미 DB에 반영되었는지 알 수 없으므로 새 스냅샷에서 빼지 않는다 (잠시 더 입장시켜도
+    book_seats가 최종 거절하지만, 반대로 두 번 빼면 좌석이 남았는데 매진으로 거절하게 됨).
+    """
+    exists: bool
+    is_open: bool
+    available: int  # DB 기준 잔여석 (스냅샷 조회/이 스냅샷에서 입장한 예매의 결과)
+    in_flight: int = 0  # 이 스냅샷 기준으로 입장시켜 DB에서 처리 중인 좌석 수
+    synced_at: float = 0.0
+
+
+@dataclass
+class Admission:
+    """입장 제어 결과 - rejected가 None이면 허가 (반드시 release() 호출)"""
+    route_id: str
+    seat_count: int
+    rejected: Optional[str] = None
+    seats: Optional[RouteSeats] = None  # 입장 기준 스냅샷
+
+
+class SeatInventory:
+    """
+    route_id별 좌석 재고
+
+    admit()이 돌려준 Admission.rejected가 None이면 입장 허가 (반드시 release() 호출), 아니면 거절 사유
+    ("not_found" / "closed" / "sold_out")다. 최종 판단은 항상 book_seats RPC가 하며,
+    이 재고는 DB로 보낼 필요가 없는 요청을 걸러내는 역할만 한다.
+    """
+
+    def __init__(
+        self,
+        routes: BusRouteRepository,
+        ttl: float = SEAT_INVENTORY_TTL,
+        max_routes: int = SEAT_INVENTORY_MAX_ROUTES
+    ):
+        self.routes = routes
+        self.ttl = ttl
+        self.max_routes = max(1, max_routes)
+        self._routes: "OrderedDict[str, RouteSeats]" = OrderedDict()
+        # 노선별로 DB 조회 하나만 진행 (끝나면 키가 사라지므로 노선 수만큼 쌓이지 않음)
+        self._refreshes = SingleFlight(enabled=True)
+        self.rejected = 0
+        self.admitted = 0
+
+    async def _fetch(self, route_id: str) -> RouteSeats:
+        # synced_at은 조회를 시작한 시각 (늦게 끝난 이전 조회가 새 스냅샷을 덮지 않도록 비교에 사용)
+        started = time.monotonic()
+        row = await self.routes.get(route_id)
+        if row is None:
+            return RouteSeats(exists=False, is_open=False, available=0, synced_at=started)
+        return RouteSeats(
+            exists=True,
+            is_open=bool(row.get("is_open")),
+            available=row.get("available_seats") or 0,
+            synced_at=started
+        )
+
+    async def _refresh(self, route_id: str) -> RouteSeats:
+        fresh = await self._fetch(route_id)
+        current = self._routes.get(route_id)
+        if current is not None and current.synced_at > fresh.synced_at:
+            return current
+        self._routes[route_id] = fresh
+        self._routes.move_to_end(route_id)
+        while len(self._routes) > self.max_routes:
+            self._routes.popitem(last=False)
+        return fresh
+
+    async def _get(self, route_id: str) -> RouteSeats:
+        """재고 반환 - 없거나 TTL이 지났으면 DB에서 새 스냅샷을 읽음 (노선별로 한 요청만 조회)"""
+        seats = self._routes.get(route_id)
+        if seats is not None and time.monotonic() - seats.synced_at < self.ttl:
+            self._routes.move_to_end(route_id)
+            return seats
+        return await self._refreshes.do(route_id, lambda: self._refresh(route_id))
+
+    async def admit(self, route_id: str, seat_count: int) -> Admission:
+        """예매 입장 제어"""
+        seats = await self._get(route_id)
+        admission = Admission(route_id, seat_count)
+        if not seats.exists:
+            admission.rejected = "not_found"
+        elif not seats.is_open:
+            admission.rejected = "closed"
+        elif seats.available - seats.in_flight < seat_count:
+            admission.rejected = "sold_out"
+        else:
+            seats.in_flight += seat_count
+            admission.seats = seats
+            self.admitted += 1
+            return admission
+        self.rejected += 1
+        return admission
+
+    def release(self, admission: Admission, result: Optional[Dict[str, Any]] = None):
+        """
+        입장한 예매 종료 처리 - book_seats 결과로 재고 보정
+
+        입장 이후 스냅샷이 바뀌었으면(TTL 만료, invalidate) 새 스냅샷에는 반영하지 않는다.
+        result가 없으면(RPC 오류) 좌석만 반환하고 다음 조회 때 DB에서 다시 읽도록 한다.
+        """
+        seats = admission.seats
+        if seats is None:
+            return
+        admission.seats = None
+        seats.in_flight = max(0, seats.in_flight - admission.seat_count)
+        if self._routes.get(admission.route_id) is not seats:
+            return
+
+        status = (result or {}).get("status")
+        if status in ("ok", "sold_out") and result.get("available_seats") is not None:
+            # 같은 스냅샷 안에서는 예매로 줄어들기만 하므로, 늦게 도착한 이전 결과로 되돌리지 않음
+            seats.available = min(seats.available, result["available_seats"])
+        elif status == "closed":
+            seats.is_open = False
+        elif status == "not_found":
+            seats.exists = False
+        else:
+            seats.synced_at = 0.0
+
+    def invalidate(self, route_id: Optional[str] = None):
+        """관리자가 노선을 변경한 경우 재고를 다시 읽도록 표시 (route_id 없으면 전체)"""
+        targets = [route_id] if route_id is not None else list(self._routes)
+        for target in targets:
+            # 변경 전에 시작한 조회에도 합류하지 않도록
+            self._refreshes.forget(target)
+            seats = self._routes.get(target)
+            if seats is not None:
+                seats.synced_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "routes": {
+                route_id: {
+                    "is_open": seats.is_open,
+                    "available": seats.available,
+                    "in_flight": seats.in_flight
+                }
+                for route_id, seats in self._routes.items() if seats.exists
+            }
+        }
+
+
+# 전역 인스턴스 (DATA_BACKEND에 따른 노선 저장소 사용)
+seat_inventory = SeatInventory(bus_route_repository)
@@ -0,0 +1,162 @@
+"""
+멀티 프로세스 샤딩 브로드캐스터
+구독자를 student_id 해시로 N개 워커 프로세스에 나눠, 암호화와 TLS 전송을 여러 코어에서 처리
+
+각 워커 프로세스는 자신만의 WebPushService(커넥션 풀, VAPID JWT 캐시)와 이벤트 루프를 유지하며,
+같은 학생은 항상 같은 워커로 보내진다. 결과는 부모 프로세스의 on_result로 다시 모인다.
+"""
+
+import os
+import zlib
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Callable
+
+from .push_subscription import SubscriptionRecord
+from .web_push_service import WebPushService, PreparedBroadcast, PushResult
+
+logger = logging.getLogger(__name__)
+
+# 워커 한 번 호출에 넘길 구독자 수
+PUSH_SHARD_CHUNK_SIZE = int(os.getenv("PUSH_SHARD_CHUNK_SIZE", "500"))
+
+# 워커 프로세스 전역 상태 (_shard_init에서 생성)
+_worker_service: Optional[WebPushService] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _shard_init():
+    """워커 프로세스 초기화 - 프로세스 수명 동안 유지되는 이벤트 루프와 전송 서비스 생성"""
+    global _worker_service, _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    # 워커 안에서는 추가 프로세스 풀 없이 직접 암호화
+    _worker_service = WebPushService(encrypt_mode="inline", shards=0)
+
+
+def _shard_deliver(
+    payload: bytes,
+    headers: Dict[str, str],
+    records: List[Optional[SubscriptionRecord]],
+    concurrency: Optional[int]
+) -> List[Optional[PushResult]]:
+    """워커 프로세스에서 한 묶음 전송 (결과는 records 순서)"""
+    broadcast = PreparedBroadcast.from_parts(payload, headers)
+    return _worker_loop.run_until_complete(
+        _worker_service.deliver_payload(broadcast, records, concurrency)
+    )
+
+
+def shard_of(key: Any, shards: int) -> int:
+    """키(student_id)를 샤드 번호로 변환 - 프로세스가 바뀌어도 같은 값인 crc32 사용"""
+    return zlib.crc32(str(key).encode("utf-8")) % shards
+
+
+class ShardedBroadcaster:
+    """샤드마다 단일 워커 프로세스 풀을 두고 구독자 묶음을 분배"""
+
+    def __init__(self, shards: int, chunk_size: int = PUSH_SHARD_CHUNK_SIZE):
+        self.shards = shards
+        self.chunk_size = max(1, chunk_size)
+        self._pools: List[Optional[ProcessPoolExecutor]] = [None] * shards
+
+    def _get_pool(self, shard: int) -> Optional[ProcessPoolExecutor]:
+        """샤드 워커 프로세스 (Lazy 생성, 생성할 수 없는 환경이면 None)"""
+        if self._pools[shard] is None:
+            try:
+                self._pools[shard] = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_shard_init
+                )
+            except Exception as e:
+                logger.warning(f"샤드 {shard} 워커 생성 실패, 현재 프로세스에서 전송: {e}")
+                return None
+        return self._pools[shard]
+
+    def shutdown(self):
+        for idx, pool in enumerate(self._pools):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pools[idx] = None
+
+    async def dispatch(
+        self,
+        service: WebPushService,
+        broadcast: PreparedBroadcast,
+        entries: AsyncIterator[Tuple[Any, Optional[SubscriptionRecord]]],
+        on_result: Callable[[Any, Optional[PushResult]], None],
+        concurrency: Optional[int] = None
+    ) -> None:
+        """
+        WebPushService._dispatch와 같은 계약으로 샤드 워커에 분배 전송
+
+        입력 스트림을 샤드별 버퍼에 모아 chunk_size마다 워커에 넘긴다. 워커당 진행 중인 묶음은
+        최대 2개로 제한하므로 입력이 길어도 메모리 사용이 일정하다. 워커가 죽은 묶음은
+        현재 프로세스에서 다시 전송한다.
+        """
+        loop = asyncio.get_running_loop()
+        buffers: List[List[Tuple[Any, Optional[SubscriptionRecord]]]] = [[] for _ in range(self.shards)]
+        pending: Dict[asyncio.Future, Tuple[int, List[Tuple[Any, Optional[SubscriptionRecord]]]]] = {}
+        local: List[Tuple[Any, Optional[SubscriptionRecord]]] = []
+
+        def _submit(shard: int, chunk):
+            pool = self._get_pool(shard)
+            if pool is None:
+                local.extend(chunk)
+                return
+            try:
+                future = loop.run_in_executor(
+                    pool, _shard_deliver,
+                    broadcast.payload, broadcast.headers,
+                    [record for _, record in chunk], concurrency
+                )
+            except Exception as e:
+                logger.error(f"샤드 {shard} 워커 사용 불가, 현재 프로세스에서 전송: {e}")
+                self._pools[shard] = None
+                pool.shutdown(wait=False, cancel_futures=True)
+                local.extend(chunk)
+                return
+            pending[future] = (shard, chunk)
+
+        async def _collect(return_when):
+            done, _ = await asyncio.wait(pending.keys(), return_when=return_when)
+            for future in done:
+                shard, chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"샤드 {shard} 전송 실패, 현재 프로세스에서 재전송: {e}")
+                    if self._pools[shard] is not None:
+                        self._pools[shard].shutdown(wait=False, cancel_futures=True)
+                        self._pools[shard] = None
+                    local.extend(chunk)
+                    continue
+                for (key, _), result in zip(chunk, results):
+                    on_result(key, result)
+
+        async for key, record in entries:
+            shard = shard_of(key, self.shards)
+            buffers[shard].append((key, record))
+            if len(buffers[shard]) < self.chunk_size:
+                continue
+            if len(pending) >= self.shards * 2:
+                await _collect(asyncio.FIRST_COMPLETED)
+            _submit(shard, buffers[shard])
+            buffers[shard] = []
+
+        for shard, chunk in enumerate(buffers):
+            if chunk:
+                _submit(shard, chunk)
+
+        while pending:
+            await _collect(asyncio.ALL_COMPLETED)
+
+        if local:
+            async def _local_entries():
+                for entry in local:
+                    yield entry
+
+            await service._dispatch_local(broadcast, _local_entries(), on_result, concurrency)
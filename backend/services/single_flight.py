@@ -0,0 +1,69 @@
+"""
+같은 읽기 요청 합치기 (single-flight)
+예매 오픈 공지 직후처럼 같은 조회가 한꺼번에 몰릴 때, 워커(프로세스) 안에서 진행 중인 같은 키의 DB 호출이
+있으면 새로 호출하지 않고 그 결과를 함께 받는다. 결과를 보관하지는 않으므로(캐시 아님) 호출이 끝난 뒤
+들어온 요청은 다시 조회한다. DB 부하는 클라이언트 수가 아니라 워커 수에 비례하게 된다.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, Callable, Awaitable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+class SingleFlight:
+    """
+    키별 진행 중인 호출 공유
+
+    do(key, fn)은 같은 key의 호출이 진행 중이면 그 결과(또는 예외)를 기다려 반환하고, 없으면 fn()을 실행한다.
+    호출은 별도 태스크로 실행되어, 처음 요청한 클라이언트가 끊겨도 함께 기다리는 요청에는 영향이 없다.
+    """
+
+    def __init__(self, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.calls = 0  # 실제로 실행한 호출 수
+        self.shared = 0  # 진행 중인 호출에 합류한 요청 수
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled:
+            return await fn()
+
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            # 기다리던 요청들이 각자 예외를 받으므로 여기서는 기록만
+            logger.debug(f"single-flight 호출 실패 ({key}): {task.exception()}")
+
+    def forget(self, key: str):
+        """데이터가 바뀐 경우 진행 중인 호출에 더 이상 합류하지 않도록 함 (다음 요청은 새로 조회)"""
+        self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "shared": self.shared
+        }
+
+
+# 전역 인스턴스
+single_flight = SingleFlight()
@@ -0,0 +1,231 @@
+"""
+예매 대기열 (가상 대기실)
+노선 오픈 직후 몰리는 예매 요청에 대기 번호표를 발급하고, DB가 감당할 수 있는 속도로
+도착 순서대로 처리. 클라이언트는 번호표 상태 조회 API로 순번과 결과를 확인
+
+번호표는 프로세스 메모리에만 있으므로 워커 프로세스 하나(uvicorn --workers 1)로 실행할 때만 동작한다.
+워커가 여러 개이거나 서버리스(Vercel)면 번호표 조회가 다른 프로세스로 가서 404가 되고, 순번도 워커별로
+따로 매겨진다. 프로세스가 재시작되면 대기 중인 번호표는 사라진다.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Awaitable, Deque
+
+logger = logging.getLogger(__name__)
+
+# 대기열 설정 (환경 변수로 조정 가능)
+BOOKING_WAITING_ROOM = os.getenv("BOOKING_WAITING_ROOM", "false").lower() == "true"
+BOOKING_QUEUE_RATE = float(os.getenv("BOOKING_QUEUE_RATE", "50"))  # 초당 처리할 예매 수
+BOOKING_QUEUE_CONCURRENCY = int(os.getenv("BOOKING_QUEUE_CONCURRENCY", "10"))  # 동시에 처리할 예매 수
+BOOKING_QUEUE_MAX = int(os.getenv("BOOKING_QUEUE_MAX", "10000"))  # 최대 대기 인원
+BOOKING_TICKET_TTL = float(os.getenv("BOOKING_TICKET_TTL", "600"))  # 처리 끝난 번호표 보관 시간 (초)
+
+
+class WaitingRoomFull(Exception):
+    """대기 인원이 BOOKING_QUEUE_MAX를 넘은 경우"""
+
+
+@dataclass
+class Ticket:
+    """대기 번호표"""
+    id: str
+    seq: int
+    key: str
+    request: Any
+    status: str = "waiting"  # waiting | processing | done | failed
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+class WaitingRoom:
+    """
+    도착 순서대로 예매를 처리하는 대기열
+
+    process(request)는 예매 결과 dict를 반환하거나 예외를 던진다. 예외에 status_code/detail
+    속성이 있으면(HTTPException) 그대로 번호표에 기록한다.
+    """
+
+    def __init__(
+        self,
+        process: Optional[Callable[[Any], Awaitable[Dict[str, Any]]]] = None,
+        enabled: bool = BOOKING_WAITING_ROOM,
+        rate: float = BOOKING_QUEUE_RATE,
+        concurrency: int = BOOKING_QUEUE_CONCURRENCY,
+        max_size: int = BOOKING_QUEUE_MAX
+    ):
+        self.process = process
+        self.enabled = enabled
+        self.rate = max(0.1, rate)
+        self.concurrency = max(1, concurrency)
+        self.max_size = max_size
+        self._tickets: "OrderedDict[str, Ticket]" = OrderedDict()
+        self._waiting_keys: Dict[str, str] = {}
+        # 대기 중인 번호표 - 처리 루프가 아니라 대기열이 보관하므로 루프가 다시 시작되어도 그대로 남음
+        self._waiting: Deque[Ticket] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._handling: set = set()  # 처리 중인 예매 태스크 (루프가 멈춰도 끝까지 실행되도록 참조 유지)
+        self._issued = 0  # 발급한 번호표 수
+        self._served = 0  # 처리를 시작한 번호표 수
+
+    def position(self, ticket: Ticket) -> int:
+        """앞에 남은 대기 인원 (0이면 다음 차례 또는 처리 중)"""
+        if ticket.status != "waiting":
+            return 0
+        return max(0, ticket.seq - self._served)
+
+    def enqueue(self, key: str, request: Any) -> Ticket:
+        """
+        번호표 발급 - 같은 key(학번+노선)로 이미 대기 중이면 기존 번호표 반환
+
+        Raises:
+            WaitingRoomFull: 대기 인원 초과
+        """
+        existing_id = self._waiting_keys.get(key)
+        if existing_id is not None and existing_id in self._tickets:
+            return self._tickets[existing_id]
+
+        self._purge()
+        if self._issued - self._served >= self.max_size:
+            raise WaitingRoomFull()
+
+        ticket = Ticket(id=uuid.uuid4().hex, seq=self._issued, key=key, request=request)
+        self._issued += 1
+        self._tickets[ticket.id] = ticket
+        self._waiting_keys[key] = ticket.id
+        self._waiting.append(ticket)
+        self._start()
+        self._wakeup.set()
+        return ticket
+
+    def get(self, ticket_id: str) -> Optional[Ticket]:
+        # 처리 루프가 멈춘 채 대기 중인 번호표가 있으면 상태 조회 때 다시 시작
+        if self._waiting:
+            self._start()
+        return self._tickets.get(ticket_id)
+
+    def to_dict(self, ticket: Ticket) -> Dict[str, Any]:
+        return {
+            "ticket_id": ticket.id,
+            "status": ticket.status,
+            "position": self.position(ticket),
+            "result": ticket.result,
+            "error": ticket.error,
+            "error_status": ticket.error_status
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "waiting": self._issued - self._served,
+            "issued": self._issued,
+            "rate": self.rate,
+            "concurrency": self.concurrency
+        }
+
+    def _purge(self):
+        """보관 기간이 지난 완료 번호표 정리 (발급 순서대로 저장되어 있음)"""
+        cutoff = time.time() - BOOKING_TICKET_TTL
+        for ticket_id in list(self._tickets):
+            ticket = self._tickets[ticket_id]
+            if ticket.status in ("waiting", "processing"):
+                break
+            if ticket.finished_at is not None and ticket.finished_at < cutoff:
+                del self._tickets[ticket_id]
+            else:
+                break
+
+    def _start(self):
+        """
+        처리 루프 시작 (첫 번호표 발급 시, 루프가 멈췄으면 다시)
+        대기 중인 번호표와 처리 중인 예매 수(세마포어)는 유지하고 루프만 새로 만든다.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 이벤트 루프가 바뀐 경우(테스트 등)에만 동기화 객체를 새로 만듦
+            if self._loop is None and int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+                logger.warning("⚠️ 예매 대기열은 워커 프로세스 하나에서만 동작합니다 (WEB_CONCURRENCY > 1)")
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._wakeup = asyncio.Event()
+        if self._waiting:
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._stopped)
+        logger.info(
+            f"🎫 예매 대기열 처리 시작 (초당 {self.rate}건, 동시 {self.concurrency}건, 대기 {len(self._waiting)}명)"
+        )
+
+    def _stopped(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            # 대기 중인 번호표는 남아 있으므로 다음 발급/상태 조회 때 이어서 처리
+            logger.error(f"예매 대기열 처리 루프 중단: {task.exception()}", exc_info=task.exception())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _handle(self, ticket: Ticket, semaphore: asyncio.Semaphore):
+        try:
+            ticket.result = await self.process(ticket.request)
+            ticket.status = "done"
+        except Exception as e:
+            ticket.status = "failed"
+            ticket.error = str(getattr(e, "detail", e))
+            ticket.error_status = getattr(e, "status_code", 500)
+        finally:
+            ticket.finished_at = time.time()
+            ticket.request = None
+            semaphore.release()
+
+    async def _run(self):
+        """초당 rate건, 동시 concurrency건까지 도착 순서대로 처리"""
+        semaphore = self._semaphore
+        interval = 1.0 / self.rate
+        next_at = time.monotonic()
+        while True:
+            if not self._waiting:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await semaphore.acquire()
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    semaphore.release()
+                    raise
+            next_at = max(next_at, time.monotonic() - 1.0) + interval
+
+            # 차례가 된 뒤에 꺼내므로 그 전에 루프가 멈춰도 번호표는 대기열 맨 앞에 남음
+            ticket = self._waiting.popleft()
+            self._served += 1
+            if self._waiting_keys.get(ticket.key) == ticket.id:
+                del self._waiting_keys[ticket.key]
+            ticket.status = "processing"
+            task = asyncio.create_task(self._handle(ticket, semaphore))
+            self._handling.add(task)
+            task.add_done_callback(self._handling.discard)
+
+
+# 전역 인스턴스 (처리 함수는 bookings 라우트에서 연결)
+waiting_room = WaitingRoom()
@@ -5,17 +5,303 @@ import json
 import logging
 import time
 import base64
-import requests
-from typing import List, Dict, Any, Optional
+import asyncio
+import multiprocessing
+import urllib.parse
+import email.utils
+import hashlib
+import httpx
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Awaitable, Callable, Union
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.backends import default_backend
 from http_ece import encrypt
 
+from backend.repositories import user_repository, push_interest_repository
+from .push_subscription import SubscriptionRecord, normalize_subscription, subscription_cache
+
 logger = logging.getLogger(__name__)
 
+# 동시 전송 설정 (환경 변수로 조정 가능)
+PUSH_CONCURRENCY = int(os.getenv("PUSH_CONCURRENCY", "50"))
+PUSH_MAX_CONNECTIONS = int(os.getenv("PUSH_MAX_CONNECTIONS", "100"))
+PUSH_HTTP_TIMEOUT = float(os.getenv("PUSH_HTTP_TIMEOUT", "10"))
+
+# 같은 노선 오픈 알림을 다시 보내지 않는 시간 (초)
+BROADCAST_DEBOUNCE_SECONDS = float(os.getenv("BROADCAST_DEBOUNCE_SECONDS", "60"))
+
+# 브로드캐스트 대상 조회 시 한 페이지당 사용자 수
+SUBSCRIBER_PAGE_SIZE = int(os.getenv("SUBSCRIBER_PAGE_SIZE", "1000"))
+
+# 만료 구독 정리 시 한 번의 UPDATE에 포함할 student_id 수 (PostgREST URL 길이 제한 고려)
+EXPIRED_CLEANUP_CHUNK_SIZE = int(os.getenv("EXPIRED_CLEANUP_CHUNK_SIZE", "200"))
+
+# VAPID JWT 유효 기간 및 재서명 여유 시간 (초)
+VAPID_TOKEN_TTL = int(os.getenv("VAPID_TOKEN_TTL", str(12 * 3600)))
+VAPID_TOKEN_REFRESH_MARGIN = int(os.getenv("VAPID_TOKEN_REFRESH_MARGIN", "600"))
+
+# 페이로드 암호화 단계 설정
+# PUSH_ENCRYPT_MODE=process 이면 대량 전송 시 프로세스 풀에서 암호화, inline 이면 이벤트 루프 스레드에서 암호화
+PUSH_ENCRYPT_MODE = os.getenv("PUSH_ENCRYPT_MODE", "process").lower()
+PUSH_ENCRYPT_BATCH_SIZE = int(os.getenv("PUSH_ENCRYPT_BATCH_SIZE", "64"))
+PUSH_ENCRYPT_WORKERS = int(os.getenv("PUSH_ENCRYPT_WORKERS", "0"))  # 0이면 CPU 수에 맞춤
+
+# 푸시 서비스 호스트(origin)별 속도 조절
+# PUSH_HOST_CONCURRENCY: 호스트별 동시 전송 수, PUSH_HOST_RATE: 호스트별 초당 최대 전송 수
+# PUSH_HOST_LIMITS: 호스트별 재정의 (예: "web.push.apple.com=20:200,fcm.googleapis.com=100:1000")
+PUSH_HOST_CONCURRENCY = int(os.getenv("PUSH_HOST_CONCURRENCY", "30"))
+PUSH_HOST_RATE = float(os.getenv("PUSH_HOST_RATE", "500"))
+PUSH_HOST_MIN_RATE = float(os.getenv("PUSH_HOST_MIN_RATE", "5"))
+PUSH_HOST_LIMITS = os.getenv("PUSH_HOST_LIMITS", "")
+# 호스트별 전송 대기열 최대 길이 (느린 호스트가 다른 호스트 전송을 막지 않도록 버퍼링)
+PUSH_HOST_BACKLOG = int(os.getenv("PUSH_HOST_BACKLOG", "2000"))
+
+# 샤딩 브로드캐스트 워커 프로세스 수 (0/1이면 사용 안 함, 상시 실행 서버 전용)
+PUSH_SHARDS = int(os.getenv("PUSH_SHARDS", "0"))
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+@dataclass
+class PushResult:
+    """단일 푸시 전송 결과"""
+    status_code: int = 0  # 0이면 요청 전 단계에서 실패
+    error: Optional[str] = None
+    retry_after: Optional[float] = None  # Retry-After 헤더 (초)
+    transient: bool = False  # 네트워크 오류 등 재시도하면 성공할 수 있는 로컬 오류
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code in (200, 201, 202)
+
+    @property
+    def expired(self) -> bool:
+        """구독이 더 이상 유효하지 않음 (404 Not Found / 410 Gone)"""
+        return self.status_code in (404, 410)
+
+    @property
+    def retryable(self) -> bool:
+        """스로틀링/서버 오류/일시적 오류로 나중에 다시 보낼 수 있는지"""
+        return (
+            self.transient
+            or self.status_code in (401, 403, 429)
+            or self.status_code >= 500
+        )
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date)를 초 단위로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_host_limits(value: str) -> Dict[str, Tuple[int, float]]:
+    """PUSH_HOST_LIMITS 파싱 - {호스트: (동시 전송 수, 초당 전송 수)}"""
+    limits = {}
+    for item in value.split(","):
+        host, _, spec = item.strip().partition("=")
+        if not host or not spec:
+            continue
+        try:
+            concurrency, _, rate = spec.partition(":")
+            limits[host.strip()] = (
+                int(concurrency) if concurrency else PUSH_HOST_CONCURRENCY,
+                float(rate) if rate else PUSH_HOST_RATE
+            )
+        except ValueError:
+            logger.warning(f"PUSH_HOST_LIMITS 항목 무시: {item}")
+    return limits
+
+
+class HostLane:
+    """
+    푸시 서비스 호스트 하나의 전송 차선 - 동시 전송 수 제한 + AIMD 토큰 버킷
+    
+    429/503을 받으면 초당 전송 수를 절반으로 줄이고(Retry-After가 있으면 그동안 멈춤),
+    성공할 때마다 조금씩 최대치까지 되돌린다. 브로드캐스트가 끝나도 유지되어 다음 전송에 반영된다.
+    """
+    
+    def __init__(self, host: str, concurrency: int, max_rate: float):
+        self.host = host
+        self.concurrency = max(1, concurrency)
+        self.max_rate = max(PUSH_HOST_MIN_RATE, max_rate)
+        self.rate = self.max_rate
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프용 동시 전송 제한"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+    
+    async def wait_for_token(self):
+        """토큰 버킷에서 전송 한 건을 허가받을 때까지 대기"""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            # 버스트는 1초 분량까지 허용
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def feedback(self, result: Optional[PushResult]):
+        """전송 결과로 속도 조절 (스로틀링이면 감소, 성공이면 증가)"""
+        if result is None:
+            return
+        if result.status_code in (429, 503):
+            self.rate = max(PUSH_HOST_MIN_RATE, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if result.retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + result.retry_after)
+            logger.warning(f"⚠️ {self.host} 스로틀링 ({result.status_code}) - 초당 {self.rate:.1f}건으로 감소")
+        elif result.ok and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + max(1.0, self.max_rate * 0.01))
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"concurrency": self.concurrency, "rate": round(self.rate, 1), "max_rate": self.max_rate}
+
+
+def _cpu_count() -> int:
+    """현재 프로세스가 사용할 수 있는 CPU 수"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def build_payload(title: str, body: str, data: Optional[Dict[str, str]] = None) -> bytes:
+    """알림 페이로드 JSON 직렬화"""
+    payload_dict = {
+        "title": title,
+        "body": body,
+        "icon": "/vite.svg",
+        "badge": "/vite.svg",
+        "vibrate": [200, 100, 200],
+        "data": data or {},
+        "requireInteraction": True
+    }
+    return json.dumps(payload_dict, ensure_ascii=False).encode('utf-8')
+
+
+def make_topic(key: str) -> str:
+    """
+    푸시 Topic 헤더 값 생성 - 같은 Topic의 대기 중인 메시지는 푸시 서비스가 최신 것으로 교체
+    (RFC 8030: URL-safe base64 문자 32자 이하)
+    """
+    digest = hashlib.sha256(key.encode('utf-8')).digest()[:24]
+    return base64.urlsafe_b64encode(digest).decode()
+
+
+class PreparedBroadcast:
+    """
+    브로드캐스트 한 건 - 페이로드 직렬화와 공통 푸시 헤더를 한 번만 계산해 모든 수신자에 재사용
+    
+    Args:
+        topic: 메시지 교체 키 (예: "route-open:ROUTE_001"), 지정 시 Topic 헤더 설정
+        urgency: very-low / low / normal / high
+        ttl: 푸시 서비스 보관 시간 (초)
+    """
+    
+    def __init__(
+        self,
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        topic: Optional[str] = None,
+        urgency: str = "normal",
+        ttl: int = 86400
+    ):
+        headers = {
+            'TTL': str(ttl),
+            'Urgency': urgency
+        }
+        if topic:
+            headers['Topic'] = make_topic(topic)
+        self.payload = build_payload(title, body, data)
+        self.headers = headers
+    
+    @classmethod
+    def from_parts(cls, payload: bytes, headers: Dict[str, str]) -> "PreparedBroadcast":
+        """저장해 둔 페이로드/헤더로 복원 (Outbox 워커용)"""
+        broadcast = cls.__new__(cls)
+        broadcast.payload = payload
+        broadcast.headers = dict(headers)
+        return broadcast
+
+
+def encrypt_payload(payload: bytes, p256dh: bytes, auth: bytes) -> bytes:
+    """디코딩된 구독자 키로 페이로드 aes128gcm 암호화 (임시 EC 키 + ECDH)"""
+    temp_private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    return encrypt(
+        payload,
+        salt=None,
+        private_key=temp_private_key,
+        dh=p256dh,
+        auth_secret=auth,
+        version="aes128gcm"
+    )
+
+
+def _encrypt_batch(payload: bytes, keys: List[Optional[Tuple[bytes, bytes]]]) -> List[Optional[bytes]]:
+    """프로세스 풀 워커에서 실행되는 배치 암호화 (키가 없거나 실패한 항목은 None)"""
+    results = []
+    for key in keys:
+        try:
+            results.append(encrypt_payload(payload, *key) if key else None)
+        except Exception:
+            results.append(None)
+    return results
+
+
+def _record_keys(record: Optional[SubscriptionRecord]) -> Optional[Tuple[bytes, bytes]]:
+    return (record.p256dh, record.auth) if record is not None else None
+
+
+def _as_record(subscription: Union[SubscriptionRecord, Dict[str, Any], str]) -> Optional[SubscriptionRecord]:
+    """구독 정보(dict/JSON 문자열)를 캐시를 거쳐 SubscriptionRecord로 변환 - 잘못된 구독은 None"""
+    if isinstance(subscription, SubscriptionRecord):
+        return subscription
+    try:
+        return subscription_cache.get(subscription)
+    except (ValueError, TypeError) as e:
+        logger.error(f"구독 정보가 올바르지 않습니다: {e}")
+        return None
+
+
 class WebPushService:
-    def __init__(self):
+    def __init__(
+        self,
+        concurrency: int = PUSH_CONCURRENCY,
+        encrypt_mode: str = PUSH_ENCRYPT_MODE,
+        shards: int = PUSH_SHARDS
+    ):
         """Web Push 서비스 초기화 (Lazy loading)"""
         self._vapid_private_key = None
         self._initialized = False
@@ -23,6 +309,24 @@ class WebPushService:
         self.vapid_claims = {
             "sub": "mailto:admin@schoolbus.com"
         }
+        self.concurrency = max(1, concurrency)
+        # 이벤트 루프별 keep-alive 커넥션 풀 (Lazy 생성)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop = None
+        # audience(푸시 서비스 origin)별 VAPID JWT 캐시: {aud: (token, exp)}
+        self._vapid_token_cache: Dict[str, Tuple[str, int]] = {}
+        # 대량 전송용 암호화 프로세스 풀 (Lazy 생성, "inline"이면 사용 안 함)
+        self.encrypt_mode = encrypt_mode
+        self._encrypt_pool: Optional[ProcessPoolExecutor] = None
+        self._encrypt_workers = 0  # 암호화 프로세스 풀 워커 수 (풀 생성 시 기록)
+        # student_id 해시로 나눠 여러 워커 프로세스에서 전송 (Lazy 생성)
+        self.shards = shards
+        self._sharder = None
+        # 푸시 서비스 호스트별 전송 차선 (동시 전송 수 + 적응형 속도)
+        self._host_limits = _parse_host_limits(PUSH_HOST_LIMITS)
+        self._host_lanes: Dict[str, HostLane] = {}
+        # 브로드캐스트 키별 마지막 전송 시각 (디바운스용)
+        self._recent_broadcasts: Dict[str, float] = {}
     
     def _ensure_initialized(self):
         """VAPID 키를 실제 사용 시점에 로드 (Lazy initialization)"""
@@ -58,6 +362,119 @@ class WebPushService:
         self._ensure_initialized()
         return self._vapid_private_key
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프에 묶인 공유 AsyncClient 반환 (커넥션 재사용)"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._http_client is None
+            or self._http_client.is_closed
+            or self._http_client_loop is not loop
+        ):
+            self._http_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                timeout=PUSH_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=PUSH_MAX_CONNECTIONS,
+                    max_keepalive_connections=PUSH_MAX_CONNECTIONS,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            self._http_client_loop = loop
+        return self._http_client
+    
+    def _get_vapid_token(self, audience: str) -> str:
+        """audience별 VAPID JWT 반환 - 만료 여유 시간 전까지 재사용하고 이후 재서명"""
+        now = int(time.time())
+        cached = self._vapid_token_cache.get(audience)
+        if cached and cached[1] - VAPID_TOKEN_REFRESH_MARGIN > now:
+            return cached[0]
+        
+        exp = now + VAPID_TOKEN_TTL
+        token = self._sign_vapid_token(audience, exp)
+        self._vapid_token_cache[audience] = (token, exp)
+        return token
+    
+    def _sign_vapid_token(self, audience: str, exp: int) -> str:
+        """VAPID JWT 생성 (ES256 서명)"""
+        payload_data = {
+            "aud": audience,
+            "exp": exp,
+            "sub": self.vapid_claims.get("sub", "mailto:admin@schoolbus.com")
+        }
+        
+        header = {"alg": "ES256", "typ": "JWT"}
+        header_b64 = base64.urlsafe_b64encode(
+            json.dumps(header, separators=(',', ':')).encode()
+        ).decode().rstrip('=')
+        
+        payload_b64 = base64.urlsafe_b64encode(
+            json.dumps(payload_data, separators=(',', ':')).encode()
+        ).decode().rstrip('=')
+        
+        message = f"{header_b64}.{payload_b64}".encode()
+        signature = self.vapid_private_key.sign(message, ec.ECDSA(hashes.SHA256()))
+        signature_b64 = base64.urlsafe_b64encode(signature).decode().rstrip('=')
+        
+        return f"{header_b64}.{payload_b64}.{signature_b64}"
+    
+    def _get_encrypt_pool(self) -> Optional[ProcessPoolExecutor]:
+        """암호화 프로세스 풀 반환 - 생성할 수 없는 환경이면 inline 모드로 전환"""
+        if self.encrypt_mode != "process":
+            return None
+        if self._encrypt_pool is None:
+            workers = PUSH_ENCRYPT_WORKERS or _cpu_count()
+            try:
+                # 스레드가 있는 프로세스에서 fork는 위험하므로 spawn 사용
+                self._encrypt_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._encrypt_workers = workers
+                logger.info(f"암호화 프로세스 풀 생성: {workers}개 워커")
+            except (OSError, NotImplementedError) as e:
+                # 서버리스 환경 등 멀티프로세싱을 지원하지 않는 경우
+                logger.warning(f"암호화 프로세스 풀 생성 실패, inline 모드로 전환: {e}")
+                self.encrypt_mode = "inline"
+                return None
+        return self._encrypt_pool
+    
+    def _get_sharder(self):
+        """샤딩 브로드캐스터 반환 - shards가 2 미만이면 None"""
+        if self.shards < 2:
+            return None
+        if self._sharder is None:
+            from .sharded_broadcaster import ShardedBroadcaster
+            self._sharder = ShardedBroadcaster(self.shards)
+            logger.info(f"샤딩 브로드캐스트 사용: {self.shards}개 워커 프로세스")
+        return self._sharder
+    
+    def _get_host_lane(self, audience: str) -> HostLane:
+        """푸시 서비스 origin별 전송 차선 반환 (없으면 생성)"""
+        lane = self._host_lanes.get(audience)
+        if lane is None:
+            host = urllib.parse.urlparse(audience).hostname or audience
+            concurrency, rate = self._host_limits.get(host, (PUSH_HOST_CONCURRENCY, PUSH_HOST_RATE))
+            lane = HostLane(host, concurrency, rate)
+            self._host_lanes[audience] = lane
+        return lane
+    
+    def host_lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """호스트별 현재 동시 전송 제한과 초당 전송 수"""
+        return {lane.host: lane.stats() for lane in self._host_lanes.values()}
+    
+    async def aclose(self):
+        """커넥션 풀, 암호화 프로세스 풀, 샤드 워커 정리 (앱 종료 시 호출)"""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._http_client_loop = None
+        if self._encrypt_pool is not None:
+            self._encrypt_pool.shutdown(wait=False, cancel_futures=True)
+            self._encrypt_pool = None
+        if self._sharder is not None:
+            self._sharder.shutdown()
+            self._sharder = None
+    
     async def send_notification(
         self,
         subscription_info: Dict[str, Any],
@@ -66,135 +483,362 @@ class WebPushService:
         data: Optional[Dict[str, str]] = None
     ) -> bool:
         """단일 구독자에게 푸시 알림 전송 - http_ece 직접 암호화"""
+        result = await self._deliver(subscription_info, title, body, data)
+        return result.ok
+    
+    async def _deliver(
+        self,
+        subscription_info: Dict[str, Any],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None
+    ) -> PushResult:
+        """푸시 알림 암호화 및 전송 후 HTTP 상태를 포함한 결과 반환"""
         try:
-            endpoint = subscription_info.get('endpoint', '')
-            p256dh = subscription_info.get('keys', {}).get('p256dh', '')
-            auth = subscription_info.get('keys', {}).get('auth', '')
-            
-            if not all([endpoint, p256dh, auth]):
-                logger.error("구독 정보가 불완전합니다")
-                return False
-            
-            logger.info(f"📤 푸시 알림 전송 시도: {endpoint[:60]}...")
+            record = normalize_subscription(subscription_info)
+        except ValueError as e:
+            logger.error(f"구독 정보가 올바르지 않습니다: {e}")
+            return PushResult(error="incomplete subscription")
+        
+        try:
+            payload = build_payload(title, body, data)
+            logger.debug(f"📦 페이로드 크기: {len(payload)} bytes")
+            encrypted = encrypt_payload(payload, record.p256dh, record.auth)
+        except Exception as e:
+            logger.error(f"❌ 페이로드 암호화 실패: {e}")
+            return PushResult(error=str(e))
+        
+        return await self._post(record, encrypted)
+    
+    async def _post(
+        self,
+        record: SubscriptionRecord,
+        encrypted: bytes,
+        push_headers: Optional[Dict[str, str]] = None
+    ) -> PushResult:
+        """암호화된 본문을 VAPID 인증과 함께 푸시 서비스로 전송 (push_headers: TTL/Urgency/Topic)"""
+        endpoint = record.endpoint
+        audience = record.audience
+        try:
+            logger.debug(f"📤 푸시 알림 전송 시도: {endpoint[:60]}...")
             
             if not self.vapid_private_key:
                 logger.error("VAPID 개인 키가 없습니다")
-                return False
-            
-            # 알림 페이로드 생성
-            payload_dict = {
-                "title": title,
-                "body": body,
-                "icon": "/vite.svg",
-                "badge": "/vite.svg",
-                "vibrate": [200, 100, 200],
-                "data": data or {},
-                "requireInteraction": True
-            }
-            payload = json.dumps(payload_dict, ensure_ascii=False).encode('utf-8')
-            
-            logger.info(f"📦 페이로드 크기: {len(payload)} bytes")
-            
-            # http_ece로 암호화 (임시 개인 키 생성)
-            # 임시 EC 키 쌍 생성
-            temp_private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
-            
-            encrypted = encrypt(
-                payload,
-                salt=None,
-                private_key=temp_private_key,
-                dh=base64.urlsafe_b64decode(p256dh + '=' * (4 - len(p256dh) % 4)),
-                auth_secret=base64.urlsafe_b64decode(auth + '=' * (4 - len(auth) % 4)),
-                version="aes128gcm"
-            )
-            
-            # VAPID JWT 생성
-            import urllib.parse
-            parsed = urllib.parse.urlparse(endpoint)
-            audience = f"{parsed.scheme}://{parsed.netloc}"
-            
-            payload_data = {
-                "aud": audience,
-                "exp": int(time.time()) + 86400,
-                "sub": self.vapid_claims.get("sub", "mailto:admin@schoolbus.com")
-            }
-            
-            header = {"alg": "ES256", "typ": "JWT"}
-            header_b64 = base64.urlsafe_b64encode(
-                json.dumps(header, separators=(',', ':')).encode()
-            ).decode().rstrip('=')
-            
-            payload_b64 = base64.urlsafe_b64encode(
-                json.dumps(payload_data, separators=(',', ':')).encode()
-            ).decode().rstrip('=')
+                return PushResult(error="missing VAPID key", transient=True)
             
-            message = f"{header_b64}.{payload_b64}".encode()
-            signature = self.vapid_private_key.sign(message, ec.ECDSA(hashes.SHA256()))
-            signature_b64 = base64.urlsafe_b64encode(signature).decode().rstrip('=')
-            
-            jwt_token = f"{header_b64}.{payload_b64}.{signature_b64}"
+            # VAPID JWT (audience별 캐시)
+            jwt_token = self._get_vapid_token(audience)
             
             # HTTP 헤더
             headers = {
                 'TTL': '86400',
+                **(push_headers or {}),
                 'Content-Type': 'application/octet-stream',
                 'Content-Encoding': 'aes128gcm',
                 'Authorization': f'vapid t={jwt_token}, k={self.vapid_public_key}'
             }
             
-            # HTTP 요청 전송
-            response = requests.post(
+            # HTTP 요청 전송 (공유 커넥션 풀 사용, 이벤트 루프를 블로킹하지 않음)
+            response = await self._get_http_client().post(
                 endpoint,
-                data=encrypted,
-                headers=headers,
-                timeout=10
+                content=encrypted,
+                headers=headers
             )
             
-            logger.info(f"📡 HTTP 응답: {response.status_code}")
+            logger.debug(f"📡 HTTP 응답: {response.status_code}")
             
-            if response.status_code in [200, 201, 202]:
-                logger.info("✅ 푸시 알림 전송 성공")
-                return True
+            result = PushResult(
+                status_code=response.status_code,
+                retry_after=_parse_retry_after(response.headers.get('Retry-After'))
+            )
+            if result.ok:
+                logger.debug("✅ 푸시 알림 전송 성공")
             elif response.status_code in [400, 404, 410, 413]:
                 logger.warning(f"⚠️ 클라이언트 오류 ({response.status_code})")
                 logger.warning(f"응답: {response.text}")
-                return False
+                result.error = response.text
+            elif response.status_code in [401, 403]:
+                # 푸시 서비스가 JWT를 거부한 경우 다음 전송에서 재서명
+                logger.error(f"⚠️ VAPID 인증 실패 ({response.status_code}): {response.text}")
+                self._vapid_token_cache.pop(audience, None)
+                result.error = response.text
             else:
                 logger.error(f"⚠️ 서버 오류 ({response.status_code}): {response.text}")
-                return False
+                result.error = response.text
+            return result
                 
         except Exception as e:
             logger.error(f"❌ 푸시 알림 전송 실패: {e}")
             import traceback
             logger.error(f"상세 오류:\n{traceback.format_exc()}")
-            return False
+            return PushResult(error=str(e), transient=True)
+    
+    async def _encrypted_stream(
+        self,
+        payload: bytes,
+        entries: AsyncIterator[Tuple[Any, Optional[SubscriptionRecord]]]
+    ) -> AsyncIterator[Tuple[Any, Optional[SubscriptionRecord], Optional[bytes]]]:
+        """
+        암호화 단계 - (키, 구독 정보, 암호화된 본문)을 완료되는 순서대로 생성
+        
+        입력 스트림에서 구독자를 PUSH_ENCRYPT_BATCH_SIZE 단위로 묶어 프로세스 풀에서 암호화하고,
+        배치가 끝나는 즉시 전송 단계로 넘긴다. 첫 배치도 채우지 못하는 소량 전송이거나
+        inline 모드면 직접 암호화한다.
+        """
+        entries = entries.__aiter__()
+        
+        # 첫 배치를 채워 본 뒤 프로세스 풀 사용 여부 결정
+        first_batch = []
+        async for entry in entries:
+            first_batch.append(entry)
+            if len(first_batch) >= PUSH_ENCRYPT_BATCH_SIZE:
+                break
+        
+        pool = None
+        if len(first_batch) >= PUSH_ENCRYPT_BATCH_SIZE:
+            pool = self._get_encrypt_pool()
+        
+        if pool is None:
+            async def _inline_entries():
+                for entry in first_batch:
+                    yield entry
+                async for entry in entries:
+                    yield entry
+            
+            async for key, record in _inline_entries():
+                encrypted = None
+                if record is not None:
+                    try:
+                        encrypted = encrypt_payload(payload, record.p256dh, record.auth)
+                    except Exception as e:
+                        logger.error(f"구독 {key} 암호화 실패: {e}")
+                yield key, record, encrypted
+                # 전송 태스크가 진행될 수 있도록 이벤트 루프에 양보
+                await asyncio.sleep(0)
+            return
+        
+        loop = asyncio.get_running_loop()
+        # 메모리 사용을 제한하기 위해 워커 수의 2배까지만 배치를 미리 제출
+        max_in_flight = max(1, self._encrypt_workers) * 2
+        pending: Dict[asyncio.Future, List[Tuple[Any, Optional[SubscriptionRecord]]]] = {}
+        
+        def _submit(batch: List[Tuple[Any, Optional[SubscriptionRecord]]]):
+            nonlocal pool
+            keys = [_record_keys(record) for _, record in batch]
+            try:
+                future = loop.run_in_executor(pool, _encrypt_batch, payload, keys)
+            except Exception as e:
+                # 풀이 깨진 경우 남은 배치는 기본 스레드 풀에서 처리
+                logger.error(f"암호화 프로세스 풀 사용 불가, 스레드로 대체: {e}")
+                if self._encrypt_pool is pool:
+                    # 다음 전송 때 새 풀을 생성
+                    self._encrypt_pool = None
+                    pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+                future = loop.run_in_executor(None, _encrypt_batch, payload, keys)
+            pending[future] = batch
+        
+        def _results(future: asyncio.Future):
+            batch = pending.pop(future)
+            try:
+                encrypted_batch = future.result()
+            except Exception as e:
+                # 워커 프로세스 오류 시 해당 배치는 inline으로 처리
+                logger.error(f"배치 암호화 실패, inline으로 재시도: {e}")
+                encrypted_batch = _encrypt_batch(
+                    payload, [_record_keys(record) for _, record in batch]
+                )
+            return [
+                (key, record, encrypted)
+                for (key, record), encrypted in zip(batch, encrypted_batch)
+            ]
+        
+        _submit(first_batch)
+        batch = []
+        async for entry in entries:
+            batch.append(entry)
+            if len(batch) < PUSH_ENCRYPT_BATCH_SIZE:
+                continue
+            
+            # 제출 한도에 도달하면 먼저 끝난 배치를 전송 단계로 넘긴 뒤 제출
+            if len(pending) >= max_in_flight:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for item in _results(future):
+                        yield item
+            _submit(batch)
+            batch = []
+            
+            # 이미 끝난 배치는 입력을 더 읽기 전에 바로 넘김
+            for future in [f for f in pending if f.done()]:
+                for item in _results(future):
+                    yield item
+        
+        if batch:
+            _submit(batch)
+        
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                for item in _results(future):
+                    yield item
+    
+    async def _dispatch(
+        self,
+        broadcast: PreparedBroadcast,
+        entries: AsyncIterator[Tuple[Any, Optional[SubscriptionRecord]]],
+        on_result: Callable[[Any, Optional[PushResult]], None],
+        concurrency: Optional[int] = None
+    ) -> None:
+        """
+        전송 단계 진입점 - PUSH_SHARDS가 2 이상이면 키(student_id) 해시로 워커 프로세스에 분배하고,
+        아니면 현재 프로세스에서 전송한다. 샤딩 시 concurrency는 워커별 동시 전송 수.
+        """
+        sharder = self._get_sharder()
+        if sharder is not None:
+            await sharder.dispatch(self, broadcast, entries, on_result, concurrency)
+        else:
+            await self._dispatch_local(broadcast, entries, on_result, concurrency)
+    
+    async def _dispatch_local(
+        self,
+        broadcast: PreparedBroadcast,
+        entries: AsyncIterator[Tuple[Any, Optional[SubscriptionRecord]]],
+        on_result: Callable[[Any, Optional[PushResult]], None],
+        concurrency: Optional[int] = None
+    ) -> None:
+        """
+        전송 단계 - 암호화가 끝난 본문부터 동시 전송하고 결과마다 on_result(키, 결과) 호출
+        
+        구독자는 푸시 서비스 호스트별 대기열로 나뉘고, 호스트마다 자기 차선(HostLane)의
+        동시 전송 수와 속도에 맞춰 전송한다. 전체 동시 전송 수(concurrency)는 실제 요청 중에만
+        차지하므로 스로틀링된 호스트가 다른 호스트의 전송을 막지 않는다.
+        예기치 못한 예외로 결과가 없으면 None을 전달한다.
+        """
+        limit = max(1, concurrency or self.concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        queues: Dict[str, asyncio.Queue] = {}
+        workers = []
+        sends = set()  # 진행 중인 전송 (중단 시 취소하고 끝날 때까지 기다림)
+        
+        async def _send_one(lane: HostLane, key: Any, record: SubscriptionRecord, encrypted: bytes):
+            result = None
+            try:
+                async with semaphore:
+                    result = await self._post(record, encrypted, broadcast.headers)
+                lane.feedback(result)
+            except Exception as e:
+                logger.error(f"구독 {key} 전송 실패: {e}")
+            finally:
+                lane.semaphore.release()
+            on_result(key, result)
+        
+        async def _host_worker(lane: HostLane, queue: asyncio.Queue):
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                await lane.semaphore.acquire()
+                try:
+                    await lane.wait_for_token()
+                except BaseException:
+                    # 차선은 브로드캐스트가 끝나도 유지되므로 취소되어도 자리를 돌려줌
+                    lane.semaphore.release()
+                    raise
+                task = asyncio.create_task(_send_one(lane, *item))
+                sends.add(task)
+                task.add_done_callback(sends.discard)
+        
+        try:
+            async for key, record, encrypted in self._encrypted_stream(broadcast.payload, entries):
+                if record is None or encrypted is None:
+                    error = "incomplete subscription" if record is None else "encryption failed"
+                    on_result(key, PushResult(error=error))
+                    continue
+                
+                queue = queues.get(record.audience)
+                if queue is None:
+                    queue = asyncio.Queue(maxsize=PUSH_HOST_BACKLOG)
+                    queues[record.audience] = queue
+                    workers.append(asyncio.create_task(
+                        _host_worker(self._get_host_lane(record.audience), queue)
+                    ))
+                # 해당 호스트 대기열이 가득 차면 여기서 대기 (메모리 상한)
+                await queue.put((key, record, encrypted))
+            
+            for queue in queues.values():
+                await queue.put(None)
+            if workers:
+                await asyncio.gather(*workers)
+            if sends:
+                await asyncio.gather(*list(sends))
+        finally:
+            # 호출한 쪽이 취소되었거나 예외가 난 경우 남은 호스트 작업/전송을 취소하고 정리될 때까지 대기
+            pending = [task for task in [*workers, *sends] if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def deliver_payload(
+        self,
+        broadcast: PreparedBroadcast,
+        subscriptions: List[Union[SubscriptionRecord, Dict[str, Any], str]],
+        concurrency: Optional[int] = None
+    ) -> List[Optional[PushResult]]:
+        """
+        준비된 브로드캐스트를 여러 구독자에게 동시 전송하고 구독 순서대로 결과 반환
+        
+        구독은 SubscriptionRecord 또는 dict/JSON 문자열 (후자는 구독 캐시를 거쳐 변환)
+        """
+        results: List[Optional[PushResult]] = [None] * len(subscriptions)
+        
+        async def _entries():
+            for idx, subscription in enumerate(subscriptions):
+                yield idx, _as_record(subscription)
+        
+        def _on_result(idx: int, result: Optional[PushResult]):
+            results[idx] = result
+        
+        await self._dispatch(broadcast, _entries(), _on_result, concurrency)
+        return results
     
     async def send_to_multiple(
         self,
         subscriptions: List[Dict[str, Any]],
         title: str,
         body: str,
-        data: Optional[Dict[str, str]] = None
+        data: Optional[Dict[str, str]] = None,
+        concurrency: Optional[int] = None
     ) -> Dict[str, int]:
-        """여러 구독자에게 푸시 알림 전송"""
+        """
+        여러 구독자에게 푸시 알림 동시 전송
+        
+        Args:
+            concurrency: 동시 전송 수 제한 (기본값: PUSH_CONCURRENCY, 1이면 순차 전송)
+        """
+        started = time.monotonic()
+        broadcast = PreparedBroadcast(title, body, data)
+        results = await self.deliver_payload(broadcast, subscriptions, concurrency)
+        
         success_count = 0
         failure_count = 0
         expired_subscriptions = []
         
-        for idx, subscription in enumerate(subscriptions):
-            try:
-                result = await self.send_notification(subscription, title, body, data)
-                if result:
-                    success_count += 1
-                else:
-                    failure_count += 1
-                    # 만료된 구독 추적
-                    expired_subscriptions.append(idx)
-            except Exception as e:
-                logger.error(f"구독 {idx} 전송 실패: {e}")
+        for idx, result in enumerate(results):
+            if result is not None and result.ok:
+                success_count += 1
+            else:
                 failure_count += 1
+                if result is not None and result.expired:
+                    # 만료된 구독 추적 (404/410만 - 5xx 등 일시적 오류는 구독 유지)
+                    expired_subscriptions.append(idx)
         
-        logger.info(f"멀티캐스트 완료: 성공 {success_count}, 실패 {failure_count}")
+        logger.info(
+            f"멀티캐스트 완료: 성공 {success_count}, 실패 {failure_count} "
+            f"({time.monotonic() - started:.2f}s, 동시성 {max(1, concurrency or self.concurrency)}, "
+            f"암호화 {self.encrypt_mode})"
+        )
         
         return {
             "success_count": success_count,
@@ -202,48 +846,210 @@ class WebPushService:
             "expired_subscriptions": expired_subscriptions
         }
     
+    @staticmethod
+    def _iter_subscription_rows(rows: List[Dict[str, Any]]):
+        """조회한 행에서 (student_id, SubscriptionRecord) 생성 - 파싱/키 디코딩은 캐시에서 한 번만"""
+        for user in rows:
+            raw = user.get("push_subscription")
+            if not raw:
+                continue
+            try:
+                record = subscription_cache.get(raw)
+            except ValueError as e:
+                logger.error(f"구독 정보 파싱 실패 ({user['student_id']}): {e}")
+                continue
+            yield user["student_id"], record
+    
+    async def _iter_pages(
+        self,
+        fetch: Callable[[Optional[str]], Awaitable[List[Dict[str, Any]]]],
+        cursor_key: str,
+        page_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        keyset 페이지네이션 공통 루프 - fetch(마지막 키)로 페이지를 읽고
+        현재 페이지를 넘기는 동안 다음 페이지를 미리 요청한다.
+        """
+        next_page = asyncio.create_task(fetch(None))
+        try:
+            while True:
+                rows = await next_page
+                next_page = None
+                if len(rows) >= page_size:
+                    next_page = asyncio.create_task(fetch(rows[-1][cursor_key]))
+                yield rows
+                if next_page is None:
+                    break
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+    
+    async def iter_subscribers(
+        self,
+        page_size: int = SUBSCRIBER_PAGE_SIZE
+    ) -> AsyncIterator[Tuple[str, SubscriptionRecord]]:
+        """
+        알림이 활성화된 사용자의 (student_id, 구독 정보)를 페이지 단위로 생성
+        
+        users.id 기준 keyset 페이지네이션으로 조회하며, 현재 페이지를 넘기는 동안
+        다음 페이지를 미리 요청한다. 구독 정보는 구독 캐시를 거쳐 SubscriptionRecord로 꺼낸다.
+        """
+        async def _fetch(after_id: Optional[str]):
+            return await user_repository.list_push_subscribers(page_size, after_id)
+        
+        async for rows in self._iter_pages(_fetch, "id", page_size):
+            for entry in self._iter_subscription_rows(rows):
+                yield entry
+    
+    async def iter_interested_subscribers(
+        self,
+        route_id: Optional[str] = None,
+        bus_type: Optional[str] = None,
+        page_size: int = SUBSCRIBER_PAGE_SIZE
+    ) -> AsyncIterator[Tuple[str, SubscriptionRecord]]:
+        """
+        해당 노선(route_id) 또는 버스 종류(등교/하교)를 구독한 사용자만 페이지 단위로 생성
+        
+        push_interests와 users를 조인하여 한 번의 요청으로 구독 정보까지 가져온다.
+        student_id 기준 keyset 페이지네이션이므로 노선과 종류를 모두 구독한 학생도 한 번만 전송된다.
+        """
+        if not route_id and not bus_type:
+            return
+        
+        async def _fetch(after_student_id: Optional[str]):
+            return await push_interest_repository.list_subscribers(route_id, bus_type, page_size, after_student_id)
+        
+        last_student_id = None
+        async for rows in self._iter_pages(_fetch, "student_id", page_size):
+            users = []
+            for row in rows:
+                if row["student_id"] == last_student_id:
+                    continue
+                last_student_id = row["student_id"]
+                users.append(row)
+            for entry in self._iter_subscription_rows(users):
+                yield entry
+    
     async def send_to_all_users(
         self,
-        supabase_client,
         title: str,
         body: str,
-        data: Optional[Dict[str, str]] = None
+        data: Optional[Dict[str, str]] = None,
+        topic: Optional[str] = None,
+        urgency: str = "normal",
+        progress=None
     ) -> Dict[str, Any]:
-        """알림이 활성화된 모든 사용자에게 푸시 알림 전송"""
+        """
+        알림이 활성화된 모든 사용자에게 푸시 알림 전송
+        
+        구독자를 페이지 단위로 읽으면서 바로 전송하므로 전체 목록을 메모리에 올리지 않는다.
+        progress(BroadcastJob 등)를 넘기면 queued와 결과별 수를 실시간으로 기록한다.
+        """
+        return await self._broadcast(
+            self.iter_subscribers(),
+            PreparedBroadcast(title, body, data, topic=topic, urgency=urgency),
+            progress
+        )
+    
+    async def send_to_interested_users(
+        self,
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        route_id: Optional[str] = None,
+        bus_type: Optional[str] = None,
+        topic: Optional[str] = None,
+        urgency: str = "normal",
+        progress=None
+    ) -> Dict[str, Any]:
+        """해당 노선 또는 버스 종류(등교/하교)에 관심 등록한 사용자에게만 푸시 알림 전송"""
+        return await self._broadcast(
+            self.iter_interested_subscribers(route_id, bus_type),
+            PreparedBroadcast(title, body, data, topic=topic, urgency=urgency),
+            progress
+        )
+    
+    def should_broadcast(self, key: str, window: float = BROADCAST_DEBOUNCE_SECONDS) -> bool:
+        """
+        같은 키(예: 노선 오픈)의 브로드캐스트가 window초 안에 이미 있었으면 False
+        
+        관리자가 노선을 열고/닫고/다시 여는 경우 중복 알림을 막는다 (프로세스 단위).
+        """
+        now = time.monotonic()
+        last = self._recent_broadcasts.get(key)
+        if last is not None and now - last < window:
+            return False
+        self._recent_broadcasts[key] = now
+        # 오래된 항목 정리
+        if len(self._recent_broadcasts) > 1000:
+            self._recent_broadcasts = {
+                k: t for k, t in self._recent_broadcasts.items() if now - t < window
+            }
+        return True
+    
+    def forget_broadcast(self, key: str):
+        """should_broadcast로 기록한 키 삭제 - 알림 작업 등록에 실패한 경우 바로 다시 보낼 수 있도록"""
+        self._recent_broadcasts.pop(key, None)
+    
+    async def _broadcast(
+        self,
+        subscribers: AsyncIterator[Tuple[str, SubscriptionRecord]],
+        broadcast: PreparedBroadcast,
+        progress=None
+    ) -> Dict[str, Any]:
+        """
+        구독자 스트림에 페이로드 전송 후 만료된 구독 정리 (Outbox 모드면 작업 등록만)
+        
+        progress: queued 속성과 record(PushResult) 메서드를 가진 진행 상황 객체 (선택)
+        """
         try:
-            # Supabase에서 알림 활성화된 사용자의 push subscription 조회
-            response = supabase_client.table("users")\
-                .select("student_id, push_subscription")\
-                .eq("notification_enabled", True)\
-                .execute()
-            
-            if not response.data:
-                logger.warning("알림 활성화된 사용자가 없습니다")
+            # Outbox 모드: 작업만 등록하고 즉시 반환 (워커가 재시도하며 전송)
+            from .push_outbox import push_outbox
+            if push_outbox.enabled:
+                queued = 0
+                page = []
+                async for entry in subscribers:
+                    page.append(entry)
+                    if len(page) >= SUBSCRIBER_PAGE_SIZE:
+                        count = await push_outbox.enqueue(broadcast, page)
+                        queued += count
+                        if progress is not None:
+                            progress.queued += count
+                        page = []
+                count = await push_outbox.enqueue(broadcast, page)
+                queued += count
+                if progress is not None:
+                    progress.queued += count
+                push_outbox.start()
                 return {
                     "success_count": 0,
                     "failure_count": 0,
-                    "message": "No users to notify"
+                    "queued_count": queued
                 }
             
-            # push_subscription 추출 (None이 아닌 것만)
-            subscriptions = []
-            user_ids = []
+            started = time.monotonic()
+            counts = {"success": 0, "failure": 0}
+            expired_student_ids: List[str] = []
             
-            for user in response.data:
-                if user.get("push_subscription"):
-                    try:
-                        # JSON 문자열을 딕셔너리로 변환
-                        if isinstance(user["push_subscription"], str):
-                            subscription = json.loads(user["push_subscription"])
-                        else:
-                            subscription = user["push_subscription"]
-                        
-                        subscriptions.append(subscription)
-                        user_ids.append(user["student_id"])
-                    except json.JSONDecodeError as e:
-                        logger.error(f"구독 정보 파싱 실패 ({user['student_id']}): {e}")
+            async def _counted(entries):
+                async for entry in entries:
+                    if progress is not None:
+                        progress.queued += 1
+                    yield entry
             
-            if not subscriptions:
+            def _on_result(student_id: str, result: Optional[PushResult]):
+                if progress is not None:
+                    progress.record(result)
+                if result is not None and result.ok:
+                    counts["success"] += 1
+                else:
+                    counts["failure"] += 1
+                    if result is not None and result.expired:
+                        expired_student_ids.append(student_id)
+            
+            await self._dispatch(broadcast, _counted(subscribers), _on_result)
+            
+            if counts["success"] + counts["failure"] == 0:
                 logger.warning("유효한 push subscription이 없습니다")
                 return {
                     "success_count": 0,
@@ -251,34 +1057,39 @@ class WebPushService:
                     "message": "No valid subscriptions"
                 }
             
-            logger.info(f"{len(subscriptions)}명의 사용자에게 푸시 알림 전송 시도")
-            
-            # 멀티캐스트로 전송
-            result = await self.send_to_multiple(subscriptions, title, body, data)
+            logger.info(
+                f"브로드캐스트 완료: 성공 {counts['success']}, 실패 {counts['failure']}, "
+                f"만료 {len(expired_student_ids)} ({time.monotonic() - started:.2f}s)"
+            )
             
             # 만료된 구독 정보 정리
-            if result.get("expired_subscriptions"):
-                for idx in result["expired_subscriptions"]:
-                    student_id = user_ids[idx]
-                    try:
-                        # 만료된 구독 정보 삭제
-                        supabase_client.table("users")\
-                            .update({"push_subscription": None})\
-                            .eq("student_id", student_id)\
-                            .execute()
-                        logger.info(f"만료된 구독 정보 삭제: {student_id}")
-                    except Exception as e:
-                        logger.error(f"구독 정보 삭제 실패 ({student_id}): {e}")
+            if expired_student_ids:
+                await self.clear_expired_subscriptions(expired_student_ids)
             
-            return result
+            return {
+                "success_count": counts["success"],
+                "failure_count": counts["failure"],
+                "expired_count": len(expired_student_ids)
+            }
             
         except Exception as e:
-            logger.error(f"전체 사용자 알림 전송 실패: {e}")
+            logger.error(f"브로드캐스트 알림 전송 실패: {e}")
             return {
                 "success_count": 0,
                 "failure_count": 0,
                 "error": str(e)
             }
+    
+    async def clear_expired_subscriptions(self, student_ids: List[str]):
+        """만료된 구독 정보 삭제 - student_id 묶음 단위로 한 번에 업데이트"""
+        student_ids = list(dict.fromkeys(student_ids))
+        for start in range(0, len(student_ids), EXPIRED_CLEANUP_CHUNK_SIZE):
+            chunk = student_ids[start:start + EXPIRED_CLEANUP_CHUNK_SIZE]
+            try:
+                await user_repository.clear_push_subscriptions(chunk)
+                logger.info(f"만료된 구독 정보 {len(chunk)}건 삭제")
+            except Exception as e:
+                logger.error(f"구독 정보 삭제 실패 ({len(chunk)}건, {chunk[0]} 외): {e}")
 
 
 # 전역 인스턴스
@@ -100,8 +100,12 @@ function AdminPage() {
       // 푸시 알림 결과 확인
       if (toggleResponse.data.push_notification) {
         console.log('📱 푸시 알림 전송 결과:', toggleResponse.data.push_notification);
-        if (toggleResponse.data.push_notification.success_count > 0) {
-          alert(`✅ ${toggleResponse.data.push_notification.success_count}명에게 푸시 알림이 전송되었습니다!`);
+        if (toggleResponse.data.push_notification.job_id) {
+          // 알림 작업은 DB에 등록됨 - 서버리스에서 백그라운드 실행이 중단되어도 이 요청이 남은 작업을 이어서 전송
+          // (응답을 기다리지 않음, 진행 상황: /api/push/jobs/{job_id})
+          axios.post(`${API_BASE_URL}/api/push/jobs/run`)
+            .catch(err => console.error('푸시 알림 작업 실행 요청 실패:', err));
+          alert('✅ 푸시 알림 전송을 시작했습니다!');
         }
       }
 
@@ -8,6 +8,10 @@ import './Home.css'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL !== undefined ? import.meta.env.VITE_API_URL : 'http://localhost:8000'
 
+// 예약 확정 요청의 Idempotency-Key
+const createIdempotencyKey = () =>
+  crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+
 // 에러 바운더리 컴포넌트
 class ErrorBoundary extends Component {
   constructor(props) {
@@ -60,11 +64,55 @@ function HomeContent({ isLoggedIn }) {
   const [reservationStep, setReservationStep] = useState('list') // 'list', 'selectSeats', 'confirm'
   const [selectedRoute, setSelectedRoute] = useState(null)
   const [seatCount, setSeatCount] = useState(1)
+  const [bookingKey, setBookingKey] = useState(null) // 예약 확정 Idempotency-Key (재시도에도 같은 키 사용)
 
   const [notificationPermission, setNotificationPermission] = useState('default')
   const [isNotificationEnabled, setIsNotificationEnabled] = useState(false)
   const [pushTokenInfo, setPushTokenInfo] = useState(null) // 푸시 토큰 정보
   const [currentStudentId, setCurrentStudentId] = useState(null) // 현재 로그인한 학번
+  const [pushInterests, setPushInterests] = useState({ route_ids: [], bus_types: [] }) // 노선 오픈 알림 관심 등록
+  const [isSavingInterests, setIsSavingInterests] = useState(false)
+
+  // 노선 오픈 알림 관심 등록 조회
+  const fetchPushInterests = async (studentId) => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/push/interests/${studentId}`)
+      setPushInterests({
+        route_ids: response.data.route_ids || [],
+        bus_types: response.data.bus_types || []
+      })
+    } catch (err) {
+      console.error('❌ 관심 노선 조회 실패:', err)
+    }
+  }
+
+  const toggleInterest = (field, value) => {
+    setPushInterests(prev => ({
+      ...prev,
+      [field]: prev[field].includes(value)
+        ? prev[field].filter(item => item !== value)
+        : [...prev[field], value]
+    }))
+  }
+
+  // 노선 오픈 알림 관심 등록 저장 (선택한 목록으로 교체)
+  const savePushInterests = async () => {
+    if (!currentStudentId) return
+    setIsSavingInterests(true)
+    try {
+      const response = await axios.put(`${API_BASE_URL}/api/push/interests/${currentStudentId}`, pushInterests)
+      setPushInterests({
+        route_ids: response.data.route_ids,
+        bus_types: response.data.bus_types
+      })
+      alert('알림 받을 노선이 저장되었습니다.')
+    } catch (err) {
+      console.error('❌ 관심 노선 저장 실패:', err)
+      alert(err.response?.data?.detail || '알림 설정 저장에 실패했습니다.')
+    } finally {
+      setIsSavingInterests(false)
+    }
+  }
 
   // 알림 권한 요청 및 토큰 발급
   const requestNotificationPermission = async () => {
@@ -107,6 +155,7 @@ function HomeContent({ isLoggedIn }) {
       localStorage.setItem('isNotificationEnabled', 'true')
       localStorage.setItem('pushTokenInfo', JSON.stringify(tokenInfo))
       localStorage.setItem('currentStudentId', studentId)
+      fetchPushInterests(studentId)
 
       // 성공 메시지
       const deviceMsg = tokenInfo.deviceType === 'ios' 
@@ -115,7 +164,7 @@ function HomeContent({ isLoggedIn }) {
         ? 'Android'
         : 'PC'
 
-      alert(`✅ 알림이 활성화되었습니다!\n\n디바이스: ${deviceMsg}\n\n예매가 오픈되면 자동으로 알림을 받습니다.${tokenInfo.deviceType === 'ios' ? '\n\n⚠️ iOS는 앱이 실행 중일 때만 알림을 받을 수 있습니다.' : '\n\n브라우저를 닫아도 알림을 받을 수 있습니다!'}`)
+      alert(`✅ 알림이 활성화되었습니다!\n\n디바이스: ${deviceMsg}\n\n예매가 오픈되면 자동으로 알림을 받습니다.\n노선별 오픈 알림은 아래에서 받을 노선을 선택해주세요.${tokenInfo.deviceType === 'ios' ? '\n\n⚠️ iOS는 앱이 실행 중일 때만 알림을 받을 수 있습니다.' : '\n\n브라우저를 닫아도 알림을 받을 수 있습니다!'}`)
 
     } catch (err) {
       console.error('❌ 알림 설정 실패:', err)
@@ -181,6 +230,7 @@ function HomeContent({ isLoggedIn }) {
       setIsNotificationEnabled(true)
       setPushTokenInfo(JSON.parse(savedPushTokenInfo))
       setCurrentStudentId(savedStudentId)
+      fetchPushInterests(savedStudentId)
       console.log('✅ 알림 활성화 상태 복원됨')
     }
     
@@ -291,6 +341,7 @@ function HomeContent({ isLoggedIn }) {
   const handleReservationClick = (route) => {
     setSelectedRoute(route)
     setSeatCount(1)
+    setBookingKey(null)
     setReservationStep('selectSeats')
   }
 
@@ -304,6 +355,8 @@ function HomeContent({ isLoggedIn }) {
       alert(`잔여 좌석(${selectedRoute.availableSeats}석)보다 많이 선택할 수 없습니다.`)
       return
     }
+    // 확인 단계를 열 때 한 번만 키를 만들고, 확정 버튼을 다시 눌러도(재시도) 같은 키 사용
+    setBookingKey(createIdempotencyKey())
     setReservationStep('confirm')
   }
 
@@ -319,24 +372,56 @@ function HomeContent({ isLoggedIn }) {
 
       const user = JSON.parse(userStr)
       
+      // 재시도해도 예약이 중복 생성되지 않도록 확인 단계에서 만든 키 전송
+      // (이전 요청이 확정 응답을 받아 키를 비웠으면 새 예약 시도이므로 새 키)
+      let idempotencyKey = bookingKey
+      if (!idempotencyKey) {
+        idempotencyKey = createIdempotencyKey()
+        setBookingKey(idempotencyKey)
+      }
       const response = await axios.post(`${API_BASE_URL}/api/bookings`, {
         student_id: user.student_id,
         route_id: selectedRoute.routeId,
         seat_count: seatCount,
         departure_date: selectedRoute.departureDate
+      }, {
+        headers: { 'Idempotency-Key': idempotencyKey }
       })
 
+      // 대기열 모드: 번호표 상태를 조회하며 차례를 기다림
+      if (response.data.ticket_id) {
+        let ticket = response.data
+        while (ticket.status === 'waiting' || ticket.status === 'processing') {
+          console.log(`🎫 예매 대기 중 - 앞에 ${ticket.position}명`)
+          await new Promise(resolve => setTimeout(resolve, 1000))
+          ticket = (await axios.get(`${API_BASE_URL}/api/bookings/tickets/${ticket.ticket_id}`)).data
+        }
+        if (ticket.status === 'failed') {
+          setBookingKey(null)
+          alert(ticket.error || '예약에 실패했습니다.')
+          handleSearch()
+          return
+        }
+      }
+
       alert(`예약이 완료되었습니다! (${seatCount}명)`)
       
       // 상태 초기화 및 노선 목록으로 돌아가기
       setReservationStep('list')
       setSelectedRoute(null)
       setSeatCount(1)
+      setBookingKey(null)
       
       // 노선 목록 새로고침
       handleSearch()
     } catch (err) {
       console.error('❌ 예약 실패:', err)
+      // 확정 응답(4xx, 처리 중인 409 제외)을 받았으면 키를 비우고,
+      // 네트워크 오류/5xx/409면 결과를 모르므로 같은 키로 다시 시도하도록 유지
+      const status = err.response?.status
+      if (status >= 400 && status < 500 && status !== 409) {
+        setBookingKey(null)
+      }
       alert(err.response?.data?.detail || '예약에 실패했습니다.')
     }
   }
@@ -346,6 +431,7 @@ function HomeContent({ isLoggedIn }) {
     setReservationStep('list')
     setSelectedRoute(null)
     setSeatCount(1)
+    setBookingKey(null)
   }
 
   // 알림 클릭 핸들러
@@ -791,6 +877,49 @@ function HomeContent({ isLoggedIn }) {
             )}
           </div>
 
+          {/* 노선 오픈 알림 관심 등록 */}
+          {isNotificationEnabled && (
+            <div className="push-interests">
+              <h4>🚌 오픈 알림 받을 노선</h4>
+              <p className="push-interests-help">
+                선택한 버스 종류나 노선이 열릴 때 알림을 받습니다. (예매 전체 오픈 알림은 항상 받습니다)
+              </p>
+              <div className="push-interests-options">
+                {['등교', '하교'].map(type => (
+                  <label key={type} className="push-interest-option">
+                    <input
+                      type="checkbox"
+                      checked={pushInterests.bus_types.includes(type)}
+                      onChange={() => toggleInterest('bus_types', type)}
+                    />
+                    {type} 전체
+                  </label>
+                ))}
+              </div>
+              {allRoutes.length > 0 && (
+                <div className="push-interests-options push-interests-routes">
+                  {allRoutes.map(route => (
+                    <label key={route.routeId} className="push-interest-option">
+                      <input
+                        type="checkbox"
+                        checked={pushInterests.route_ids.includes(route.routeId)}
+                        onChange={() => toggleInterest('route_ids', route.routeId)}
+                      />
+                      {route.busType} - {route.routeName}
+                    </label>
+                  ))}
+                </div>
+              )}
+              <button
+                onClick={savePushInterests}
+                disabled={isSavingInterests}
+                className="btn-save-interests"
+              >
+                {isSavingInterests ? '저장 중...' : '알림 설정 저장'}
+              </button>
+            </div>
+          )}
+
           {notificationPermission === 'denied' && (
             <div className="notification-warning">
               ⚠️ 알림이 차단되었습니다. 브라우저 설정에서 알림을 허용해주세요.
@@ -804,7 +933,8 @@ function HomeContent({ isLoggedIn }) {
         <h3>💡 사용 방법</h3>
         <ul>
           <li><strong>1단계:</strong> "알림 받기" 버튼을 클릭하여 푸시 알림을 허용하세요</li>
-          <li><strong>2단계:</strong> 관리자가 예매를 오픈하면 서버에서 자동으로 푸시 알림을 보냅니다!</li>
+          <li><strong>2단계:</strong> 오픈 알림을 받을 버스 종류(등교/하교)나 노선을 선택하고 저장하세요</li>
+          <li><strong>3단계:</strong> 관리자가 예매를 오픈하면 서버에서 자동으로 푸시 알림을 보냅니다!</li>
           <li>💡 <strong>앱이 꺼져있어도</strong> 알림을 받을 수 있습니다</li>
           <li>💻 PC/Android: 브라우저를 닫아도 백그라운드 알림 수신</li>
           <li>📱 iOS: 홈 화면에 추가 후 앱 실행 중일 때만 알림 수신</li>
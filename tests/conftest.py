@@ -0,0 +1,14 @@
+"""
+pytest 공통 설정
+backend 모듈은 import 시점에 DATA_BACKEND로 저장소를 고르므로, Supabase 없이 실행되도록 먼저 SQLite로 지정
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ["DATA_BACKEND"] = "sqlite"
+os.environ["SQLITE_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="schoolbus-test-"), "schoolbus.db")
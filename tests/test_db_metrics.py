@@ -0,0 +1,49 @@
+"""
+Server-Timing DB 계측 테스트 (SQLite 저장소도 실제 쿼리 수를 보고해야 함)
+"""
+import asyncio
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import bookings
+from backend.config.db_metrics import DBTimingMiddleware, RouteDBMetrics
+from backend.repositories import user_repository
+
+# backend.main은 supabase 패키지를 불러오므로 같은 미들웨어/라우터로 앱을 구성
+app = FastAPI()
+app.add_middleware(DBTimingMiddleware, metrics=RouteDBMetrics())
+app.include_router(bookings.router, prefix="/api")
+
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy"}
+
+
+def _server_timing(response):
+    metrics = {}
+    for metric in response.headers["server-timing"].split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+def test_sqlite_queries_are_reported():
+    student_id = f"2026{uuid.uuid4().hex[:6]}"
+    asyncio.run(user_repository.create({"student_id": student_id, "name": "홍길동"}))
+
+    response = TestClient(app).get(f"/api/bookings/user/{student_id}")
+
+    assert response.status_code == 200
+    metrics = _server_timing(response)
+    assert metrics["db"]["desc"] == '"2 queries"'
+    assert metrics["db-users"]["desc"] == '"1"'
+    assert metrics["db-reservations"]["desc"] == '"1"'
+
+
+def test_request_without_db_reports_zero_queries():
+    response = TestClient(app).get("/health")
+
+    assert _server_timing(response)["db"]["desc"] == '"0 queries"'
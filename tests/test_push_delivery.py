@@ -0,0 +1,182 @@
+"""
+푸시 전송 속도 조절(HostLane AIMD)과 Outbox 재시도 백오프/임대 테스트
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.services import push_outbox as outbox_module
+from backend.services.push_outbox import PushOutbox, PUSH_OUTBOX_BASE_DELAY, PUSH_OUTBOX_MAX_DELAY
+from backend.services.push_subscription import SubscriptionRecord
+from backend.services.web_push_service import (
+    HostLane,
+    PushResult,
+    PreparedBroadcast,
+    WebPushService,
+    PUSH_HOST_MIN_RATE,
+)
+
+
+def test_throttling_halves_rate_down_to_minimum():
+    lane = HostLane("fcm.googleapis.com", concurrency=4, max_rate=100)
+
+    lane.feedback(PushResult(status_code=429))
+    assert lane.rate == 50
+    lane.feedback(PushResult(status_code=503))
+    assert lane.rate == 25
+
+    for _ in range(20):
+        lane.feedback(PushResult(status_code=429))
+    assert lane.rate == PUSH_HOST_MIN_RATE
+
+
+def test_success_recovers_rate_additively_up_to_maximum():
+    lane = HostLane("fcm.googleapis.com", concurrency=4, max_rate=400)
+    lane.feedback(PushResult(status_code=429))
+    assert lane.rate == 200
+
+    lane.feedback(PushResult(status_code=201))
+    assert lane.rate == 204  # max_rate의 1%씩
+
+    for _ in range(100):
+        lane.feedback(PushResult(status_code=201))
+    assert lane.rate == 400
+
+
+def test_other_results_do_not_change_rate():
+    lane = HostLane("fcm.googleapis.com", concurrency=4, max_rate=100)
+    lane.feedback(PushResult(status_code=429))
+
+    lane.feedback(None)
+    lane.feedback(PushResult(status_code=410))
+    lane.feedback(PushResult(status_code=500))
+
+    assert lane.rate == 50
+
+
+def test_retry_after_pauses_lane():
+    lane = HostLane("fcm.googleapis.com", concurrency=4, max_rate=100)
+
+    lane.feedback(PushResult(status_code=429, retry_after=0.2))
+
+    async def wait():
+        started = time.monotonic()
+        await lane.wait_for_token()
+        return time.monotonic() - started
+
+    assert asyncio.run(wait()) >= 0.19
+
+
+@pytest.mark.parametrize("attempts", [1, 2, 3, 5, 20])
+def test_backoff_delay_is_bounded_exponential_with_jitter(attempts):
+    outbox = PushOutbox(enabled=False)
+    ceiling = min(PUSH_OUTBOX_MAX_DELAY, PUSH_OUTBOX_BASE_DELAY * 2 ** (attempts - 1))
+
+    delays = [outbox.backoff_delay(attempts) for _ in range(200)]
+
+    assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_backoff_delay_respects_longer_retry_after():
+    outbox = PushOutbox(enabled=False)
+
+    assert outbox.backoff_delay(1, retry_after=3600) == 3600
+    assert outbox.backoff_delay(1, retry_after=0) <= PUSH_OUTBOX_BASE_DELAY
+
+
+def _recipients(count):
+    return [
+        (
+            f"2026{i:04d}",
+            SubscriptionRecord(
+                endpoint=f"https://fcm.googleapis.com/fcm/send/{i}",
+                audience="https://fcm.googleapis.com",
+                p256dh=b"\x04" + bytes(64),
+                auth=bytes(16)
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def test_claimed_jobs_are_leased_until_timeout(tmp_path, monkeypatch):
+    outbox = PushOutbox(path=str(tmp_path / "outbox.db"), push_service=None, enabled=True)
+    outbox._enqueue_sync(PreparedBroadcast("제목", "내용"), _recipients(5))
+
+    claimed = outbox._claim_sync(3)
+    assert len(claimed) == 3
+    # 임대 중인 작업은 다른 워커가 가져가지 않음
+    assert [row["id"] for row in outbox._claim_sync(10)] == [4, 5]
+    assert outbox._claim_sync(10) == []
+    assert outbox._stats_sync()["sending"] == 5
+
+    # 응답 없이 임대 시간이 지나면 다시 전송 대상
+    now = time.time()
+    monkeypatch.setattr(outbox_module.time, "time", lambda: now + outbox_module._LEASE_SECONDS + 1)
+    assert len(outbox._claim_sync(10)) == 5
+
+
+def _dispatch_service(post, fail_after=None):
+    """암호화 없이 (키, 구독, 본문)을 바로 넘기고 전송은 post로 대신하는 서비스"""
+    service = WebPushService(concurrency=8, encrypt_mode="inline", shards=1)
+    recipients = _recipients(50)
+
+    async def encrypted_stream(payload, entries):
+        for index, (student_id, record) in enumerate(recipients):
+            if fail_after is not None and index == fail_after:
+                raise RuntimeError("구독자 조회 실패")
+            yield student_id, record, b"encrypted"
+
+    service._encrypted_stream = encrypted_stream
+    service._post = post
+    return service
+
+
+def _assert_cleaned_up(service):
+    # 남은 전송 태스크 없이 정리되고, 차선 자리도 모두 반환되어야 함
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    for lane in service._host_lanes.values():
+        assert lane.semaphore._value == lane.concurrency
+
+
+def test_cancelled_dispatch_stops_in_flight_sends():
+    started = []
+
+    async def slow_post(record, encrypted, headers):
+        started.append(record.endpoint)
+        await asyncio.sleep(10)
+        return PushResult(status_code=201)
+
+    async def scenario():
+        service = _dispatch_service(slow_post)
+        results = []
+        dispatch = asyncio.create_task(service._dispatch_local(
+            PreparedBroadcast("제목", "내용"), None, lambda key, result: results.append(result)
+        ))
+        await asyncio.sleep(0.05)
+        dispatch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await dispatch
+
+        assert started
+        assert results == []
+        _assert_cleaned_up(service)
+
+    asyncio.run(scenario())
+
+
+def test_failed_dispatch_waits_for_in_flight_sends():
+    async def post(record, encrypted, headers):
+        await asyncio.sleep(0.01)
+        return PushResult(status_code=201)
+
+    async def scenario():
+        service = _dispatch_service(post, fail_after=10)
+        with pytest.raises(RuntimeError):
+            await service._dispatch_local(PreparedBroadcast("제목", "내용"), None, lambda key, result: None)
+
+        _assert_cleaned_up(service)
+
+    asyncio.run(scenario())
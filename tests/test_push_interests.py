@@ -0,0 +1,51 @@
+"""
+PUT /push/interests/{student_id} 검증 테스트 (SQLite 저장소)
+"""
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.routes.push_notification import update_push_interests, get_push_interests, PushInterests
+from backend.repositories import user_repository, bus_route_repository
+
+
+def _create_student():
+    student_id = f"2026{uuid.uuid4().hex[:6]}"
+    asyncio.run(user_repository.create({"student_id": student_id, "name": "홍길동"}))
+    return student_id
+
+
+def test_unknown_student_is_not_found():
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(update_push_interests("unknown-student", PushInterests(bus_types=["등교"])))
+
+    assert excinfo.value.status_code == 404
+
+
+def test_unknown_route_and_bus_type_are_rejected():
+    student_id = _create_student()
+
+    for interests in (PushInterests(route_ids=["NO_SUCH_ROUTE"]), PushInterests(bus_types=["주말"])):
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(update_push_interests(student_id, interests))
+        assert excinfo.value.status_code == 400
+
+
+def test_interests_are_replaced():
+    student_id = _create_student()
+    route_id = f"ROUTE_{uuid.uuid4().hex[:6]}"
+    asyncio.run(bus_route_repository.create({
+        "route_id": route_id,
+        "route_name": "정문 노선",
+        "departure_date": "2026-10-20",
+        "departure_time": "07:30"
+    }))
+
+    asyncio.run(update_push_interests(student_id, PushInterests(route_ids=[route_id], bus_types=["등교", "하교"])))
+    asyncio.run(update_push_interests(student_id, PushInterests(bus_types=["하교", "하교"])))
+
+    interests = asyncio.run(get_push_interests(student_id))
+    assert interests["route_ids"] == []
+    assert interests["bus_types"] == ["하교"]
@@ -0,0 +1,62 @@
+"""
+저장된 push_subscription 정규화 테스트 - 잘못된 행은 ValueError로 거르고 나머지 구독자에게는 계속 전송
+"""
+import base64
+import json
+
+import pytest
+
+from backend.services.push_subscription import normalize_subscription, SubscriptionCache
+from backend.services.web_push_service import WebPushService
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+VALID = {
+    "endpoint": "https://fcm.googleapis.com/fcm/send/abc",
+    "keys": {"p256dh": _b64(b"\x04" + bytes(64)), "auth": _b64(bytes(16))}
+}
+
+
+def test_valid_subscription():
+    record = normalize_subscription(VALID)
+
+    assert record.audience == "https://fcm.googleapis.com"
+    assert len(record.p256dh) == 65 and len(record.auth) == 16
+
+
+@pytest.mark.parametrize("subscription", [
+    [VALID],
+    "https://fcm.googleapis.com/fcm/send/abc",
+    None,
+    {"endpoint": VALID["endpoint"], "keys": ["p256dh", "auth"]},
+    {"endpoint": VALID["endpoint"], "keys": "p256dh"},
+    {"endpoint": 42, "keys": VALID["keys"]},
+    {"endpoint": VALID["endpoint"], "keys": {"p256dh": 1, "auth": VALID["keys"]["auth"]}},
+    {"endpoint": VALID["endpoint"], "keys": {"p256dh": VALID["keys"]["p256dh"]}},
+])
+def test_malformed_subscription_raises_value_error(subscription):
+    with pytest.raises(ValueError):
+        normalize_subscription(subscription)
+
+
+@pytest.mark.parametrize("raw", ["[1, 2]", '"text"', "not json", ["list"], 7])
+def test_cache_rejects_malformed_rows(raw):
+    with pytest.raises(ValueError):
+        SubscriptionCache().get(raw)
+
+
+def test_bad_rows_do_not_stop_the_page():
+    rows = [
+        {"student_id": "a", "push_subscription": json.dumps([VALID])},
+        {"student_id": "b", "push_subscription": json.dumps(VALID)},
+        {"student_id": "c", "push_subscription": {"endpoint": VALID["endpoint"], "keys": []}},
+        {"student_id": "d", "push_subscription": None},
+        {"student_id": "e", "push_subscription": VALID},
+    ]
+
+    students = [student_id for student_id, _ in WebPushService._iter_subscription_rows(rows)]
+
+    assert students == ["b", "e"]
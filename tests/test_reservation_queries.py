@@ -0,0 +1,161 @@
+"""
+GET /bookings/user/{student_id} DB 호출 수 회귀 테스트
+예약 수와 관계없이 사용자 조회 1회 + 예약(노선 관계 포함) 조회 1회만 해야 함 (N+1 방지)
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.routes import bookings
+from backend.repositories.supabase_repository import (
+    SupabaseUserRepository,
+    SupabaseReservationRepository,
+)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """PostgREST 쿼리 빌더 흉내 - 체이닝한 호출을 기록하고 execute() 때 한 번의 왕복으로 셈"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return chain
+
+    def execute(self):
+        self.client.executed.append(self)
+        return FakeResponse(self.client.rows[self.table](self))
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        raise AssertionError(f"예상하지 못한 RPC 호출: {name}")
+
+
+def _reservations(count):
+    return [
+        {
+            "id": f"res-{i:04d}",
+            "route_id": f"route-{i % 7}",
+            "user_id": "user-1",
+            "user_name": "홍길동",
+            "seat_count": 1,
+            "status": "confirmed",
+            "created_at": f"2026-10-{1 + i % 28:02d}T07:{i % 60:02d}:00+00:00",
+            "bus_routes": {
+                "id": f"route-{i % 7}",
+                "route_id": f"ROUTE_{i % 7:03d}",
+                "route_name": f"노선 {i % 7}",
+                "departure_date": "2026-10-20",
+                "departure_time": "07:30"
+            }
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    def install(reservation_count):
+        rows = _reservations(reservation_count)
+
+        def reservations(query):
+            limit = next((args[0] for name, args, _ in query.calls if name == "limit"), None)
+            return [dict(row) for row in rows[:limit]]
+
+        client = FakeSupabase({
+            "users": lambda query: [{"id": "user-1"}],
+            "reservations": reservations,
+        })
+        monkeypatch.setattr(bookings, "user_repository", SupabaseUserRepository(client))
+        monkeypatch.setattr(bookings, "reservation_repository", SupabaseReservationRepository(client))
+        return client
+    return install
+
+
+def _get_user_bookings(**kwargs):
+    params = {"limit": None, "after": None, "upcoming": False, **kwargs}
+    return asyncio.run(bookings.get_user_bookings("20261234", **params))
+
+
+@pytest.mark.parametrize("reservation_count", [0, 1, 50, 500])
+def test_get_user_bookings_uses_two_round_trips(fake_db, reservation_count):
+    client = fake_db(reservation_count)
+
+    result = _get_user_bookings()
+
+    assert result["count"] == reservation_count
+    assert [query.table for query in client.executed] == ["users", "reservations"]
+    # 노선 정보는 bus_routes를 따로 조회하지 않고 관계 select로 함께 가져옴
+    select = next(args[0] for name, args, _ in client.executed[1].calls if name == "select")
+    assert "bus_routes(" in select
+    if reservation_count:
+        assert result["bookings"][0]["route"]["route_id"] == "ROUTE_000"
+        assert "bus_routes" not in result["bookings"][0]["reservation"]
+
+
+def test_paginated_and_upcoming_queries_use_two_round_trips(fake_db):
+    client = fake_db(500)
+
+    first = _get_user_bookings(limit=20, upcoming=True)
+    assert first["count"] == 20
+    assert first["next_cursor"] is not None
+    assert len(client.executed) == 2
+
+    second = _get_user_bookings(limit=20, after=first["next_cursor"])
+    assert second["count"] == 20
+    assert len(client.executed) == 4
+    assert any(name == "or_" for name, _, _ in client.executed[3].calls)
+
+
+def test_unknown_student_stops_after_user_lookup(monkeypatch):
+    client = FakeSupabase({"users": lambda query: [], "reservations": lambda query: []})
+    monkeypatch.setattr(bookings, "user_repository", SupabaseUserRepository(client))
+    monkeypatch.setattr(bookings, "reservation_repository", SupabaseReservationRepository(client))
+
+    with pytest.raises(HTTPException) as excinfo:
+        _get_user_bookings()
+
+    assert excinfo.value.status_code == 404
+    assert [query.table for query in client.executed] == ["users"]
+
+
+def test_cursor_round_trip():
+    reservation = {"id": "res-0001", "created_at": "2026-10-17T07:30:00.123456+00:00"}
+
+    cursor = bookings._encode_cursor(reservation)
+
+    assert "=" not in cursor
+    assert bookings._decode_cursor(cursor) == (reservation["created_at"], reservation["id"])
+
+
+def test_cursor_without_created_at():
+    cursor = bookings._encode_cursor({"id": "res-0001", "created_at": None})
+
+    assert bookings._decode_cursor(cursor) == ("", "res-0001")
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm8tc2VwYXJhdG9y", "_w"])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        bookings._decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,59 @@
+"""
+노선 오픈 알림 디바운스 테스트 - 알림 작업 등록에 실패하면 다시 열 때 바로 재시도
+"""
+import asyncio
+import uuid
+
+from fastapi import BackgroundTasks
+
+from backend.api.routes import bus_routes
+from backend.repositories import bus_route_repository
+
+
+def _create_route():
+    route_id = f"ROUTE_{uuid.uuid4().hex[:6]}"
+    asyncio.run(bus_route_repository.create({
+        "route_id": route_id,
+        "route_name": "정문 노선",
+        "departure_date": "2026-10-20",
+        "departure_time": "07:30"
+    }))
+    return route_id
+
+
+def _toggle(route_id):
+    background_tasks = BackgroundTasks()
+    response = asyncio.run(bus_routes.toggle_route_status(route_id, background_tasks))
+    return response.get("push_notification"), background_tasks
+
+
+def test_failed_job_creation_does_not_debounce_retry(monkeypatch):
+    route_id = _create_route()
+    create = bus_routes.broadcast_jobs.create
+
+    async def failing_create(name, spec):
+        raise RuntimeError("broadcast_jobs 테이블 없음")
+
+    monkeypatch.setattr(bus_routes.broadcast_jobs, "create", failing_create)
+    push_result, _ = _toggle(route_id)
+    assert "error" in push_result
+
+    _toggle(route_id)  # 닫기
+    monkeypatch.setattr(bus_routes.broadcast_jobs, "create", create)
+    push_result, background_tasks = _toggle(route_id)
+
+    assert "job_id" in push_result
+    assert len(background_tasks.tasks) == 1
+
+
+def test_reopening_within_window_is_debounced():
+    route_id = _create_route()
+
+    push_result, _ = _toggle(route_id)
+    assert "job_id" in push_result
+
+    _toggle(route_id)
+    push_result, background_tasks = _toggle(route_id)
+
+    assert push_result == {"skipped": "debounced"}
+    assert background_tasks.tasks == []
@@ -0,0 +1,147 @@
+"""
+SeatInventory 입장 제어/재고 보정 테스트 (DB 대신 노선 조회 횟수를 세는 가짜 저장소 사용)
+"""
+import asyncio
+
+from backend.services.seat_inventory import SeatInventory
+
+
+class FakeRoutes:
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, route_id):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        row = self.routes.get(route_id)
+        return dict(row) if row is not None else None
+
+
+def _inventory(routes, **kwargs):
+    repository = FakeRoutes(routes, kwargs.pop("delay", 0.0))
+    return SeatInventory(repository, **{"ttl": 60, **kwargs}), repository
+
+
+def test_rejects_unknown_and_closed_routes():
+    async def scenario():
+        inventory, _ = _inventory({"closed": {"is_open": False, "available_seats": 10}})
+        assert (await inventory.admit("missing", 1)).rejected == "not_found"
+        assert (await inventory.admit("closed", 1)).rejected == "closed"
+        assert inventory.rejected == 2
+
+    asyncio.run(scenario())
+
+
+def test_admits_only_remaining_seats_until_released():
+    async def scenario():
+        inventory, repository = _inventory({"r1": {"is_open": True, "available_seats": 3}})
+
+        admitted = [await inventory.admit("r1", 1) for _ in range(3)]
+        assert [admission.rejected for admission in admitted] == [None, None, None]
+        assert (await inventory.admit("r1", 1)).rejected == "sold_out"
+
+        # RPC 오류로 끝난 예매는 좌석을 돌려줌
+        inventory.release(admitted[0], None)
+        assert (await inventory.admit("r1", 1)).rejected is None
+        assert repository.calls == 2  # 오류 뒤에는 다음 입장 때 DB에서 다시 읽음
+
+    asyncio.run(scenario())
+
+
+def test_release_applies_booking_result():
+    async def scenario():
+        inventory, _ = _inventory({"r1": {"is_open": True, "available_seats": 10}})
+        first = await inventory.admit("r1", 2)
+        second = await inventory.admit("r1", 1)
+
+        inventory.release(second, {"status": "ok", "available_seats": 7})
+        # 늦게 도착한 이전 결과가 잔여석을 되돌리지 않음
+        inventory.release(first, {"status": "ok", "available_seats": 8})
+
+        route = inventory.stats()["routes"]["r1"]
+        assert route == {"is_open": True, "available": 7, "in_flight": 0}
+
+        closing = await inventory.admit("r1", 1)
+        inventory.release(closing, {"status": "closed"})
+        assert (await inventory.admit("r1", 1)).rejected == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_release_is_idempotent():
+    async def scenario():
+        inventory, _ = _inventory({"r1": {"is_open": True, "available_seats": 2}})
+        admission = await inventory.admit("r1", 1)
+        other = await inventory.admit("r1", 1)
+
+        inventory.release(admission, None)
+        inventory.release(admission, None)
+
+        assert inventory.stats()["routes"]["r1"]["in_flight"] == 1
+        inventory.release(other, {"status": "ok", "available_seats": 1})
+
+    asyncio.run(scenario())
+
+
+def test_new_snapshot_does_not_subtract_earlier_admissions():
+    async def scenario():
+        routes = {"r1": {"is_open": True, "available_seats": 2}}
+        inventory, _ = _inventory(routes)
+        old = await inventory.admit("r1", 2)
+
+        # 관리자가 좌석을 늘려 새 스냅샷을 읽은 경우 이전 스냅샷의 입장은 새 재고에서 빼지 않음
+        routes["r1"]["available_seats"] = 5
+        inventory.invalidate("r1")
+        new = await inventory.admit("r1", 5)
+        assert new.rejected is None
+
+        # 이전 스냅샷 기준 입장의 종료는 새 스냅샷을 바꾸지 않음
+        inventory.release(old, {"status": "ok", "available_seats": 0})
+        assert inventory.stats()["routes"]["r1"] == {"is_open": True, "available": 5, "in_flight": 5}
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_admissions_share_one_refresh():
+    async def scenario():
+        inventory, repository = _inventory({"r1": {"is_open": True, "available_seats": 30}}, delay=0.01)
+
+        admissions = await asyncio.gather(*(inventory.admit("r1", 1) for _ in range(100)))
+
+        assert repository.calls == 1
+        assert sum(admission.rejected is None for admission in admissions) == 30
+        assert sum(admission.rejected == "sold_out" for admission in admissions) == 70
+
+    asyncio.run(scenario())
+
+
+def test_expired_snapshot_is_refreshed():
+    async def scenario():
+        inventory, repository = _inventory({"r1": {"is_open": True, "available_seats": 1}}, ttl=0)
+        await inventory.admit("r1", 1)
+        await inventory.admit("r1", 1)
+        assert repository.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_inventory_is_bounded():
+    async def scenario():
+        routes = {f"r{i}": {"is_open": True, "available_seats": 1} for i in range(3)}
+        inventory, _ = _inventory(routes, max_routes=2)
+
+        await inventory.admit("r0", 1)
+        await inventory.admit("r1", 1)
+        await inventory.admit("r0", 1)  # r0을 최근 사용으로
+        await inventory.admit("r2", 1)
+        assert list(inventory._routes) == ["r0", "r2"]
+
+        # 없는 route_id도 같은 한도 안에서만 보관
+        for i in range(10):
+            await inventory.admit(f"missing-{i}", 1)
+        assert len(inventory._routes) == 2
+
+    asyncio.run(scenario())